@@ -1,10 +1,122 @@
-from flask import Flask, request, render_template
-import pandas as pd
+from flask import Flask, request, render_template, jsonify
+import os
+import threading
 
-from src.pipeline.predict_pipeline import PredictPipeline, CustomData
+from src.artifact_store import ArtifactStore
+from src.pipeline.artifact_registry import ArtifactRegistryConfig, get_artifact_registry
+from src.pipeline.numpy_predictor import FEATURE_COLUMNS, NumpyLinearPredictor, parse_batch
+from src.pipeline.request_coalescer import RequestCoalescer, RequestCoalescerConfig
+from src.logger import logging
 
 app = Flask(__name__)
 
+API_MAX_BATCH_ROWS = 10000
+NUMPY_MODEL_PATH = os.path.join("artifacts", "numpy_model.npz")
+CASCADE_MODEL_PATH = os.path.join("artifacts", "cascade_model.pkl")
+TRACK_INDEX_PATH = os.path.join("artifacts", "track_index.pkl")
+SIMILAR_MAX_ROWS = 100
+SIMILAR_MAX_K = 100
+SIMILAR_METHODS = ("auto", "kd_tree", "ivf")
+
+# Linear models exported by training are served with numpy alone, so workers start
+# without importing pandas or scikit-learn. Other models (or NUMPY_SERVING=0) use the
+# full pipeline. CASCADE_SERVING=1 serves the confidence-gated cascade trained alongside
+# the tuned model instead, through the full pipeline. Switching modes needs a worker restart,
+# except that NumPy workers move to the full pipeline once training stops publishing the export.
+def _numpy_model_published() -> bool:
+    manifest = ArtifactStore().read_manifest()
+    return manifest is None or "numpy_model" in manifest["artifacts"]
+
+
+cascade_serving = os.environ.get("CASCADE_SERVING", "0") == "1" and os.path.exists(CASCADE_MODEL_PATH)
+numpy_serving = (
+    not cascade_serving
+    and os.environ.get("NUMPY_SERVING", "1") != "0"
+    and os.path.exists(NUMPY_MODEL_PATH)
+    and _numpy_model_published()
+)
+
+
+def _full_pipeline():
+    """
+    Returns the predict, predict_proba and warm_up functions of a full PredictPipeline.
+    """
+    import pandas as pd
+    from src.pipeline.predict_pipeline import PredictPipeline
+
+    # One pipeline per worker process; artifacts are loaded once and shared by all requests.
+    predict_pipeline = PredictPipeline(fused=True, cascade=cascade_serving)
+
+    def predict(X):
+        return predict_pipeline.predict(pd.DataFrame(X, columns=FEATURE_COLUMNS))
+
+    def predict_proba(X):
+        return predict_pipeline.predict_proba(pd.DataFrame(X, columns=FEATURE_COLUMNS))
+
+    return predict, predict_proba, predict_pipeline.warm_up
+
+
+if numpy_serving:
+    numpy_registry = get_artifact_registry({"numpy_model": NUMPY_MODEL_PATH}, loader=NumpyLinearPredictor.load)
+    fallback = {}
+    fallback_lock = threading.Lock()
+
+    def numpy_model():
+        """
+        Returns the NumPy predictor, or None once the current artifact version no longer includes it.
+        """
+        bundle = numpy_registry.get()
+        return None if numpy_registry.withdrawn else bundle["numpy_model"]
+
+    def full_pipeline():
+        with fallback_lock:
+            if not fallback:
+                logging.warning("The NumPy model is no longer published, this worker now serves the full pipeline.")
+                fallback["predict"], fallback["predict_proba"], warm_up_full = _full_pipeline()
+                warm_up_full()
+        return fallback
+
+    def model_predict(X):
+        predictor = numpy_model()
+        if predictor is None:
+            return full_pipeline()["predict"](X)
+        return predictor.predict(X)
+
+    def model_predict_proba(X):
+        predictor = numpy_model()
+        if predictor is None:
+            return full_pipeline()["predict_proba"](X)
+        return predictor.genres, predictor.predict_proba(X)
+
+    warm_up = numpy_registry.warm_up
+else:
+    model_predict, model_predict_proba, warm_up = _full_pipeline()
+
+try:
+    warm_up()
+except Exception as e:
+    logging.error(f"Could not preload inference artifacts, they will be loaded on first request: {e}")
+
+# Concurrent single-row requests are merged into one model call; set COALESCE_MAX_WAIT_MS=0 to disable.
+coalescer_config = RequestCoalescerConfig(
+    max_wait_ms=float(os.environ.get("COALESCE_MAX_WAIT_MS", 5)),
+    max_batch_size=int(os.environ.get("COALESCE_MAX_BATCH_SIZE", 64))
+)
+coalescer = RequestCoalescer(model_predict, coalescer_config) if coalescer_config.max_wait_ms > 0 else None
+
+# The catalog index is memory-mapped on the first similarity request, so prediction-only
+# workers don't pay for it (it needs scikit-learn for the KD-tree). KD-tree and IVF queries
+# only read their arrays, so unlike the models the index is safe to map read-only.
+track_index_registry = get_artifact_registry(
+    {"track_index": TRACK_INDEX_PATH}, config=ArtifactRegistryConfig(mmap_mode="r")
+)
+
+
+def predict_rows(X):
+    if coalescer is not None and len(X) < coalescer_config.max_batch_size:
+        return coalescer.predict(X)
+    return model_predict(X)
+
 @app.route('/')
 def home():
     return render_template('index.html')
@@ -14,27 +126,84 @@ def predict():
     if request.method == 'GET':
         return render_template('index.html')
     else:
-        data = CustomData(
-            tempo=float(request.form.get('tempo')),
-            dynamics_range=float(request.form.get('dynamics_range')),
-            vocal_presence=float(request.form.get('vocal_presence')),
-            percussion_strength=float(request.form.get('percussion_strength')),
-            string_instrument_detection=float(request.form.get('string_instrument_detection')),
-            electronic_element_presence=float(request.form.get('electronic_element_presence')),
-            rhythm_complexity=float(request.form.get('rhythm_complexity')),
-            drums_influence=float(request.form.get('drums_influence')),
-            distorted_guitar=float(request.form.get('distorted_guitar')),
-            metal_frequencies=float(request.form.get('metal_frequencies')),
-            ambient_sound_influence=float(request.form.get('ambient_sound_influence')),
-            instrumental_overlaps=float(request.form.get('instrumental_overlaps'))
-        )
-
-        input_df = data.get_data_as_data_frame()
-        predict_pipeline = PredictPipeline()
-
-        prediction = predict_pipeline.predict(input_df)
+        # Form fields carry the feature names, in FEATURE_COLUMNS order
+        X = parse_batch([{col: request.form.get(col) for col in FEATURE_COLUMNS}], max_rows=1)
+
+        prediction = predict_rows(X)
 
         return render_template('index.html', prediction=prediction[0])
 
+@app.route('/api/v1/predict', methods=['POST'])
+def api_predict():
+    payload = request.get_json(silent=True)
+    if payload is None:
+        return jsonify({"error": "Request body must be JSON."}), 400
+
+    try:
+        X = parse_batch(payload, max_rows=API_MAX_BATCH_ROWS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    include_probabilities = request.args.get('probabilities', 'false').lower() in ('1', 'true', 'yes')
+
+    try:
+        predictions = predict_rows(X)
+        response = {
+            "count": len(predictions),
+            "predictions": predictions.tolist()
+        }
+
+        if include_probabilities:
+            genres, probabilities = model_predict_proba(X)
+            response["classes"] = genres.tolist()
+            response["probabilities"] = probabilities.round(6).tolist()
+
+    except Exception as e:
+        logging.error(f"Batch prediction failed: {e}")
+        return jsonify({"error": "Prediction failed."}), 500
+
+    return jsonify(response)
+
+@app.route('/api/v1/similar', methods=['POST'])
+def api_similar():
+    """
+    Returns the k catalog tracks most similar to each feature row, nearest first.
+
+    Query parameters: k (default 10) and method, one of SIMILAR_METHODS. 'auto'
+    uses the approximate IVF index on catalogs large enough to have one and
+    the exact KD-tree otherwise.
+    """
+    payload = request.get_json(silent=True)
+    if payload is None:
+        return jsonify({"error": "Request body must be JSON."}), 400
+
+    try:
+        X = parse_batch(payload, max_rows=SIMILAR_MAX_ROWS)
+        k = request.args.get('k', '10')
+        if not (k.isdigit() and 1 <= int(k) <= SIMILAR_MAX_K):
+            raise ValueError(f"k must be an integer between 1 and {SIMILAR_MAX_K}.")
+        k = int(k)
+        method = request.args.get('method', 'auto')
+        if method not in SIMILAR_METHODS:
+            raise ValueError(f"method must be one of {', '.join(SIMILAR_METHODS)}.")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if not os.path.exists(TRACK_INDEX_PATH):
+        return jsonify({"error": "The track index is not built yet, run training (python main.py) first."}), 503
+
+    try:
+        track_index = track_index_registry.get()["track_index"]
+        if method == "ivf" and track_index.centroids is None:
+            return jsonify({"error": "The catalog has no approximate index, use method=kd_tree."}), 400
+
+        neighbors = track_index.neighbors(X, k=k, method=method)
+
+    except Exception as e:
+        logging.error(f"Similarity search failed: {e}")
+        return jsonify({"error": "Similarity search failed."}), 500
+
+    return jsonify({"count": len(neighbors), "neighbors": neighbors})
+
 if __name__ == '__main__':
     app.run()
\ No newline at end of file
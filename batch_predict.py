@@ -0,0 +1,28 @@
+from src.pipeline.batch_predict_pipeline import BatchPredictPipeline, BatchPredictConfig
+
+import argparse
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a CSV/Parquet file of music features in chunks.")
+    parser.add_argument("input_path", help="CSV or Parquet file with the 12 feature columns.")
+    parser.add_argument("output_path", help="CSV or Parquet file to write predictions to.")
+    parser.add_argument("--chunk-size", type=int, default=100_000, help="Rows per chunk.")
+    parser.add_argument("--workers", type=int, default=1, help="Number of scoring processes.")
+    parser.add_argument("--keep-columns", nargs="*", default=[], help="Input columns to copy into the output.")
+    parser.add_argument("--no-fused", action="store_true", help="Use the full sklearn pipeline instead of the fused predictor.")
+    args = parser.parse_args()
+
+    config = BatchPredictConfig(
+        chunk_size=args.chunk_size,
+        n_workers=args.workers,
+        keep_columns=args.keep_columns,
+        fused=not args.no_fused
+    )
+
+    n_rows = BatchPredictPipeline(config).run(args.input_path, args.output_path)
+    print(f"Scored {n_rows} rows -> {args.output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Fit time and peak memory of each PCA solver on synthetic tall-and-narrow data.
+
+The data mimics the training features: 12 correlated, standardized columns.
+Rows grow by 10x from 1k up to --max-rows (10M needs roughly 4 GB of RAM for
+the full solver, hence the lower default).
+
+Usage:
+    python benchmarks/pca_solver_benchmark.py --max-rows 10000000
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+from sklearn.decomposition import PCA
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.components.pca_handler import _HAS_COVARIANCE_EIGH, select_svd_solver  # noqa: E402
+
+
+def make_data(n_rows: int, n_features: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.RandomState(seed)
+    mixing = rng.normal(size=(n_features, n_features))
+    X = rng.normal(size=(n_rows, n_features)) @ mixing
+    X -= X.mean(axis=0)
+    X /= X.std(axis=0)
+    return X
+
+
+def fit_once(X: np.ndarray, svd_solver: str, n_components):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    pca = PCA(n_components=n_components, svd_solver=svd_solver, random_state=0).fit(X)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return pca, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-rows", type=int, default=1_000_000)
+    parser.add_argument("--n-features", type=int, default=12)
+    parser.add_argument("--variance", type=float, default=0.85)
+    args = parser.parse_args()
+
+    solvers = ["full", "randomized"] + (["covariance_eigh"] if _HAS_COVARIANCE_EIGH else [])
+
+    print(f"{'rows':>10} {'solver':>16} {'k':>3} {'fit s':>9} {'peak MiB':>9} {'max |dev|':>10}")
+    n_rows = 1_000
+    while n_rows <= args.max_rows:
+        X = make_data(n_rows, args.n_features)
+        data_mib = X.nbytes / 2**20
+
+        # The variance target fixes k; randomized needs it as an integer.
+        reference, _, _ = fit_once(X, "full", args.variance)
+        k = reference.n_components_
+
+        for solver in solvers:
+            n_components = k if solver == "randomized" else args.variance
+            pca, elapsed, peak = fit_once(X, solver, n_components)
+            deviation = np.abs(np.abs(pca.components_) - np.abs(reference.components_)).max()
+            print(f"{n_rows:>10} {solver:>16} {pca.n_components_:>3} {elapsed:>9.4f} {peak / 2**20:>9.1f} {deviation:>10.2e}")
+
+        print(f"{'':>10} {'auto ->':>16} {select_svd_solver(n_rows, args.n_features, args.variance)}"
+              f"  (data itself: {data_mib:.1f} MiB)")
+        del X
+        n_rows *= 10
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Peak memory and matrix copies per pipeline stage, DataFrame vs array path.
+
+Each mode runs in a fresh process on the same synthetic data (12 features,
+5 genres): scaling, PCA and a LogisticRegression fit for training, then
+scaling, PCA and predict for inference. Per stage it reports
+
+- peak RSS growth over the stage (the kernel's high-water mark is reset
+  before each stage),
+- peak traced numpy/Python allocations, and
+- "copies": that peak divided by the size of the float64 feature matrix,
+  i.e. roughly how many matrix-sized buffers the stage held at once.
+
+Artifacts are written to a temporary directory, not to ./artifacts.
+
+Usage:
+    python benchmarks/pipeline_memory_benchmark.py --rows 1000000
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODES = {
+    "frame": {"as_frame": True, "dtype": None},
+    "array": {"as_frame": False, "dtype": None},
+    "array-float32": {"as_frame": False, "dtype": "float32"},
+}
+
+
+def _rss_mib(field: str) -> float:
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def _reset_peak_rss() -> None:
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+    except OSError:
+        pass
+
+
+def _measure(stage: str, fn, matrix_nbytes: int, results: list):
+    _reset_peak_rss()
+    rss_before = _rss_mib("VmRSS")
+    tracemalloc.start()
+    output = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    results.append({
+        "stage": stage,
+        "peak_rss_mib": _rss_mib("VmHWM") - rss_before,
+        "traced_mib": peak / 2**20,
+        "copies": peak / matrix_nbytes
+    })
+    return output
+
+
+def run_mode(mode: str, n_rows: int, queue) -> None:
+    workdir = tempfile.mkdtemp()
+    os.chdir(workdir)
+    sys.path.insert(0, REPO_ROOT)
+
+    import numpy as np
+    import pandas as pd
+    from sklearn.linear_model import LogisticRegression
+
+    from src.components.data_transformation import DataTransformation
+    from src.components.pca_handler import PCAHandler
+
+    settings = MODES[mode]
+    dtype = np.float32 if settings["dtype"] == "float32" else None
+
+    rng = np.random.RandomState(0)
+    mixing = rng.normal(size=(12, 12))
+    features = rng.normal(size=(n_rows, 12)) @ mixing
+    X = pd.DataFrame(features, columns=[f"feature_{i}" for i in range(12)])
+    y = rng.randint(0, 5, size=n_rows)
+    del features
+    matrix_nbytes = n_rows * 12 * 8
+
+    results = []
+    transformer = DataTransformation()
+    pca_handler = PCAHandler(n_components=0.85)
+    model = LogisticRegression(max_iter=20)
+
+    X_scaled = _measure("train: scale", lambda: transformer.fit_transform(X, as_frame=settings["as_frame"], dtype=dtype)[0], matrix_nbytes, results)
+    X_pca = _measure("train: pca", lambda: pca_handler.fit_transform(X_scaled, as_frame=settings["as_frame"], dtype=dtype), matrix_nbytes, results)
+    del X_scaled
+    _measure("train: fit model", lambda: model.fit(X_pca, y), matrix_nbytes, results)
+    del X_pca
+
+    X_scaled = _measure("predict: scale", lambda: transformer.transform(X, as_frame=settings["as_frame"], dtype=dtype), matrix_nbytes, results)
+    X_pca = _measure("predict: pca", lambda: pca_handler.transform(X_scaled, as_frame=settings["as_frame"], dtype=dtype), matrix_nbytes, results)
+    _measure("predict: model", lambda: model.predict(X_pca), matrix_nbytes, results)
+
+    queue.put(json.dumps(results))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    print(f"{args.rows} rows, float64 feature matrix = {args.rows * 12 * 8 / 2**20:.1f} MiB\n")
+    print(f"{'stage':>18} " + " ".join(f"{mode + ' RSS/copies':>26}" for mode in MODES))
+
+    by_mode = {}
+    for mode in MODES:
+        queue = context.Queue()
+        process = context.Process(target=run_mode, args=(mode, args.rows, queue))
+        process.start()
+        by_mode[mode] = json.loads(queue.get())
+        process.join()
+
+    for i, row in enumerate(by_mode["frame"]):
+        cells = []
+        for mode in MODES:
+            result = by_mode[mode][i]
+            cells.append(f"{result['peak_rss_mib']:>10.1f} MiB / {result['copies']:>5.2f}x")
+        print(f"{row['stage']:>18} " + " ".join(f"{cell:>26}" for cell in cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Worker startup time and memory of the Flask app, numpy-only vs full pipeline.
+
+Each run starts a fresh interpreter that imports app.py (which loads the
+artifacts) and scores one row, as a gunicorn worker would on boot. Needs
+trained artifacts including artifacts/numpy_model.npz (run main.py first).
+
+Usage:
+    python benchmarks/serving_startup_benchmark.py --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WORKER = """
+import json, sys, time
+start = time.perf_counter()
+import app
+startup = time.perf_counter() - start
+row = [[120.0, 60.0, 50.0, 90.0, 20.0, 15.0, 45.0, 70.0, 60.0, 50.0, 40.0, 30.0]]
+start = time.perf_counter()
+app.model_predict(row if app.numpy_serving else __import__("numpy").array(row))
+first_request = time.perf_counter() - start
+rss_kb = 0
+with open("/proc/self/status") as status:
+    for line in status:
+        if line.startswith("VmRSS:"):
+            rss_kb = int(line.split()[1])
+print(json.dumps({
+    "numpy_serving": app.numpy_serving,
+    "startup_s": startup,
+    "first_request_s": first_request,
+    "rss_mib": rss_kb / 1024,
+    "pandas_loaded": "pandas" in sys.modules,
+    "sklearn_loaded": "sklearn" in sys.modules,
+}))
+"""
+
+
+def run_worker(numpy_serving: bool) -> dict:
+    env = dict(os.environ, NUMPY_SERVING="1" if numpy_serving else "0", COALESCE_MAX_WAIT_MS="0")
+    output = subprocess.run(
+        [sys.executable, "-c", WORKER],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    if not os.path.exists(os.path.join(REPO_ROOT, "artifacts", "numpy_model.npz")):
+        sys.exit("artifacts/numpy_model.npz not found; run main.py with a linear best model first.")
+
+    print(f"{'mode':>14} {'startup s':>10} {'1st req ms':>11} {'RSS MiB':>8} {'pandas':>7} {'sklearn':>8}")
+    for numpy_serving, mode in ((False, "full pipeline"), (True, "numpy export")):
+        results = [run_worker(numpy_serving) for _ in range(args.runs)]
+        print(
+            f"{mode:>14} "
+            f"{statistics.median(r['startup_s'] for r in results):>10.3f} "
+            f"{statistics.median(r['first_request_s'] for r in results) * 1000:>11.2f} "
+            f"{statistics.median(r['rss_mib'] for r in results):>8.1f} "
+            f"{str(results[0]['pandas_loaded']):>7} {str(results[0]['sklearn_loaded']):>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Fit and predict time of the exact RBF SVC vs the Nystroem kernel approximation.
+
+Both models are trained as ModelTrainer trains them: SVC(kernel='rbf',
+probability=True), which runs libsvm plus an internal 5-fold Platt scaling,
+and NystroemClassifier(n_components=300). The data mimics the PCA-space
+training features: 12 correlated columns, 5 classes with non-linear
+boundaries. Rows double from 1k; the exact SVC stops at --max-exact-rows, as
+its fit time grows super-linearly.
+
+Predict time is for --predict-rows rows, with probabilities.
+
+Usage:
+    python benchmarks/svc_kernel_approx_benchmark.py --max-rows 100000 --max-exact-rows 16000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from sklearn.datasets import make_classification
+from sklearn.svm import SVC
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.components.kernel_classifier import NystroemClassifier  # noqa: E402
+
+
+def make_data(n_rows: int, seed: int = 0):
+    # make_classification draws new class clusters per seed, keep it fixed.
+    X, y = make_classification(
+        n_samples=n_rows, n_features=12, n_informative=8, n_redundant=2,
+        n_classes=5, n_clusters_per_class=3, class_sep=1.0, random_state=seed
+    )
+    return X, y
+
+
+def time_model(model, X_train, y_train, X_test, y_test):
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    proba = model.predict_proba(X_test)
+    predict_s = time.perf_counter() - start
+
+    accuracy = float(np.mean(model.classes_[proba.argmax(axis=1)] == y_test))
+    return fit_s, predict_s, accuracy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-rows", type=int, default=64_000)
+    parser.add_argument("--max-exact-rows", type=int, default=16_000)
+    parser.add_argument("--predict-rows", type=int, default=10_000)
+    parser.add_argument("--n-components", type=int, default=300)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'model':>10} {'fit s':>9} {'predict s':>10} {'accuracy':>9} {'support vectors':>16}")
+    n_rows = 1_000
+    while n_rows <= args.max_rows:
+        # Held-out rows come from the same draw, so they follow the same class boundaries.
+        X, y = make_data(n_rows + args.predict_rows)
+        X_train, y_train, X_test, y_test = X[:n_rows], y[:n_rows], X[n_rows:], y[n_rows:]
+
+        models = [("nystroem", NystroemClassifier(n_components=args.n_components, random_state=0))]
+        if n_rows <= args.max_exact_rows:
+            models.insert(0, ("svc", SVC(kernel="rbf", C=1.0, probability=True, random_state=0)))
+
+        for name, model in models:
+            fit_s, predict_s, accuracy = time_model(model, X_train, y_train, X_test, y_test)
+            n_support = str(int(model.n_support_.sum())) if hasattr(model, "n_support_") else "-"
+            print(f"{n_rows:>8} {name:>10} {fit_s:>9.3f} {predict_s:>10.3f} {accuracy:>9.3f} {n_support:>16}")
+
+        n_rows *= 2
+
+
+if __name__ == "__main__":
+    main()
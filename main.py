@@ -1,18 +1,33 @@
 from src.components.data_ingestion import DataIngestion
 from src.components.data_cleaner import DataCleaner
 from src.components.data_transformation import DataTransformation
+from src.components.out_of_core_preprocessor import OutOfCorePreprocessor
 from src.components.target_label_encoder import TargetLabelEncoder
 from src.components.pca_handler import PCAHandler
 from src.components.model_trainer import ModelTrainer
+from src.components.kernel_classifier import NystroemClassifier
+from src.components.cascade_classifier import CascadeClassifier
 from src.components.model_evaluator import ModelEvaluator
 from src.components.model_validator import ModelValidator
 from src.components.model_tuner import HyperParameterTuner
+from src.components.path_search import PathSearchCV
+from src.components.joint_tuner import JointPCATuner
+from src.components.fold_manager import FoldManager
+from src.components.search_spaces import SearchSpace
+from src.components.stage_cache import StageCache
+from src.components.model_updater import ModelUpdaterConfig, RunningStatistics
+from src.artifact_store import ArtifactStore
+from src.pipeline.artifact_registry import check_serving_load
+from src.pipeline.fused_predictor import export_numpy_model
+from src.pipeline.predict_pipeline import PredictPipeline
+from src.pipeline.track_index import TrackIndexConfig, build_track_index
 from src.logger import logging
-from src.utils import save_object
+from src.utils import save_object, load_object, precision_dtype
 
-from scipy.stats import loguniform
 import os
 
+from sklearn.linear_model import LogisticRegression
+
 EXPECTED_COLUMNS = [
     "Tempo",
     "Dynamics Range",
@@ -29,55 +44,141 @@ EXPECTED_COLUMNS = [
     "Genre"
 ]
 
+# Tune the number of PCA components together with the model instead of keeping the 0.85 variance target
+JOINT_PCA_TUNING = True
+
+# OUT_OF_CORE=1 cleans the raw CSV, fits the scaler and fits PCA chunk by chunk (see
+# OutOfCorePreprocessor) instead of loading the file at once, for catalogs that don't fit in memory
+OUT_OF_CORE = os.environ.get("OUT_OF_CORE", "0") == "1"
+OUT_OF_CORE_CHUNK_SIZE = 100_000
+
+# "float32" keeps the features, PCA components and linear weights in single precision,
+# halving the memory traffic of scaling, projection and scoring
+PRECISION = "float64"
+# Share of rows where float32 predictions must match float64 ones
+MIN_PRECISION_AGREEMENT = 0.99
+
+# Heavy candidate behind a confidence-gated linear first stage (None skips the cascade)
+CASCADE_HEAVY_MODEL = "Support Vector Classifier"
+# First-stage top-class probability above which the heavy model is skipped when serving
+CASCADE_THRESHOLD = 0.4
+# Thresholds whose escalation rate, accuracy and latency are reported
+CASCADE_THRESHOLDS = (0.3, 0.4, 0.5, 0.6, 0.7, 0.8)
+# Share of rows where cascade serving must reproduce CascadeClassifier's predictions and probabilities
+MIN_CASCADE_PARITY = 0.99
+# Share of rows where the fused linear predictor must match the scaler -> PCA -> model pipeline
+MIN_FUSED_PARITY = 1.0
+
 def main():
+    raw_data_path = os.path.join("data", "raw", "music_dataset_mod.csv")
+    processed_data_path = os.path.join("data", "processed", "processed_music_dataset.csv")
+
     ingestion = DataIngestion(
-        raw_data_path=r"data\raw\music_dataset_mod.csv",
-        processed_data_path=r"data/processed/processed_music_dataset.csv"
+        raw_data_path=raw_data_path,
+        processed_data_path=processed_data_path,
+        binary_format="npy",
+        chunk_size=100_000,
+        expected_columns=EXPECTED_COLUMNS
     )
 
-    # Load data
-    df = ingestion.load_data()
-    # Validate data
-    ingestion.validate_data(df, EXPECTED_COLUMNS)
-    # Save processed data
-    ingestion.save_processed_data(df)
-
-    cleaner = DataCleaner()
-    # Standardize column names
-    df = cleaner.standardize_column_names(df)
-    # Remove duplicates
-    df = cleaner.remove_duplicates(df)
-    # Handle missing values
-    df = cleaner.handle_missing_values(df, strategy='drop')
+    # Stages whose data, parameters and code are unchanged are loaded from the cache
+    cache = StageCache()
+    data_key = cache.hash_file(raw_data_path)
+
+    def load_and_clean():
+        # Load data
+        df = ingestion.load_data()
+        # Validate data
+        ingestion.validate_data(df, EXPECTED_COLUMNS)
+        # Save processed data, unless it was just read back from the binary cache
+        if not ingestion.binary_cache_is_fresh():
+            ingestion.save_processed_data(df)
+
+        cleaner = DataCleaner()
+        # Standardize column names
+        df = cleaner.standardize_column_names(df)
+        # Remove duplicates
+        df = cleaner.remove_duplicates(df)
+        # Handle missing values
+        df = cleaner.handle_missing_values(df, strategy='drop')
+        return df
+
+    dtype = precision_dtype(PRECISION)
+    transformer = DataTransformation()
+    pca_handler = PCAHandler(n_components=0.85)
+
+    if OUT_OF_CORE:
+        # Cleaning, scaling and PCA as one streamed stage; later stages get the same outputs
+        out_of_core = OutOfCorePreprocessor(ingestion, EXPECTED_COLUMNS, chunk_size=OUT_OF_CORE_CHUNK_SIZE, strategy='drop')
+        (df, X_scaled, X_pca), pca_key = cache.run(
+            "out_of_core", lambda: out_of_core.run(transformer, pca_handler, dtype=dtype),
+            params={"expected_columns": EXPECTED_COLUMNS, "strategy": 'drop', "chunk_size": OUT_OF_CORE_CHUNK_SIZE,
+                    "precision": PRECISION, "n_components": 0.85},
+            upstream=[data_key],
+            code=[DataIngestion, DataCleaner, DataTransformation, PCAHandler, OutOfCorePreprocessor],
+            artifacts=[transformer.data_transformation_config.preprocessor_obj_file_path,
+                       pca_handler.pca_handler_config.pca_model_path]
+        )
+        clean_key = transform_key = pca_key
+    else:
+        df, clean_key = cache.run(
+            "clean", load_and_clean,
+            params={"expected_columns": EXPECTED_COLUMNS, "strategy": 'drop'},
+            upstream=[data_key], code=[DataIngestion, DataCleaner],
+            artifacts=[processed_data_path]
+        )
+
+        # Fit and transform features; arrays are passed between stages without DataFrame round-trips
+        X_scaled, transform_key = cache.run(
+            "transform", lambda: transformer.fit_transform(df.drop(columns=['genre']), as_frame=False, dtype=dtype)[0],
+            params={"precision": PRECISION},
+            upstream=[clean_key], code=[DataTransformation],
+            artifacts=[transformer.data_transformation_config.preprocessor_obj_file_path]
+        )
+
+        # Apply PCA
+        X_pca, pca_key = cache.run(
+            "pca", lambda: pca_handler.fit_transform(X_scaled, as_frame=False, dtype=dtype),
+            params={"n_components": 0.85},
+            upstream=[transform_key], code=[PCAHandler],
+            artifacts=[pca_handler.pca_handler_config.pca_model_path]
+        )
 
     # Split features / target
     X = df.drop(columns=['genre'])
     y = df['genre']
 
-    transformer = DataTransformation()
-    # Fit and transform features
-    X_scaled,_ = transformer.fit_transform(X)
-
     # Encoding target variable
     label_encoder = TargetLabelEncoder()
-    y_encoded = label_encoder.fit_transform(y)
-
-    # Apply PCA
-    pca_handler = PCAHandler(n_components=0.85)
-    X_pca = pca_handler.fit_transform(X_scaled)
+    y_encoded, encode_key = cache.run(
+        "encode", lambda: label_encoder.fit_transform(y),
+        upstream=[clean_key], code=[TargetLabelEncoder],
+        artifacts=[label_encoder.target_label_encoder_config.label_encoder_obj_file_path]
+    )
 
     # Train models
-    trainer = ModelTrainer(X_pca, y_encoded)
-    models, X_test, y_test = trainer.train_models()
+    trainer = ModelTrainer(X_pca, y_encoded, dtype=dtype)
+    def train_and_evaluate():
+        # Candidates are trained and evaluated concurrently, one worker each
+        models, X_test, y_test = trainer.train_models(n_jobs=-1)
+        return models, X_test, y_test, trainer.evaluation_results
+
+    (models, X_test, y_test, evaluation_results), train_key = cache.run(
+        "train", train_and_evaluate,
+        params={"test_size": trainer.test_size, "random_state": trainer.random_state},
+        upstream=[pca_key, encode_key], code=[ModelTrainer, NystroemClassifier, ModelEvaluator]
+    )
 
-    # Model evaluation
-    evaluator = ModelEvaluator()
+    # Every candidate must still predict, probabilities included, once loaded the way serving loads it
+    for model in models.values():
+        check_serving_load(model, X_test[:5])
 
+    # Model selection on held-out Macro F1
     best_model = None
     best_f1 = 0.0
 
     for name, model in models.items():
-        accuracy, macro_f1, report, cm = evaluator.evaluate_model(model, X_test, y_test)
+        accuracy, macro_f1, report, cm = evaluation_results[name]
 
         if macro_f1 > best_f1:
             best_f1 = macro_f1
@@ -85,25 +186,54 @@ def main():
 
     logging.info(f"Best Model: {best_model.__class__.__name__} with Macro F1 Score: {best_f1}")
 
-    # Validate best model using cross-validation
-    validator = ModelValidator(best_model, X_pca, y_encoded, cv=5, scoring='f1_macro')
-    mean_score, std_score = validator.validate()
-
-    # HyperParameter Tuning
-    param_dist = {
-        'C': loguniform(1e-4, 1e4),
-        'solver': ['lbfgs', 'saga'],
-        'class_weight': [None, 'balanced']
-    }
+    # LogisticRegression is tuned along warm-started regularization paths, other models by random search
+    search = 'path' if isinstance(best_model, LogisticRegression) else 'random'
+
+    # Stratified folds are computed once and shared by validation and tuning
+    folds = FoldManager(X_pca, y_encoded, n_splits=5)
 
-    model_tuner = HyperParameterTuner(
-        best_model,
-        X_pca, y_encoded,
-        param_dist,
-        iter=50, scoring='f1_macro', cv=5
+    # Validate best model using cross-validation
+    validator = ModelValidator(best_model, X_pca, y_encoded, cv=folds, scoring='f1_macro')
+    (mean_score, std_score), _ = cache.run(
+        "validate", validator.validate,
+        params={"model": best_model, "cv": 5, "scoring": 'f1_macro'},
+        upstream=[train_key], code=[ModelValidator, FoldManager]
     )
 
-    tuned_model = model_tuner.tuner()
+    # Joint tuning refits a full PCA in memory, so out-of-core runs keep the incremental one
+    if JOINT_PCA_TUNING and not OUT_OF_CORE:
+        # Component count and hyperparameters tuned from one full PCA fit; overwrites pca_model.pkl
+        joint_tuner = JointPCATuner(
+            best_model,
+            X_scaled, y_encoded,
+            pca_handler=PCAHandler(),
+            scoring='f1_macro', n_splits=5,
+            search=search
+        )
+
+        (tuned_model, n_components, _), tune_key = cache.run(
+            "joint_tune", joint_tuner.tune,
+            params={"model": best_model, "scoring": 'f1_macro', "cv": 5, "search": search,
+                    "tolerance": joint_tuner.tolerance},
+            upstream=[train_key, transform_key],
+            code=[JointPCATuner, HyperParameterTuner, PathSearchCV, SearchSpace, FoldManager, PCAHandler],
+            artifacts=[pca_handler.pca_handler_config.pca_model_path]
+        )
+        logging.info(f"Serving with {n_components} PCA components.")
+    else:
+        # HyperParameter Tuning over the search space registered for the selected model
+        model_tuner = HyperParameterTuner(
+            best_model,
+            X_pca, y_encoded,
+            scoring='f1_macro', cv=folds,
+            search=search
+        )
+
+        tuned_model, tune_key = cache.run(
+            "tune", model_tuner.tuner,
+            params={"model": best_model, "scoring": 'f1_macro', "cv": 5, "search": search},
+            upstream=[train_key], code=[HyperParameterTuner, PathSearchCV, SearchSpace, FoldManager]
+        )
 
     # Saving tuned model
     save_object(
@@ -112,6 +242,88 @@ def main():
     )
     logging.info("Tuned Model Saved.")
 
+    artifact_paths = {
+        "preprocessor": transformer.data_transformation_config.preprocessor_obj_file_path,
+        "target_label_encoder": label_encoder.target_label_encoder_config.label_encoder_obj_file_path,
+        "pca_model": pca_handler.pca_handler_config.pca_model_path,
+        "model": os.path.join("artifacts", "tuned_model.pkl")
+    }
+
+    # Running feature and genre statistics that update_model.py folds new batches into
+    artifact_paths["update_state"] = ModelUpdaterConfig().update_state_path
+    save_object(file_path=artifact_paths["update_state"], obj=RunningStatistics.from_data(X, y_encoded))
+
+    # NumPy-only serving export of linear models; removed when the model can't be fused
+    numpy_model_path = export_numpy_model(
+        artifact_paths["preprocessor"], artifact_paths["pca_model"],
+        artifact_paths["model"], artifact_paths["target_label_encoder"],
+        output_path=os.path.join("artifacts", "numpy_model.npz"),
+        dtype=dtype
+    )
+    if numpy_model_path is not None:
+        artifact_paths["numpy_model"] = numpy_model_path
+
+    # Catalog index in the final PCA space, served by /api/v1/similar
+    artifact_paths["track_index"] = build_track_index(
+        artifact_paths["preprocessor"], artifact_paths["pca_model"],
+        X, labels=y.to_numpy(), track_ids=X.index.to_numpy(),
+        output_path=TrackIndexConfig().track_index_path
+    )
+
+    if CASCADE_HEAVY_MODEL is not None:
+        cascade_model_path = os.path.join("artifacts", "cascade_model.pkl")
+
+        def build_cascade():
+            # Both stages are refitted in the final PCA space; the first stage is the tuned model when it is a LogisticRegression
+            X_final = load_object(artifact_paths["pca_model"]).transform(X_scaled)
+            first_stage = tuned_model if isinstance(tuned_model, LogisticRegression) else models["Logistic Regression"]
+            cascade = CascadeClassifier(first_stage, models[CASCADE_HEAVY_MODEL], threshold=CASCADE_THRESHOLD)
+
+            # Trade-off per threshold on the held-out split, then refit on all rows for serving
+            X_train, X_test, y_train, y_test = ModelTrainer(X_final, y_encoded, dtype=dtype).split_data()
+            evaluation = ModelEvaluator.evaluate_cascade(cascade.fit(X_train, y_train), X_test, y_test, CASCADE_THRESHOLDS)
+            save_object(file_path=cascade_model_path, obj=cascade.fit(X_final, y_encoded))
+            return evaluation
+
+        cache.run(
+            "cascade", build_cascade,
+            params={"heavy": CASCADE_HEAVY_MODEL, "threshold": CASCADE_THRESHOLD, "thresholds": CASCADE_THRESHOLDS},
+            upstream=[tune_key, train_key],
+            code=[CascadeClassifier, ModelEvaluator],
+            artifacts=[cascade_model_path]
+        )
+        artifact_paths["cascade_model"] = cascade_model_path
+
+    # Publish the run's artifacts as one version; serving reloads on the new manifest
+    ArtifactStore().publish(artifact_paths, data_hash=data_key)
+
+    if numpy_model_path is not None:
+        # The fused export replaces the pipeline for serving, so it must give the same predictions
+        parity = PredictPipeline(fused=True, precision=PRECISION).check_fused_parity(X)
+        if parity < MIN_FUSED_PARITY:
+            raise ValueError(
+                f"Fused predictions match the pipeline on only {parity:.2%} of rows; "
+                f"set NUMPY_SERVING=0 until the export is fixed."
+            )
+
+    if CASCADE_HEAVY_MODEL is not None:
+        # Cascade serving runs the first stage fused; both its paths must match the saved estimator
+        parity = PredictPipeline(fused=True, precision=PRECISION, cascade=True).check_cascade_parity(X)
+        if min(parity) < MIN_CASCADE_PARITY:
+            logging.warning(
+                f"Cascade serving matches CascadeClassifier on only {parity[0]:.2%} of predictions "
+                f"and {parity[1]:.2%} of probability rows."
+            )
+
+    if PRECISION != "float64":
+        # Reduced precision must not change the served predictions
+        agreement = PredictPipeline(fused=True, precision=PRECISION).check_precision_agreement(X)
+        if agreement < MIN_PRECISION_AGREEMENT:
+            logging.warning(
+                f"{PRECISION} predictions agree with float64 on only {agreement:.2%} of rows; "
+                f"consider training with PRECISION = 'float64'."
+            )
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
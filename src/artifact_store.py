@@ -0,0 +1,169 @@
+import hashlib
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from src.exception import CustomException
+from src.logger import logging
+
+
+@dataclass
+class ArtifactStoreConfig:
+    manifest_path: str = os.path.join("artifacts", "manifest.json")
+
+
+def file_checksum(file_path: str) -> str:
+    """
+    Returns the SHA-256 of a file's contents, read in blocks.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file_obj:
+        for block in iter(lambda: file_obj.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ArtifactStore:
+    """
+    Versioned manifest over the artifacts of one training run.
+
+    Artifacts are saved atomically by `save_object`. Once a run has saved all
+    of them, `publish` writes manifest.json, itself atomically and last,
+    with an increasing version, the training data hash, library versions
+    and a checksum per file. Readers key on the manifest version and check
+    the files against it, so a bundle mixing two runs is never served.
+    """
+
+    def __init__(self, config: Optional[ArtifactStoreConfig] = None):
+        self.config = config or ArtifactStoreConfig()
+
+    def _entry_path(self, file_name: str) -> str:
+        return os.path.join(os.path.dirname(self.config.manifest_path), file_name)
+
+    def read_manifest(self) -> Optional[Dict]:
+        """
+        Returns:
+            dict: The current manifest, or None if nothing was published yet.
+        """
+        try:
+            with open(self.config.manifest_path) as file_obj:
+                return json.load(file_obj)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def publish(self, artifact_paths: Dict[str, str], data_hash: Optional[str] = None) -> Dict:
+        """
+        Records the given artifact files as a new version.
+
+        Args:
+            artifact_paths (Dict[str, str]): Mapping of artifact name to saved file path.
+            data_hash (str): Hash of the training data the artifacts were built from.
+
+        Returns:
+            dict: The written manifest.
+        """
+        try:
+            import sklearn
+
+            previous = self.read_manifest()
+            manifest_dir = os.path.dirname(self.config.manifest_path)
+            manifest = {
+                "version": (previous["version"] + 1) if previous else 1,
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "data_hash": data_hash,
+                "sklearn_version": sklearn.__version__,
+                "numpy_version": np.__version__,
+                "artifacts": {
+                    name: {
+                        "file": os.path.relpath(path, manifest_dir or "."),
+                        "sha256": file_checksum(path),
+                        "size": os.path.getsize(path)
+                    }
+                    for name, path in sorted(artifact_paths.items())
+                }
+            }
+
+            os.makedirs(manifest_dir or ".", exist_ok=True)
+            tmp_path = f"{self.config.manifest_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as file_obj:
+                json.dump(manifest, file_obj, indent=2)
+            os.replace(tmp_path, self.config.manifest_path)
+
+            logging.info(f"Published artifact version {manifest['version']}: {sorted(artifact_paths)}")
+            return manifest
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def verify(self, manifest: Dict, artifact_paths: Dict[str, str]) -> None:
+        """
+        Checks that the files at `artifact_paths` are the ones the manifest lists.
+
+        Artifacts the manifest doesn't list are not checked.
+
+        Raises:
+            ValueError: If a file doesn't match its recorded checksum.
+        """
+        entries = {
+            os.path.abspath(self._entry_path(entry["file"])): entry
+            for entry in manifest["artifacts"].values()
+        }
+        for name, path in artifact_paths.items():
+            entry = entries.get(os.path.abspath(path))
+            if entry is None:
+                continue
+            if os.path.getsize(path) != entry["size"] or file_checksum(path) != entry["sha256"]:
+                raise ValueError(
+                    f"Artifact '{name}' at {path} does not match manifest version {manifest['version']}; "
+                    "a training run is probably still saving."
+                )
+
+    def load(self, artifact_paths: Dict[str, str], mmap_mode: Optional[str] = None,
+             loader: Optional[Callable[[str], object]] = None):
+        """
+        Loads artifacts consistent with the current manifest.
+
+        Args:
+            artifact_paths (Dict[str, str]): Mapping of artifact name to file path.
+            mmap_mode (str): Passed to `load_object`, e.g. 'r' to share array pages between processes.
+            loader (Callable): Loads one file instead of `load_object`, e.g. NumpyLinearPredictor.load.
+
+        Returns:
+            Tuple[Dict[str, object], Optional[dict]]: Loaded objects and the manifest they match.
+        """
+        try:
+            if loader is None:
+                # Imported here so numpy-only serving doesn't pull in joblib and pandas.
+                from src.utils import load_object
+
+                def loader(path):
+                    return load_object(path, mmap_mode=mmap_mode)
+
+            manifest = self.read_manifest()
+            objects = {
+                name: loader(path)
+                for name, path in artifact_paths.items()
+            }
+
+            if manifest is not None:
+                # Checked after loading: a file replaced while loading fails the check too.
+                self.verify(manifest, artifact_paths)
+                # Only relevant once unpickling has imported scikit-learn.
+                sklearn = sys.modules.get("sklearn")
+                if sklearn is not None and manifest["sklearn_version"] != sklearn.__version__:
+                    logging.warning(
+                        f"Artifacts were trained with scikit-learn {manifest['sklearn_version']}, "
+                        f"running {sklearn.__version__}."
+                    )
+
+            return objects, manifest
+
+        except Exception as e:
+            raise CustomException(e, sys)
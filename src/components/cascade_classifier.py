@@ -0,0 +1,75 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+from sklearn.base import BaseEstimator, ClassifierMixin, clone
+from sklearn.utils.validation import check_array, check_is_fitted
+
+
+class CascadeClassifier(ClassifierMixin, BaseEstimator):
+    """
+    Confidence-gated two-stage classifier.
+
+    A cheap first stage (a linear model, which serving runs as a fused
+    matmul) answers every row whose top-class probability reaches
+    `threshold`; only the remaining, ambiguous rows are passed to the heavy
+    model (e.g. the RBF SVC or KNN). Both stages are fitted on the same data,
+    so their classes line up.
+    """
+
+    def __init__(self, first_stage, heavy, threshold: float = 0.7):
+        """
+        Args:
+            first_stage: Unfitted classifier with predict_proba, e.g. LogisticRegression.
+            heavy: Unfitted classifier for the escalated rows.
+            threshold (float): Minimum first-stage top-class probability to answer without escalating.
+        """
+        self.first_stage = first_stage
+        self.heavy = heavy
+        self.threshold = threshold
+
+    def fit(self, X, y):
+        self.first_stage_ = clone(self.first_stage).fit(X, y)
+        self.heavy_ = clone(self.heavy).fit(X, y)
+        if not np.array_equal(self.first_stage_.classes_, self.heavy_.classes_):
+            raise ValueError("Both cascade stages must be fitted on the same classes.")
+        self.classes_ = self.first_stage_.classes_
+        return self
+
+    def _check(self, X, threshold: Optional[float]) -> Tuple[np.ndarray, float]:
+        check_is_fitted(self, "first_stage_")
+        X = check_array(X, dtype=[np.float64, np.float32])
+        return X, self.threshold if threshold is None else threshold
+
+    def predict_with_escalation(self, X, threshold: Optional[float] = None):
+        """
+        Predicts classes and reports which rows went to the heavy model.
+
+        Args:
+            X (np.ndarray): Features in the space both stages were fitted on.
+            threshold (float): Overrides `threshold`, e.g. to evaluate several thresholds without refitting.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Predictions and the boolean escalation mask.
+        """
+        X, threshold = self._check(X, threshold)
+        proba = self.first_stage_.predict_proba(X)
+        predictions = self.classes_[proba.argmax(axis=1)]
+        escalated = proba.max(axis=1) < threshold
+        if escalated.any():
+            predictions[escalated] = self.heavy_.predict(X[escalated])
+        return predictions, escalated
+
+    def predict(self, X) -> np.ndarray:
+        return self.predict_with_escalation(X)[0]
+
+    def predict_proba(self, X, threshold: Optional[float] = None) -> np.ndarray:
+        """
+        First-stage probabilities, replaced by the heavy model's for escalated rows.
+        """
+        X, threshold = self._check(X, threshold)
+        proba = self.first_stage_.predict_proba(X)
+        escalated = proba.max(axis=1) < threshold
+        if escalated.any():
+            proba[escalated] = self.heavy_.predict_proba(X[escalated])
+        return proba
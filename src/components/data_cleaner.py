@@ -1,6 +1,9 @@
+import math
 import os
 import sys
+from typing import Callable, Dict, Iterable, Iterator
 
+import numpy as np
 import pandas as pd
 
 from src.exception import CustomException
@@ -80,5 +83,234 @@ class DataCleaner:
 
         except Exception as e:
             raise CustomException(e, sys)
-        
-    
\ No newline at end of file
+
+
+class _RowHashSet:
+    """
+    Exact set of 64-bit row hashes, kept as one sorted uint64 array (8 bytes per row).
+    """
+
+    def __init__(self):
+        self.hashes = np.empty(0, dtype=np.uint64)
+
+    def seen_and_add(self, hashes: np.ndarray) -> np.ndarray:
+        positions = np.searchsorted(self.hashes, hashes)
+        seen = np.zeros(len(hashes), dtype=bool)
+        in_range = positions < len(self.hashes)
+        seen[in_range] = self.hashes[positions[in_range]] == hashes[in_range]
+        # New hashes are unique, so a sorted insert keeps the array sorted in O(n).
+        new = np.sort(hashes[~seen])
+        self.hashes = np.insert(self.hashes, np.searchsorted(self.hashes, new), new)
+        return seen
+
+
+class _BloomFilter:
+    """
+    Bloom filter over 64-bit row hashes, sized for `capacity` rows.
+
+    Uses about 29 bits per row at a 1e-6 false positive rate. A false
+    positive drops a row that is actually new.
+    """
+
+    def __init__(self, capacity: int, false_positive_rate: float):
+        self.n_bits = max(64, int(math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2)))
+        self.n_hashes = max(1, int(round(self.n_bits / capacity * math.log(2))))
+        self.bits = np.zeros((self.n_bits + 7) // 8, dtype=np.uint8)
+
+    def _positions(self, hashes: np.ndarray) -> np.ndarray:
+        # Double hashing: the k probe positions are h1 + i * h2.
+        h1 = hashes & np.uint64(0xFFFFFFFF)
+        h2 = (hashes >> np.uint64(32)) | np.uint64(1)
+        probes = np.arange(self.n_hashes, dtype=np.uint64)
+        return (h1[:, None] + probes[None, :] * h2[:, None]) % np.uint64(self.n_bits)
+
+    def seen_and_add(self, hashes: np.ndarray) -> np.ndarray:
+        positions = self._positions(hashes)
+        byte_index, bit = positions // np.uint64(8), (positions % np.uint64(8)).astype(np.uint8)
+        seen = ((self.bits[byte_index] >> bit) & 1).all(axis=1)
+        np.bitwise_or.at(self.bits, byte_index.ravel(), (np.uint8(1) << bit).ravel())
+        return seen
+
+
+class StreamingDataCleaner:
+    """
+    Cleans a dataset chunk by chunk, for data that doesn't fit in memory.
+
+    Duplicates are removed with a set of 64-bit row hashes:
+    - 'exact': a sorted hash array, 8 bytes per unique row. Exact up to
+      64-bit hash collisions.
+    - 'bloom': a Bloom filter sized for `expected_rows`, about 4 bytes per
+      row, which may drop a few unique rows at `false_positive_rate`.
+
+    Imputation statistics are computed on the deduplicated rows in a first
+    pass (`fit`) and applied in a second (`transform`): exact means; medians
+    from a uniform reservoir sample of `reservoir_size` rows, exact when the
+    data is smaller; modes from exact counts for text columns and from the
+    reservoir for numeric ones. Memory stays bounded by the reservoir and
+    the hash set, not by the data.
+    """
+
+    def __init__(self, strategy: str = 'drop', dedup: str = 'exact', expected_rows: int = 10_000_000,
+                 false_positive_rate: float = 1e-6, reservoir_size: int = 100_000, random_state: int = 42):
+        """
+        Args:
+            strategy (str): Missing value strategy ('mean', 'median', 'mode', 'drop').
+            dedup (str): Deduplication mode ('exact', 'bloom').
+            expected_rows (int): Rows the Bloom filter is sized for.
+            false_positive_rate (float): Bloom filter false positive rate.
+            reservoir_size (int): Rows sampled for median and numeric mode.
+            random_state (int): Seed of the reservoir sample.
+        """
+        if strategy not in ('mean', 'median', 'mode', 'drop'):
+            raise ValueError(f"Unknown strategy: {strategy}")
+        if dedup not in ('exact', 'bloom'):
+            raise ValueError(f"Unknown dedup mode: {dedup}")
+
+        self.strategy = strategy
+        self.dedup = dedup
+        self.expected_rows = expected_rows
+        self.false_positive_rate = false_positive_rate
+        self.reservoir_size = reservoir_size
+        self.random_state = random_state
+        self.fill_values_: Dict[str, object] = {}
+
+    def _new_row_set(self):
+        if self.dedup == 'bloom':
+            return _BloomFilter(self.expected_rows, self.false_positive_rate)
+        return _RowHashSet()
+
+    @staticmethod
+    def _deduplicate(chunk: pd.DataFrame, row_set) -> pd.DataFrame:
+        hashes = pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+        # Repeats within the chunk first, then rows seen in earlier chunks.
+        _, first = np.unique(hashes, return_index=True)
+        first.sort()
+        new = ~row_set.seen_and_add(hashes[first])
+        return chunk.iloc[first[new]]
+
+    def _deduplicated(self, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        row_set = self._new_row_set()
+        n_in, n_out = 0, 0
+        for chunk in chunks:
+            n_in += len(chunk)
+            chunk = self._deduplicate(chunk, row_set)
+            n_out += len(chunk)
+            yield chunk
+        logging.info(f"Streaming deduplication ({self.dedup}) kept {n_out} of {n_in} rows.")
+
+    def _fill(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        # Categorical chunks (e.g. from DataIngestion.iter_chunks) only know the categories
+        # they contain, and fillna can't add one, so the fill value is added first.
+        for col, value in self.fill_values_.items():
+            if col in chunk and isinstance(chunk[col].dtype, pd.CategoricalDtype) \
+                    and pd.notna(value) and value not in chunk[col].cat.categories:
+                chunk = chunk.assign(**{col: chunk[col].cat.add_categories([value])})
+        return chunk.fillna(self.fill_values_)
+
+    def fit(self, chunks: Iterable[pd.DataFrame]) -> "StreamingDataCleaner":
+        """
+        First pass: computes the imputation statistics of the deduplicated rows.
+
+        Args:
+            chunks (Iterable[pd.DataFrame]): Chunks with standardized column names.
+        """
+        try:
+            self.fill_values_ = {}
+            if self.strategy == 'drop':
+                return self
+
+            logging.info(f"Computing '{self.strategy}' imputation statistics in a streaming pass.")
+            rng = np.random.RandomState(self.random_state)
+            numeric_columns = None
+            sums = counts = reservoir = None
+            value_counts: Dict[str, pd.Series] = {}
+            n_seen = 0
+
+            for chunk in self._deduplicated(chunks):
+                if numeric_columns is None:
+                    numeric_columns = chunk.select_dtypes(include="number").columns.tolist()
+                    sums = np.zeros(len(numeric_columns))
+                    counts = np.zeros(len(numeric_columns))
+                    reservoir = np.empty((0, len(numeric_columns)))
+
+                values = chunk[numeric_columns].to_numpy(dtype=np.float64)
+                sums += np.nansum(values, axis=0)
+                counts += (~np.isnan(values)).sum(axis=0)
+
+                # Vectorized reservoir sampling (Algorithm R).
+                n_fill = min(len(values), self.reservoir_size - len(reservoir))
+                reservoir = np.vstack([reservoir, values[:n_fill]])
+                rest = values[n_fill:]
+                if len(rest):
+                    slots = rng.randint(0, n_seen + n_fill + np.arange(len(rest)) + 1)
+                    keep = slots < self.reservoir_size
+                    reservoir[slots[keep]] = rest[keep]
+                n_seen += len(values)
+
+                for col in chunk.columns.difference(numeric_columns):
+                    counts_in_chunk = chunk[col].value_counts(dropna=True)
+                    value_counts[col] = counts_in_chunk.add(value_counts[col], fill_value=0) if col in value_counts else counts_in_chunk
+
+            if numeric_columns is None:
+                raise ValueError("No chunks to compute imputation statistics on.")
+
+            for i, col in enumerate(numeric_columns):
+                if self.strategy == 'mean':
+                    self.fill_values_[col] = sums[i] / counts[i] if counts[i] else np.nan
+                elif self.strategy == 'median':
+                    self.fill_values_[col] = np.nanmedian(reservoir[:, i]) if counts[i] else np.nan
+                else:
+                    sample = pd.Series(reservoir[:, i]).mode()
+                    self.fill_values_[col] = sample.iloc[0] if len(sample) else np.nan
+            if self.strategy == 'mode':
+                for col, col_counts in value_counts.items():
+                    if len(col_counts):
+                        # Ties resolve to the smallest value, as DataFrame.mode does.
+                        top = col_counts[col_counts == col_counts.max()]
+                        self.fill_values_[col] = sorted(top.index)[0]
+
+            logging.info(f"Imputation statistics computed from {n_seen} rows: {self.fill_values_}")
+            return self
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def transform(self, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """
+        Second pass: deduplicates the chunks and handles their missing values.
+
+        Args:
+            chunks (Iterable[pd.DataFrame]): The same chunks `fit` saw.
+
+        Yields:
+            pd.DataFrame: Cleaned chunk.
+        """
+        try:
+            for chunk in self._deduplicated(chunks):
+                if self.strategy == 'drop':
+                    yield chunk.dropna()
+                else:
+                    yield self._fill(chunk)
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def clean(self, chunk_source: Callable[[], Iterable[pd.DataFrame]]) -> pd.DataFrame:
+        """
+        Runs both passes and concatenates the cleaned chunks.
+
+        Args:
+            chunk_source (Callable): Returns a fresh iterable of chunks each call,
+                e.g. lambda: ingestion.iter_chunks(EXPECTED_COLUMNS).
+
+        Returns:
+            pd.DataFrame: Cleaned dataset.
+        """
+        try:
+            self.fit(chunk_source())
+            df = pd.concat(list(self.transform(chunk_source())), ignore_index=True)
+            logging.info(f"Streaming cleaning completed. New shape: {df.shape}")
+            return df
+
+        except Exception as e:
+            raise CustomException(e, sys)
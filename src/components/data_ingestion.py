@@ -1,20 +1,232 @@
+import json
 import os
 import sys
-from typing import List
+from typing import Dict, Iterator, List, Optional
 
 from src.exception import CustomException
 from src.logger import logging
 
+import numpy as np
 import pandas as pd
 
+BINARY_FORMATS = ("npy", "parquet")
+
+# Text columns of the schema; every other expected column is a float32 feature.
+LABEL_COLUMNS = ("Genre",)
+
 class DataIngestion:
     """
     Handles data loading and validation.
+
+    With `binary_format` set, processed data is also stored in a columnar
+    binary form next to the processed CSV, and `load_data` reads that
+    instead of parsing the raw CSV whenever it is newer than the raw file:
+
+    - "npy": numeric columns as one float32 array in column-major order,
+      memory-mapped on load, plus int16 codes for the text columns and a
+      small JSON file with column names and categories.
+    - "parquet": the DataFrame as a Parquet file (requires pyarrow).
+
+    With `chunk_size` set, the raw CSV is read in typed chunks instead (see
+    `iter_chunks`), which needs well under half the memory of a default load.
     """
 
-    def __init__(self, raw_data_path: str, processed_data_path: str):
+    def __init__(self, raw_data_path: str, processed_data_path: str, binary_format: Optional[str] = None,
+                 chunk_size: Optional[int] = None, expected_columns: Optional[List[str]] = None):
+        """
+        Args:
+            raw_data_path (str): Raw CSV file.
+            processed_data_path (str): Processed CSV file.
+            binary_format (str): Optional binary cache format, one of BINARY_FORMATS.
+            chunk_size (int): Rows per chunk for chunked, typed loading.
+            expected_columns (List[str]): Schema for chunked loading; required with `chunk_size`.
+        """
+        if chunk_size is not None and expected_columns is None:
+            raise ValueError("Chunked loading needs expected_columns to derive dtypes from.")
+        if binary_format is not None and binary_format not in BINARY_FORMATS:
+            raise ValueError(f"binary_format must be one of {BINARY_FORMATS}, got {binary_format!r}")
+
         self.raw_data_path = raw_data_path
         self.processed_data_path = processed_data_path
+        self.binary_format = binary_format
+        self.chunk_size = chunk_size
+        self.expected_columns = expected_columns
+
+    @staticmethod
+    def schema_dtypes(expected_columns: List[str]) -> Dict[str, object]:
+        """
+        Returns compact read_csv dtypes for the schema: float32 features, categorical labels.
+        """
+        return {
+            col: ("category" if col in LABEL_COLUMNS else np.float32)
+            for col in expected_columns
+        }
+
+    def iter_chunks(self, expected_columns: List[str], chunk_size: int = 100_000) -> Iterator[pd.DataFrame]:
+        """
+        Reads the raw CSV in typed chunks, validating each one as it arrives.
+
+        The header is checked before any data is parsed, and a chunk with
+        values that don't parse as numbers, or are infinite, fails with its
+        row range, so a bad file fails at the first bad chunk instead of
+        after a full load. Only the schema columns are read.
+
+        Args:
+            expected_columns (List[str]): Schema column names.
+            chunk_size (int): Rows per chunk.
+
+        Yields:
+            pd.DataFrame: Validated chunk with schema dtypes.
+        """
+        try:
+            if not os.path.exists(self.raw_data_path):
+                raise FileNotFoundError(f"Raw data file not found at {self.raw_data_path}")
+
+            self.validate_data(pd.read_csv(self.raw_data_path, nrows=0), expected_columns)
+
+            reader = pd.read_csv(
+                self.raw_data_path,
+                usecols=expected_columns,
+                dtype=self.schema_dtypes(expected_columns),
+                chunksize=chunk_size
+            )
+            start = 0
+            while True:
+                try:
+                    chunk = next(reader)
+                except StopIteration:
+                    break
+                except ValueError as e:
+                    raise ValueError(f"Invalid values in rows {start}-{start + chunk_size - 1}: {e}") from e
+
+                features = chunk.select_dtypes(include="number").to_numpy()
+                if np.isinf(features).any():
+                    bad_rows = start + np.flatnonzero(np.isinf(features).any(axis=1))
+                    raise ValueError(f"Infinite feature values in rows {bad_rows[:10].tolist()}")
+
+                start += len(chunk)
+                yield chunk
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def _count_lines(self) -> int:
+        n_lines = 0
+        with open(self.raw_data_path, "rb") as file_obj:
+            for block in iter(lambda: file_obj.read(1 << 20), b""):
+                n_lines += block.count(b"\n")
+        return n_lines + 1
+
+    def _load_chunked(self) -> pd.DataFrame:
+        """
+        Assembles typed chunks into preallocated column-major arrays.
+
+        The line count bounds the row count, so features go straight into
+        one float32 array and labels into int16 codes, without holding the
+        chunks and their concatenation at the same time.
+        """
+        feature_columns = [col for col in self.expected_columns if col not in LABEL_COLUMNS]
+        label_columns = [col for col in self.expected_columns if col in LABEL_COLUMNS]
+
+        capacity = self._count_lines()
+        features = np.empty((capacity, len(feature_columns)), dtype=np.float32, order="F")
+        codes = np.empty((capacity, len(label_columns)), dtype=np.int16, order="F")
+        categories: Dict[str, Dict[str, int]] = {col: {} for col in label_columns}
+
+        n_rows = 0
+        for chunk in self.iter_chunks(self.expected_columns, self.chunk_size):
+            end = n_rows + len(chunk)
+            if end > capacity:
+                capacity = max(end, 2 * capacity)
+                features = np.resize(features, (capacity, len(feature_columns)))
+                codes = np.resize(codes, (capacity, len(label_columns)))
+
+            features[n_rows:end] = chunk[feature_columns].to_numpy()
+            for i, col in enumerate(label_columns):
+                # Map the chunk's own categories onto the categories seen so far.
+                seen = categories[col]
+                chunk_categories = chunk[col].cat.categories
+                mapping = np.array([seen.setdefault(value, len(seen)) for value in chunk_categories] + [-1], dtype=np.int16)
+                codes[n_rows:end, i] = mapping[chunk[col].cat.codes.to_numpy()]
+            n_rows = end
+
+        columns = {col: features[:n_rows, i] for i, col in enumerate(feature_columns)}
+        for i, col in enumerate(label_columns):
+            columns[col] = pd.Categorical.from_codes(codes[:n_rows, i], categories=list(categories[col]))
+        return pd.DataFrame(columns, copy=False)[self.expected_columns]
+
+    def _binary_paths(self) -> Dict[str, str]:
+        stem = os.path.splitext(self.processed_data_path)[0]
+        if self.binary_format == "parquet":
+            return {"data": f"{stem}.parquet"}
+        return {
+            "features": f"{stem}.features.npy",
+            "labels": f"{stem}.labels.npy",
+            # Written last, so its presence marks a complete cache.
+            "meta": f"{stem}.meta.json"
+        }
+
+    def binary_cache_is_fresh(self) -> bool:
+        if self.binary_format is None:
+            return False
+        marker = list(self._binary_paths().values())[-1]
+        return (
+            os.path.exists(marker)
+            and os.path.getmtime(marker) > os.path.getmtime(self.raw_data_path)
+        )
+
+    def _load_binary(self) -> pd.DataFrame:
+        paths = self._binary_paths()
+        if self.binary_format == "parquet":
+            return pd.read_parquet(paths["data"])
+
+        with open(paths["meta"]) as file_obj:
+            meta = json.load(file_obj)
+        # Column-major float32 memmap: the DataFrame wraps it without copying.
+        features = np.load(paths["features"], mmap_mode="r")
+        labels = np.load(paths["labels"], mmap_mode="r")
+
+        columns = {
+            name: features[:, i]
+            for i, name in enumerate(meta["feature_columns"])
+        }
+        for i, name in enumerate(meta["label_columns"]):
+            columns[name] = pd.Categorical.from_codes(np.asarray(labels[:, i]), categories=meta["categories"][name])
+        return pd.DataFrame(columns, copy=False)[meta["columns"]]
+
+    def _save_binary(self, df: pd.DataFrame) -> None:
+        paths = self._binary_paths()
+        if self.binary_format == "parquet":
+            tmp_path = f"{paths['data']}.tmp"
+            df.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, paths["data"])
+            return
+
+        feature_columns = [col for col in df.columns if pd.api.types.is_numeric_dtype(df[col])]
+        label_columns = [col for col in df.columns if col not in feature_columns]
+        categories = {}
+        labels = np.empty((len(df), len(label_columns)), dtype=np.int16, order="F")
+        for i, name in enumerate(label_columns):
+            values = df[name].astype("category")
+            categories[name] = values.cat.categories.tolist()
+            labels[:, i] = values.cat.codes
+
+        meta = {
+            "columns": df.columns.tolist(),
+            "feature_columns": feature_columns,
+            "label_columns": label_columns,
+            "categories": categories
+        }
+        features = np.asfortranarray(df[feature_columns].to_numpy(dtype=np.float32))
+
+        for key, array in (("features", features), ("labels", labels)):
+            tmp_path = f"{paths[key]}.tmp.npy"
+            np.save(tmp_path, array)
+            os.replace(tmp_path, paths[key])
+        tmp_path = f"{paths['meta']}.tmp"
+        with open(tmp_path, "w") as file_obj:
+            json.dump(meta, file_obj)
+        os.replace(tmp_path, paths["meta"])
 
     def load_data(self) -> pd.DataFrame:
         """
@@ -30,7 +242,17 @@ class DataIngestion:
             if not os.path.exists(self.raw_data_path):
                 raise FileNotFoundError(f"Raw data file not found at {self.raw_data_path}")
 
-            df = pd.read_csv(self.raw_data_path)
+            if self.binary_cache_is_fresh():
+                logging.info(f"Reading {self.binary_format} cache of the processed data instead of the raw CSV.")
+                df = self._load_binary()
+                logging.info(f"Data loaded successfully with shape: {df.shape}")
+                return df
+
+            if self.chunk_size is not None:
+                logging.info(f"Reading the raw CSV in typed chunks of {self.chunk_size} rows.")
+                df = self._load_chunked()
+            else:
+                df = pd.read_csv(self.raw_data_path)
 
             logging.info(f"Data loaded successfully with shape: {df.shape}")
 
@@ -61,7 +283,8 @@ class DataIngestion:
 
     def save_processed_data(self, df: pd.DataFrame) -> None:
         """
-        Saves processed data to processed folder.
+        Saves processed data to processed folder, and to the binary cache
+        when `binary_format` is set.
 
         Args:
             df (pd.DataFrame): Clean dataset.
@@ -72,6 +295,10 @@ class DataIngestion:
 
             df.to_csv(self.processed_data_path, index=False, header=True)
             logging.info(f"Processed data saved successfully at {self.processed_data_path}.")
+
+            if self.binary_format is not None:
+                self._save_binary(df)
+                logging.info(f"Processed data cached in {self.binary_format} format.")
             
         except Exception as e:
             raise CustomException(e, sys)
\ No newline at end of file
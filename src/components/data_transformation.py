@@ -1,5 +1,6 @@
 import os
 import sys
+from typing import Iterable, Iterator
 
 import pandas as pd
 import numpy as np
@@ -56,15 +57,43 @@ class DataTransformation:
         
 
 
-    def fit_transform(self, X: pd.DataFrame):
+    @staticmethod
+    def _apply(preprocessor, X: pd.DataFrame):
+        # A ColumnTransformer copies its output once more to hstack the transformer
+        # outputs; with a single transformer and nothing else kept, call it directly.
+        transformers = [
+            (name, transformer, columns)
+            for name, transformer, columns in preprocessor.transformers_
+            if transformer != "drop"
+        ]
+        if len(transformers) == 1 and transformers[0][0] != "remainder":
+            _, transformer, columns = transformers[0]
+            return transformer.transform(X[columns])
+        return preprocessor.transform(X)
+
+    def fit_transform(self, X: pd.DataFrame, as_frame: bool = True, dtype=None):
+        """
+        Args:
+            X (pd.DataFrame): Features; columns are selected by name, so this is the DataFrame edge.
+            as_frame (bool): Wrap the output in a DataFrame. With False the scaler's
+                ndarray is returned as is, for stages that consume arrays anyway.
+            dtype: Optional float dtype, e.g. np.float32, to scale in. Casting is
+                skipped when the columns already have it.
+
+        Returns:
+            Tuple: Scaled features and the path of the saved preprocessor.
+        """
         try:
             logging.info("Starting data transformation process.")
+            if dtype is not None and not (X.dtypes == dtype).all():
+                X = X.astype(dtype)
 
             # Get the data transformer object
             preprocessor = self.get_data_transformer_object(X)
 
             # Fit and transform the data
-            X_scaled = preprocessor.fit_transform(X)
+            preprocessor.fit(X)
+            X_scaled = self._apply(preprocessor, X)
             logging.info("Data transformation completed.")
 
             # Save the preprocessor object
@@ -74,8 +103,11 @@ class DataTransformation:
             )
             logging.info("Preprocessor object saved successfully.")
 
+            if as_frame:
+                X_scaled = pd.DataFrame(X_scaled, columns=X.columns)
+
             return (
-                pd.DataFrame(X_scaled, columns=X.columns),
+                X_scaled,
                 self.data_transformation_config.preprocessor_obj_file_path
             )
 
@@ -83,19 +115,93 @@ class DataTransformation:
             raise CustomException(e, sys)
         
 
-    def transform(self, X: pd.DataFrame):
+    def transform(self, X: pd.DataFrame, as_frame: bool = True, dtype=None):
+        """
+        Args:
+            X (pd.DataFrame): Features.
+            as_frame (bool): Wrap the output in a DataFrame, see `fit_transform`.
+            dtype: Optional float dtype to scale in.
+        """
         try:
             logging.info("Starting data transformation for new data.")
+            if dtype is not None and not (X.dtypes == dtype).all():
+                X = X.astype(dtype)
 
             # Load the preprocessor object
             preprocessor = load_object(self.data_transformation_config.preprocessor_obj_file_path)
 
             # Transform the data
-            X_scaled = preprocessor.transform(X)
+            X_scaled = self._apply(preprocessor, X)
             logging.info("Data transformation for new data completed.")
 
-            return pd.DataFrame(X_scaled, columns=X.columns)
+            if as_frame:
+                return pd.DataFrame(X_scaled, columns=X.columns)
+            return X_scaled
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+
+    def fit_chunks(self, chunks: Iterable[pd.DataFrame]):
+        """
+        Fits the preprocessor out-of-core from an iterable of feature chunks.
+
+        The ColumnTransformer is fitted on the first chunk, then its
+        StandardScaler is updated with `partial_fit` on every further chunk,
+        which yields the same mean and variance as a fit on all rows.
+
+        Args:
+            chunks (Iterable[pd.DataFrame]): Feature chunks, e.g. from pd.read_csv(chunksize=...).
+
+        Returns:
+            str: Path of the saved preprocessor object.
+        """
+        try:
+            logging.info("Starting chunked data transformation fit.")
+            preprocessor = None
+            scaler = None
+            num_features = None
+            n_rows = 0
+
+            for chunk in chunks:
+                if preprocessor is None:
+                    preprocessor = self.get_data_transformer_object(chunk)
+                    preprocessor.fit(chunk)
+                    _, num_pipeline, num_features = preprocessor.transformers_[0]
+                    scaler = num_pipeline.named_steps['scaler']
+                else:
+                    scaler.partial_fit(chunk[num_features])
+                n_rows += len(chunk)
+
+            if preprocessor is None:
+                raise ValueError("No chunks to fit the preprocessor on.")
+            logging.info(f"Chunked data transformation fit completed on {n_rows} rows.")
+
+            save_object(
+                file_path=self.data_transformation_config.preprocessor_obj_file_path,
+                obj=preprocessor
+            )
+            logging.info("Preprocessor object saved successfully.")
+
+            return self.data_transformation_config.preprocessor_obj_file_path
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def transform_chunks(self, chunks: Iterable[pd.DataFrame]) -> Iterator:
+        """
+        Scales feature chunks with the saved preprocessor, loading it only once.
+
+        Args:
+            chunks (Iterable[pd.DataFrame]): Feature chunks.
+
+        Yields:
+            np.ndarray: Scaled chunk.
+        """
+        try:
+            preprocessor = load_object(self.data_transformation_config.preprocessor_obj_file_path)
+            for chunk in chunks:
+                yield preprocessor.transform(chunk)
 
         except Exception as e:
             raise CustomException(e, sys)
-        
\ No newline at end of file
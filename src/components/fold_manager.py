@@ -0,0 +1,126 @@
+import sys
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from sklearn.metrics.pairwise import euclidean_distances
+from sklearn.model_selection import StratifiedKFold
+from sklearn.utils import _safe_indexing
+
+from src.exception import CustomException
+from src.logger import logging
+
+
+class FoldManager:
+    """
+    Computes stratified cross-validation folds once and shares them.
+
+    The same instance is passed as `cv` to ModelValidator and
+    HyperParameterTuner. It behaves like an sklearn CV splitter but always
+    yields the precomputed index arrays, so the data is split only once per
+    training run.
+
+    Per-fold train/test arrays are cached on first use, for the data the
+    manager was built with (see `holds`). For kernel models the manager can
+    also cache per-fold squared Euclidean distances, which any RBF kernel
+    matrix is derived from, whatever gamma a candidate uses.
+    """
+
+    def __init__(self, X, y, n_splits: int = 5, shuffle: bool = False,
+                 random_state: Optional[int] = None, max_kernel_samples: int = 5000):
+        """
+        Args:
+            X (array-like): Feature matrix the folds are computed for.
+            y (array-like): Target used for stratification.
+            n_splits (int): Number of folds.
+            shuffle (bool): Shuffle before splitting. The default matches `cv=5`.
+            random_state (int): Seed used when shuffling.
+            max_kernel_samples (int): Distance matrices are only cached up to this many training rows.
+        """
+        try:
+            self.X = X
+            self.y = y
+            self.n_splits = n_splits
+            self.n_samples = len(y)
+            self.max_kernel_samples = max_kernel_samples
+
+            splitter = StratifiedKFold(
+                n_splits=n_splits,
+                shuffle=shuffle,
+                random_state=random_state if shuffle else None
+            )
+            self.folds: List[Tuple[np.ndarray, np.ndarray]] = [
+                (np.ascontiguousarray(train_idx), np.ascontiguousarray(test_idx))
+                for train_idx, test_idx in splitter.split(np.zeros(self.n_samples), y)
+            ]
+            self._splitter = splitter
+            self._fold_data: Dict[int, Tuple] = {}
+            self._sq_distances: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+
+            logging.info(f"Computed {n_splits} stratified folds for {self.n_samples} samples.")
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def split(self, X=None, y=None, groups=None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Yields the cached (train, test) index arrays.
+
+        Data of a different size (e.g. a subsample drawn by successive
+        halving) is split fresh with the same splitter settings instead.
+        """
+        if X is not None and len(X) != self.n_samples:
+            yield from self._splitter.split(X, y, groups)
+            return
+        yield from self.folds
+
+    def get_n_splits(self, X=None, y=None, groups=None) -> int:
+        return self.n_splits
+
+    def holds(self, X, y) -> bool:
+        """
+        Returns whether X and y are the data the folds were computed for.
+
+        Cached fold arrays and distances may only stand in for the caller's
+        data when this holds; otherwise the caller indexes its own X with
+        `folds`.
+        """
+        if X is self.X and y is self.y:
+            return True
+        if len(y) != self.n_samples or np.shape(X) != np.shape(self.X):
+            return False
+        return bool(np.array_equal(np.asarray(X), np.asarray(self.X))
+                    and np.array_equal(np.asarray(y), np.asarray(self.y)))
+
+    def fold_data(self, fold: int) -> Tuple:
+        """
+        Returns (X_train, X_test, y_train, y_test) for a fold, materialized once.
+        """
+        if fold not in self._fold_data:
+            train_idx, test_idx = self.folds[fold]
+            self._fold_data[fold] = (
+                _safe_indexing(self.X, train_idx),
+                _safe_indexing(self.X, test_idx),
+                _safe_indexing(self.y, train_idx),
+                _safe_indexing(self.y, test_idx)
+            )
+        return self._fold_data[fold]
+
+    def supports_kernel_cache(self) -> bool:
+        return self.n_samples - len(self.folds[0][1]) <= self.max_kernel_samples
+
+    def squared_distances(self, fold: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns squared Euclidean distances (train x train, test x train) for a fold.
+
+        An RBF kernel for any gamma is then just np.exp(-gamma * distances).
+        """
+        if fold not in self._sq_distances:
+            X_train, X_test, _, _ = self.fold_data(fold)
+            X_train = np.asarray(X_train, dtype=np.float64)
+            X_test = np.asarray(X_test, dtype=np.float64)
+            self._sq_distances[fold] = (
+                euclidean_distances(X_train, squared=True),
+                euclidean_distances(X_test, X_train, squared=True)
+            )
+        return self._sq_distances[fold]
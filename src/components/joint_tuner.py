@@ -0,0 +1,142 @@
+import sys
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from sklearn.base import BaseEstimator, TransformerMixin, clone
+from sklearn.pipeline import Pipeline
+
+from src.components.fold_manager import FoldManager
+from src.components.model_tuner import HyperParameterTuner
+from src.components.pca_handler import PCAHandler
+from src.components.search_spaces import get_search_space
+from src.exception import CustomException
+from src.logger import logging
+
+COMPONENTS_PARAM = "components__n_components"
+
+
+class LeadingComponents(BaseEstimator, TransformerMixin):
+    """
+    Keeps the first `n_components` columns of a full PCA projection.
+
+    Stateless, so trying another component count costs a slice instead of a
+    PCA refit.
+    """
+
+    def __init__(self, n_components: Optional[int] = None):
+        self.n_components = n_components
+
+    def fit(self, X, y=None):
+        return self
+
+    def transform(self, X):
+        if self.n_components is None:
+            return X
+        if hasattr(X, "iloc"):
+            return X.iloc[:, :self.n_components]
+        return X[:, :self.n_components]
+
+
+class JointPCATuner:
+    def __init__(self, model, X_scaled, y, pca_handler: Optional[PCAHandler] = None,
+                 n_components: Optional[Sequence[int]] = None, tolerance: float = 0.005,
+                 iter=None, scoring='f1_macro', n_splits: int = 5, search='random'):
+        """
+        Tunes the number of PCA components together with the model's hyperparameters.
+
+        PCA is fitted once with all components. Every candidate is a Pipeline
+        that slices the leading k columns off that projection before the
+        model, so k is one more hyperparameter and no candidate refits PCA.
+        Among the component counts scoring within `tolerance` of the best
+        one, the smallest is kept, since fewer components are cheaper to serve.
+
+        Args:
+            model: Estimator to tune, e.g. the model selected by ModelTrainer.
+            X_scaled (array-like): Scaled features, before PCA.
+            y (array-like): Encoded target.
+            pca_handler (PCAHandler): Handler whose model is fitted and saved.
+            n_components (Sequence[int]): Component counts to try. Defaults to 1..n_features.
+            tolerance (float): Score loss accepted in exchange for fewer components.
+            iter (int): Number of candidates. Defaults to the model's registered budget.
+            scoring (str): Scoring metric.
+            n_splits (int): Number of stratified folds, shared by every candidate.
+            search (str): Search strategy, see HyperParameterTuner.
+        """
+        self.model = model
+        self.X_scaled = X_scaled
+        self.y = y
+        self.pca_handler = pca_handler or PCAHandler()
+        self.n_components = n_components
+        self.tolerance = tolerance
+        self.iter = iter
+        self.scoring = scoring
+        self.n_splits = n_splits
+        self.search = search
+
+    def _select(self, search) -> Tuple[Dict, float]:
+        results = search.cv_results_
+        scores = np.asarray(results["mean_test_score"], dtype=float)
+        eligible = np.isfinite(scores)
+        if "pruned" in results:
+            eligible &= ~np.asarray(results["pruned"])
+        if "iter" in results:
+            # Successive halving: only the last round was scored on all samples.
+            eligible &= np.asarray(results["iter"]) == np.max(results["iter"])
+
+        best_by_k: Dict[int, Tuple[float, Dict]] = {}
+        for i in np.flatnonzero(eligible):
+            params = results["params"][i]
+            k = params[COMPONENTS_PARAM]
+            if k not in best_by_k or scores[i] > best_by_k[k][0]:
+                best_by_k[k] = (scores[i], params)
+
+        best_score = max(score for score, _ in best_by_k.values())
+        k = min(k for k, (score, _) in best_by_k.items() if score >= best_score - self.tolerance)
+        score, params = best_by_k[k]
+        logging.info(f"Best CV {self.scoring} per component count: "
+                     f"{ {k: round(float(s), 4) for k, (s, _) in sorted(best_by_k.items())} }")
+        return params, score
+
+    def tune(self):
+        """
+        Returns:
+            Tuple: (tuned model fitted on the k-component projection, k, CV score).
+            The truncated PCA model is saved to the handler's pca_model_path.
+        """
+        try:
+            logging.info("Starting joint tuning of PCA components and model hyperparameters.")
+            X_full = self.pca_handler.fit_full(self.X_scaled)
+            n_features = X_full.shape[1]
+            k_values = sorted(set(self.n_components or range(1, n_features + 1)))
+
+            pipeline = Pipeline([("components", LeadingComponents()), ("model", clone(self.model))])
+            search_space = get_search_space(pipeline)
+            if search_space is None:
+                raise ValueError(f"No search space registered for {self.model.__class__.__name__}.")
+            param_dist = [{**subspace, COMPONENTS_PARAM: k_values} for subspace in search_space.subspaces]
+
+            # Folds over the full projection, the same splits as the rest of the run
+            folds = FoldManager(X_full, self.y, n_splits=self.n_splits)
+            tuner = HyperParameterTuner(
+                pipeline,
+                X_full, self.y,
+                param_dist=param_dist,
+                iter=self.iter,
+                scoring=self.scoring, cv=folds,
+                search=self.search
+            )
+            tuner.tuner()
+
+            params, score = self._select(tuner.search_)
+            k = params[COMPONENTS_PARAM]
+            tuned = clone(pipeline).set_params(**params).fit(X_full, self.y)
+            self.pca_handler.truncate(k)
+
+            logging.info(f"Joint tuning selected {k} of {n_features} components "
+                         f"with CV {self.scoring} {score:.4f} (best overall {tuner.best_score_:.4f}).")
+
+            return tuned.named_steps["model"], k, score
+
+        except Exception as e:
+            raise CustomException(e, sys)
@@ -1,5 +1,9 @@
 import os
 import sys
+import time
+from typing import Dict, Iterable, List
+
+import numpy as np
 
 from sklearn.metrics import (
     accuracy_score,
@@ -37,4 +41,67 @@ class ModelEvaluator:
                 cm
             )
         except Exception as e:
-            raise CustomException(e, sys)
\ No newline at end of file
+            raise CustomException(e, sys)
+
+    @staticmethod
+    def evaluate_cascade(cascade, X_test, y_test, thresholds: Iterable[float]) -> List[Dict]:
+        """
+        Reports the accuracy / latency trade-off of a fitted CascadeClassifier per threshold.
+
+        Args:
+            cascade (CascadeClassifier): Fitted cascade.
+            X_test (np.ndarray): Held-out features.
+            y_test (array-like): Held-out targets.
+            thresholds (Iterable[float]): First-stage confidence thresholds to evaluate.
+
+        Returns:
+            List[dict]: One row per threshold with the escalated fraction,
+            accuracy, macro F1 and prediction time per 1000 rows. Rows for the
+            first stage alone (threshold 0) and the heavy model alone are
+            included for reference.
+        """
+        try:
+            logging.info("Evaluating cascade thresholds.")
+            X_test = np.asarray(X_test)
+            n_rows = len(X_test)
+
+            def timed(predict):
+                start = time.perf_counter()
+                output = predict()
+                return output, (time.perf_counter() - start) * 1000 / n_rows * 1000
+
+            results = []
+            for label, threshold in [("first stage", 0.0)] + [(f"{t:.2f}", t) for t in thresholds]:
+                (y_pred, escalated), ms = timed(lambda: cascade.predict_with_escalation(X_test, threshold=threshold))
+                results.append({
+                    "threshold": label,
+                    "escalated": float(np.mean(escalated)),
+                    "accuracy": accuracy_score(y_test, y_pred),
+                    "macro_f1": f1_score(y_test, y_pred, average='macro'),
+                    "ms_per_1000_rows": ms
+                })
+
+            y_pred, ms = timed(lambda: cascade.heavy_.predict(X_test))
+            results.append({
+                "threshold": "heavy only",
+                "escalated": 1.0,
+                "accuracy": accuracy_score(y_test, y_pred),
+                "macro_f1": f1_score(y_test, y_pred, average='macro'),
+                "ms_per_1000_rows": ms
+            })
+
+            table = "\n".join(
+                f"{r['threshold']:>12} {r['escalated']:>10.1%} {r['accuracy']:>9.4f} "
+                f"{r['macro_f1']:>9.4f} {r['ms_per_1000_rows']:>14.2f}"
+                for r in results
+            )
+            logging.info(
+                f"Cascade {cascade.first_stage_.__class__.__name__} -> {cascade.heavy_.__class__.__name__} "
+                f"on {n_rows} rows:\n"
+                f"{'threshold':>12} {'escalated':>10} {'accuracy':>9} {'macro F1':>9} {'ms/1000 rows':>14}\n{table}"
+            )
+
+            return results
+
+        except Exception as e:
+            raise CustomException(e, sys)
@@ -1,22 +1,62 @@
 import os
 import sys
+import numpy as np
 import pandas as pd
 import joblib
+from joblib import Parallel, delayed
 
 from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LogisticRegression
 from sklearn.neighbors import KNeighborsClassifier
 from sklearn.svm import SVC
 
+from src.components.kernel_classifier import NystroemClassifier
+from src.components.model_evaluator import ModelEvaluator
 from src.exception import CustomException
 from src.logger import logging
 
+
+def _fit_and_evaluate(trainer, method_name: str, params: dict):
+    """
+    Trains one candidate and scores it on the held-out split, inside a worker.
+    """
+    model = getattr(trainer, method_name)(**params)
+    scores = ModelEvaluator.evaluate_model(model, trainer.X_test, trainer.y_test)
+    return model, scores
+
+
 class ModelTrainer:
-    def __init__(self, X: pd.DataFrame, y: pd.Series, test_size: float = 0.2, random_state: int = 42):
+    def __init__(self, X: pd.DataFrame, y: pd.Series, test_size: float = 0.2, random_state: int = 42,
+                 dtype=None):
+        """
+        Args:
+            X (pd.DataFrame or np.ndarray): Features, usually the PCA projection.
+            y (pd.Series): Encoded target.
+            test_size (float): Fraction of rows held out for evaluation.
+            random_state (int): Seed for the split and the models.
+            dtype: Optional float dtype, e.g. np.float32, to train in. LogisticRegression
+                and KNN keep their weights and training data in it; SVC always
+                works in float64.
+        """
+        if dtype is not None:
+            X = np.asarray(X, dtype=dtype)
         self.X = X
         self.y = y
         self.test_size = test_size
         self.random_state = random_state
+        # Filled by train_models: name -> (accuracy, macro_f1, report, confusion_matrix)
+        self.evaluation_results = {}
+
+    def get_candidates(self):
+        """
+        Returns the candidate models as name -> (training method, keyword arguments).
+        """
+        return {
+            "Logistic Regression": ("train_log_cls", {"max_iter": 1000}),
+            "K-Nearest Neighbors": ("train_knn_cls", {"n_neighbors": 5}),
+            "Support Vector Classifier": ("train_svc_cls", {"kernel": 'rbf', "C": 1.0}),
+            "Nystroem Kernel Classifier": ("train_nystroem_cls", {"n_components": 300, "C": 1.0})
+        }
 
     def split_data(self):
         try:
@@ -83,16 +123,66 @@ class ModelTrainer:
         except Exception as e:
             raise CustomException(e, sys)
         
-    def train_models(self):
+    def train_nystroem_cls(self, n_components: int = 300, C: float = 1.0, gamma="scale"):
+        """
+        Scalable alternative to the RBF SVC, see NystroemClassifier.
+
+        Args:
+            n_components (int): Kernel features approximating the RBF kernel.
+            C (float): Inverse regularization strength.
+            gamma (float or str): RBF kernel coefficient, "scale" as in SVC.
+        """
+        try:
+            logging.info("Training Nystroem Kernel Classifier.")
+            model = NystroemClassifier(
+                gamma=gamma,
+                C=C,
+                n_components=n_components,
+                random_state=self.random_state
+            )
+            model.fit(self.X_train, self.y_train)
+            logging.info("Nystroem Kernel Classifier training completed.")
+
+            return model
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def train_models(self, n_jobs: int = 1, backend: str = 'loky'):
+        """
+        Trains and evaluates every candidate model.
+
+        Args:
+            n_jobs (int): Number of candidates trained concurrently; -1 uses one worker per candidate, up to the CPU count.
+            backend (str): joblib backend, 'loky' (processes) or 'threading'.
+
+        Returns:
+            Tuple[dict, array-like, array-like]: Trained models by name, X_test and y_test.
+            Held-out scores are stored in `evaluation_results`.
+        """
         try:
             logging.info("Starting model training process.")
             self.X_train, self.X_test, self.y_train, self.y_test = self.split_data()
 
-            models = {
-                "Logistic Regression": self.train_log_cls(max_iter=1000),
-                "K-Nearest Neighbors": self.train_knn_cls(n_neighbors=5),
-                "Support Vector Classifier": self.train_svc_cls(kernel='rbf', C=1.0)
-            }
+            candidates = self.get_candidates()
+            n_workers = min(len(candidates), joblib.cpu_count() if n_jobs < 0 else n_jobs)
+
+            if n_workers <= 1:
+                results = [
+                    _fit_and_evaluate(self, method_name, params)
+                    for method_name, params in candidates.values()
+                ]
+            else:
+                logging.info(f"Training {len(candidates)} candidates in parallel with {n_workers} workers.")
+                results = Parallel(n_jobs=n_workers, backend=backend)(
+                    delayed(_fit_and_evaluate)(self, method_name, params)
+                    for method_name, params in candidates.values()
+                )
+
+            models = {}
+            for name, (model, scores) in zip(candidates, results):
+                models[name] = model
+                self.evaluation_results[name] = scores
 
             logging.info("Model training process completed.")
 
@@ -100,4 +190,3 @@ class ModelTrainer:
         
         except Exception as e:
             raise CustomException(e, sys)
-        
\ No newline at end of file
@@ -1,14 +1,43 @@
+import math
 import os
 import sys
+import time
 
-from sklearn.model_selection import RandomizedSearchCV
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import RandomizedSearchCV, HalvingRandomSearchCV, check_cv
 from scipy.stats import loguniform
 
+from src.components.path_search import PathSearchCV
+from src.components.search_spaces import get_search_space, sanitize_param_space
+from src.components.tpe_search import TPESearchCV
 from src.exception import CustomException
 from src.logger import logging
 
+SEARCH_STRATEGIES = ('random', 'halving', 'tpe', 'path')
+
 class HyperParameterTuner:
-    def __init__(self, model, X, y, param_dist, iter=50, scoring='f1_macro', cv=5):
+    def __init__(self, model, X, y, param_dist=None, iter=None, scoring='f1_macro', cv=5, search='random'):
+        """
+        Args:
+            param_dist (dict or list of dicts): Search space. When None, or when none of
+                its parameters apply to `model`, the space registered for the model's
+                class in `search_spaces.SEARCH_SPACES` is used.
+            iter (int): Number of candidates. Defaults to the registered tuning budget.
+            search (str): Search strategy.
+                - 'random': RandomizedSearchCV over `iter` candidates on the full data.
+                - 'halving': successive halving over sample count, starting candidates
+                  on small subsets and keeping the best third each round. As many
+                  candidates start as fit in the model fits of a random search over
+                  `iter` candidates.
+                - 'tpe': adaptive Parzen-estimator sampler that prunes poor
+                  candidates after the first folds.
+                - 'path': for warm-startable linear models such as LogisticRegression,
+                  `iter` candidates as regularization paths over C, each fitted
+                  warm-started from the previous C within a fold.
+        """
+        if search not in SEARCH_STRATEGIES:
+            raise ValueError(f"Unknown search strategy: {search}. Expected one of {SEARCH_STRATEGIES}")
+
         self.model = model
         self.X = X
         self.y = y
@@ -16,14 +45,67 @@ class HyperParameterTuner:
         self.iter = iter
         self.scoring = scoring
         self.cv = cv
+        self.search = search
+        self.param_space, self.n_iter = self._resolve_param_space()
 
-    def tuner(self):
-        try:
-            logging.info("Starting HyperParameter Tuning.")
-            random_search = RandomizedSearchCV(
+    def _resolve_param_space(self):
+        search_space = get_search_space(self.model)
+        is_valid = search_space.is_valid if search_space is not None else None
+        model_name = self.model.__class__.__name__
+
+        param_space = []
+        if self.param_dist is not None:
+            param_space = sanitize_param_space(self.model, self.param_dist, is_valid)
+            if not param_space:
+                logging.info(f"Given param_dist does not apply to {model_name}, using its registered space.")
+
+        if not param_space:
+            if search_space is None:
+                raise ValueError(f"No search space registered for {model_name} and no usable param_dist given.")
+            param_space = sanitize_param_space(self.model, search_space.subspaces, is_valid)
+
+        n_iter = self.iter
+        if n_iter is None:
+            n_iter = search_space.n_iter if search_space is not None else 50
+
+        logging.info(f"Tuning {model_name} over {len(param_space)} subspaces with {n_iter} candidates.")
+
+        return param_space, n_iter
+
+    def _n_splits(self) -> int:
+        return check_cv(self.cv, self.y, classifier=True).get_n_splits(self.X, self.y)
+
+    @staticmethod
+    def _halving_candidates(budget: int, factor: int = 3) -> int:
+        """
+        Returns the most starting candidates whose halving rounds evaluate at most
+        `budget` candidates in total.
+
+        Rounds keep ceil(n / factor) candidates, for as many rounds as the
+        candidates allow (fewer when the data runs out first, which only saves fits).
+        """
+        def evaluated(n_candidates):
+            n_rounds = 1 + int(math.log(n_candidates, factor) + 1e-9)
+            total = 0
+            for _ in range(n_rounds):
+                total += n_candidates
+                n_candidates = math.ceil(n_candidates / factor)
+            return total
+
+        n_candidates = budget
+        while n_candidates > 1 and evaluated(n_candidates) > budget:
+            n_candidates -= 1
+        return n_candidates
+
+    def _build_search(self):
+        if self.search == 'halving':
+            return HalvingRandomSearchCV(
                 estimator=self.model,
-                param_distributions=self.param_dist,
-                n_iter=self.iter,
+                param_distributions=self.param_space,
+                n_candidates=self._halving_candidates(self.n_iter, factor=3),
+                factor=3,
+                resource='n_samples',
+                min_resources='exhaust',
                 scoring=self.scoring,
                 cv=self.cv,
                 random_state=42,
@@ -31,13 +113,72 @@ class HyperParameterTuner:
                 verbose=1
             )
 
-            random_search.fit(self.X, self.y)
+        if self.search == 'path':
+            return PathSearchCV(
+                estimator=self.model,
+                param_distributions=self.param_space,
+                n_iter=self.n_iter,
+                scoring=self.scoring,
+                cv=self.cv,
+                n_jobs=-1,
+                random_state=42
+            )
+
+        if self.search == 'tpe':
+            return TPESearchCV(
+                estimator=self.model,
+                param_distributions=self.param_space,
+                n_iter=self.n_iter,
+                scoring=self.scoring,
+                cv=self.cv,
+                n_jobs=-1,
+                random_state=42
+            )
+
+        return RandomizedSearchCV(
+            estimator=self.model,
+            param_distributions=self.param_space,
+            n_iter=self.n_iter,
+            scoring=self.scoring,
+            cv=self.cv,
+            random_state=42,
+            n_jobs=-1,
+            verbose=1
+        )
+
+    @staticmethod
+    def _count_fits(search) -> int:
+        if hasattr(search, "n_fits_"):
+            return search.n_fits_
+        n_splits = search.n_splits_
+        if hasattr(search, "n_candidates_"):
+            return sum(search.n_candidates_) * n_splits + 1
+        return len(search.cv_results_["params"]) * n_splits + 1
+
+    def tuner(self):
+        try:
+            logging.info(f"Starting HyperParameter Tuning with '{self.search}' search.")
+            search = self._build_search()
+
+            start = time.perf_counter()
+            search.fit(self.X, self.y)
+            elapsed = time.perf_counter() - start
+
+            # The budget every strategy is compared against: a random search over n_iter candidates
+            random_search_fits = self.n_iter * self._n_splits() + 1
 
             logging.info("HyperParameter Tuning Completed.")
-            logging.info(f"Best Parameters: {random_search.best_params_}")
-            logging.info(f"Best CV f1_macro: {random_search.best_score_}")
+            logging.info(f"Best Parameters: {search.best_params_}")
+            logging.info(f"Best CV {self.scoring}: {search.best_score_}")
+            logging.info(
+                f"Model fits used: {self._count_fits(search)} of a random-search budget of "
+                f"{random_search_fits}, in {elapsed:.1f}s."
+            )
+
+            self.best_score_ = search.best_score_
+            self.search_ = search
 
-            return random_search.best_estimator_
+            return search.best_estimator_
 
         except Exception as e:
-            raise CustomException(e, sys)
\ No newline at end of file
+            raise CustomException(e, sys)
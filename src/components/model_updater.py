@@ -0,0 +1,413 @@
+import copy
+import os
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+
+from src.exception import CustomException
+from src.logger import logging
+from src.pipeline.fused_predictor import _extract_scaler
+from src.utils import save_object, load_object
+
+
+@dataclass
+class ModelUpdaterConfig:
+    preprocessor_path: str = os.path.join("artifacts", "preprocessor.pkl")
+    label_encoder_path: str = os.path.join("artifacts", "label_encoder.pkl")
+    pca_model_path: str = os.path.join("artifacts", "pca_model.pkl")
+    model_path: str = os.path.join("artifacts", "tuned_model.pkl")
+    cascade_model_path: str = os.path.join("artifacts", "cascade_model.pkl")
+    update_state_path: str = os.path.join("artifacts", "update_state.pkl")
+
+
+class RunningStatistics:
+    """
+    Mergeable sufficient statistics of the raw training features and labels.
+
+    Holds the row count, feature means, the scatter matrix
+    sum((x - mean)^T (x - mean)) and the count of each encoded class. Merging
+    two sets (Chan et al.'s pairwise update) gives exactly the statistics of
+    the concatenated rows, so the StandardScaler and the PCA covariance of all
+    data seen so far can be recomputed without the data.
+    """
+
+    def __init__(self, feature_names, n_samples: int, mean: np.ndarray, scatter: np.ndarray,
+                 class_counts: np.ndarray):
+        self.feature_names = list(feature_names)
+        self.n_samples = int(n_samples)
+        self.mean = mean
+        self.scatter = scatter
+        self.class_counts = class_counts
+
+    @classmethod
+    def from_data(cls, X: pd.DataFrame, y_encoded, n_classes: Optional[int] = None) -> "RunningStatistics":
+        """
+        Args:
+            X (pd.DataFrame): Raw features.
+            y_encoded (array-like): Labels encoded by the training LabelEncoder.
+            n_classes (int): Number of classes of that encoder; defaults to the largest label + 1.
+        """
+        values = np.asarray(X, dtype=np.float64)
+        mean = values.mean(axis=0)
+        centered = values - mean
+        return cls(
+            feature_names=X.columns,
+            n_samples=len(values),
+            mean=mean,
+            scatter=centered.T @ centered,
+            class_counts=np.bincount(np.asarray(y_encoded), minlength=n_classes or 0)
+        )
+
+    def merge(self, other: "RunningStatistics") -> "RunningStatistics":
+        if other.feature_names != self.feature_names:
+            raise ValueError("Statistics over different features can't be merged.")
+        n_samples = self.n_samples + other.n_samples
+        delta = other.mean - self.mean
+        return RunningStatistics(
+            feature_names=self.feature_names,
+            n_samples=n_samples,
+            mean=self.mean + delta * other.n_samples / n_samples,
+            scatter=self.scatter + other.scatter + np.outer(delta, delta) * self.n_samples * other.n_samples / n_samples,
+            class_counts=self.class_counts + other.class_counts
+        )
+
+    @property
+    def variance(self) -> np.ndarray:
+        # ddof=0, as StandardScaler
+        return np.diag(self.scatter) / self.n_samples
+
+
+class AffineFeatureMap(TransformerMixin, BaseEstimator):
+    """
+    Maps features with X @ matrix + offset.
+
+    Lets a model fitted in a previous PCA basis keep serving after the basis
+    was updated, see `ModelUpdater`.
+    """
+
+    def __init__(self, matrix: np.ndarray, offset: np.ndarray):
+        self.matrix = matrix
+        self.offset = offset
+
+    def fit(self, X, y=None):
+        return self
+
+    def transform(self, X) -> np.ndarray:
+        return np.asarray(X) @ self.matrix + self.offset
+
+
+def _is_multinomial(model) -> bool:
+    # Same condition as the softmax probabilities of FusedLinearPredictor.
+    return (
+        isinstance(model, LogisticRegression)
+        and len(model.classes_) > 2
+        and getattr(model, "multi_class", "auto") != "ovr"
+        and model.solver != "liblinear"
+    )
+
+
+class ModelUpdater:
+    """
+    Folds a batch of newly labelled tracks into the trained artifacts without refitting them.
+
+    - Scaler: the saved RunningStatistics are merged with the batch's, giving
+      the StandardScaler mean and variance of all rows seen so far.
+    - PCA: the scaled covariance follows from the same statistics; its
+      eigendecomposition gives the updated basis with the trained number of
+      components.
+    - Classifier: a multinomial LogisticRegression is first re-expressed in
+      the new basis (its logits are affine in the raw features, so they carry
+      over exactly within the retained subspace), then updated on the batch
+      with a few epochs of minibatch SGD on the softmax loss, starting from
+      those coefficients. Steps are scaled by the batch's share of all rows.
+      The result is still a LogisticRegression, so fused and NumPy serving
+      work unchanged.
+    - Cascade: the first stage is updated like the classifier. The heavy
+      stage isn't refitted; an AffineFeatureMap in front of it maps the new
+      basis back to the one it was fitted in.
+
+    `check_drift` lists the reasons the batch needs a full retrain instead:
+    genres the encoder doesn't know, feature means or genre shares that moved
+    too far, or a basis the previous one no longer spans.
+    """
+
+    def __init__(self, config: Optional[ModelUpdaterConfig] = None, max_mean_shift: float = 0.5,
+                 max_label_shift: float = 0.25, min_variance_retained: float = 0.95,
+                 learning_rate: float = 0.1, n_epochs: int = 5, batch_size: int = 32,
+                 random_state: int = 42):
+        """
+        Args:
+            config (ModelUpdaterConfig): Artifact paths, read and by default overwritten in place.
+            max_mean_shift (float): Largest allowed shift of a batch feature mean,
+                in standard deviations of the rows seen so far.
+            max_label_shift (float): Largest allowed total variation distance
+                between the batch's genre shares and the running ones.
+            min_variance_retained (float): Share of the updated basis' variance
+                the previous basis must still capture.
+            learning_rate (float): SGD step size on the full data objective.
+            n_epochs (int): SGD passes over the batch.
+            batch_size (int): Rows per SGD step.
+            random_state (int): Seed for the SGD row order.
+        """
+        self.config = config or ModelUpdaterConfig()
+        self.max_mean_shift = max_mean_shift
+        self.max_label_shift = max_label_shift
+        self.min_variance_retained = min_variance_retained
+        self.learning_rate = learning_rate
+        self.n_epochs = n_epochs
+        self.batch_size = batch_size
+        self.random_state = random_state
+
+        self.preprocessor = load_object(self.config.preprocessor_path)
+        self.label_encoder = load_object(self.config.label_encoder_path)
+        self.pca_model = load_object(self.config.pca_model_path)
+        self.model = load_object(self.config.model_path)
+        self.feature_names, self.scaler = _extract_scaler(self.preprocessor)
+        self.state = (
+            load_object(self.config.update_state_path)
+            if os.path.exists(self.config.update_state_path) else None
+        )
+
+    def bootstrap_state(self, X: pd.DataFrame, y) -> RunningStatistics:
+        """
+        Computes the running statistics from the training data, for artifacts
+        saved before training wrote them.
+        """
+        try:
+            logging.info(f"No update state at {self.config.update_state_path}, computing it from {len(X)} training rows.")
+            self.state = RunningStatistics.from_data(
+                X[self.feature_names], self.label_encoder.transform(y), len(self.label_encoder.classes_)
+            )
+            return self.state
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def _batch_statistics(self, X: pd.DataFrame, y_encoded: np.ndarray) -> RunningStatistics:
+        return RunningStatistics.from_data(X[self.feature_names], y_encoded, len(self.label_encoder.classes_))
+
+    def _updated_basis(self, state: RunningStatistics) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns the scaler scale, then the eigenvalues (descending) and
+        eigenvectors (as rows) of the scaled covariance.
+        """
+        scale = np.sqrt(state.variance)
+        scale[scale == 0.0] = 1.0
+        # ddof=1 as PCA
+        covariance = state.scatter / (state.n_samples - 1) / np.outer(scale, scale)
+        eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+        order = np.argsort(eigenvalues)[::-1]
+        return scale, np.maximum(eigenvalues[order], 0.0), eigenvectors[:, order].T
+
+    def _basis_map(self, scaler, pca_model) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Affine map from the current PCA space back to the one of (scaler, pca_model):
+        p_previous = p @ matrix + offset.
+
+        Rows are reconstructed from their current components and projected
+        with the previous transforms. What the current basis drops is
+        uncorrelated with what it keeps, so this is the least-squares map
+        under the updated covariance.
+        """
+        n_components = self.pca_model.components_.shape[0]
+        # Affine, so evaluating it on the origin and the unit vectors determines it.
+        points = np.vstack([np.zeros(n_components), np.eye(n_components)])
+        raw = self.pca_model.inverse_transform(points) * self.scaler.scale_ + self.scaler.mean_
+        mapped = pca_model.transform((raw - scaler.mean_) / scaler.scale_)
+        return mapped[1:] - mapped[0], mapped[0]
+
+    def check_drift(self, X: pd.DataFrame, y) -> List[str]:
+        """
+        Args:
+            X (pd.DataFrame): Raw features of the new batch.
+            y (array-like): Genres of the new batch.
+
+        Returns:
+            List[str]: Reasons for a full retrain; empty when an incremental update is enough.
+        """
+        try:
+            if self.state is None:
+                raise ValueError("No running statistics; call bootstrap_state with the training data first.")
+
+            reasons = []
+            if not _is_multinomial(self.model):
+                reasons.append(f"{self.model.__class__.__name__} can't be updated online")
+
+            unknown = sorted(set(np.asarray(y)) - set(self.label_encoder.classes_))
+            if unknown:
+                reasons.append(f"unknown genres {unknown}")
+                return reasons
+
+            batch = self._batch_statistics(X, self.label_encoder.transform(y))
+            mean_shift = np.abs(batch.mean - self.state.mean) / np.sqrt(np.maximum(self.state.variance, 1e-12))
+            if mean_shift.max() > self.max_mean_shift:
+                feature = self.feature_names[int(mean_shift.argmax())]
+                reasons.append(f"mean of {feature} moved {mean_shift.max():.2f} standard deviations")
+
+            label_shift = 0.5 * np.abs(
+                batch.class_counts / batch.n_samples - self.state.class_counts / self.state.n_samples
+            ).sum()
+            if label_shift > self.max_label_shift:
+                reasons.append(f"genre shares moved by {label_shift:.2f} (total variation)")
+
+            # Variance of the merged data inside the previous basis, against the best k-dimensional basis.
+            merged = self.state.merge(batch)
+            scale, eigenvalues, _ = self._updated_basis(merged)
+            previous_axes = self.pca_model.components_.T / self.scaler.scale_[:, None] * scale[:, None]
+            previous_axes, _ = np.linalg.qr(previous_axes)
+            covariance = merged.scatter / (merged.n_samples - 1) / np.outer(scale, scale)
+            retained = np.trace(previous_axes.T @ covariance @ previous_axes) / eigenvalues[:previous_axes.shape[1]].sum()
+            if retained < self.min_variance_retained:
+                reasons.append(f"previous PCA basis retains only {retained:.1%} of the updated basis' variance")
+
+            logging.info(
+                f"Drift check on {batch.n_samples} rows: max mean shift {mean_shift.max():.2f}, "
+                f"label shift {label_shift:.2f}, basis variance retained {retained:.1%}."
+            )
+            return reasons
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def _sgd_update(self, model: LogisticRegression, X: np.ndarray, y_encoded: np.ndarray, n_total: int):
+        """
+        Minibatch SGD on the softmax loss from the model's current coefficients, in place.
+        """
+        coef = model.coef_.T.astype(np.float64)
+        intercept = np.asarray(model.intercept_, dtype=np.float64).copy()
+        columns = np.searchsorted(model.classes_, y_encoded)
+        # L2 penalty of the per-row LogisticRegression objective over all rows
+        penalty = 1.0 / (model.C * n_total)
+        step = self.learning_rate * len(X) / n_total
+
+        rng = np.random.RandomState(self.random_state)
+        n_batches = max(1, len(X) // self.batch_size)
+        for _ in range(self.n_epochs):
+            for rows in np.array_split(rng.permutation(len(X)), n_batches):
+                logits = X[rows] @ coef + intercept
+                logits -= logits.max(axis=1, keepdims=True)
+                proba = np.exp(logits)
+                proba /= proba.sum(axis=1, keepdims=True)
+                # Gradient of the cross-entropy w.r.t. the logits
+                proba[np.arange(len(rows)), columns[rows]] -= 1.0
+                coef -= step * (X[rows].T @ proba / len(rows) + penalty * coef)
+                intercept -= step * proba.mean(axis=0)
+
+        model.coef_ = coef.T.astype(model.coef_.dtype)
+        model.intercept_ = intercept.astype(np.asarray(model.intercept_).dtype)
+        return model
+
+    @staticmethod
+    def _remap_linear(model: LogisticRegression, matrix: np.ndarray, offset: np.ndarray) -> LogisticRegression:
+        # logits = p_previous @ W.T + b = p @ (matrix @ W.T) + (offset @ W.T + b)
+        model = copy.deepcopy(model)
+        coef = model.coef_.T.astype(np.float64)
+        model.intercept_ = (offset @ coef + model.intercept_).astype(np.asarray(model.intercept_).dtype)
+        model.coef_ = (matrix @ coef).T.astype(model.coef_.dtype)
+        return model
+
+    @staticmethod
+    def _map_heavy(heavy, matrix: np.ndarray, offset: np.ndarray) -> Pipeline:
+        if isinstance(heavy, Pipeline) and isinstance(heavy.steps[0][1], AffineFeatureMap):
+            # Compose with the map of an earlier update instead of stacking maps.
+            previous = heavy.steps[0][1]
+            matrix, offset = matrix @ previous.matrix, offset @ previous.matrix + previous.offset
+            heavy = heavy.steps[-1][1]
+        return Pipeline([("previous_basis", AffineFeatureMap(matrix, offset)), ("model", heavy)])
+
+    def update(self, X: pd.DataFrame, y, output_dir: Optional[str] = None) -> Dict[str, str]:
+        """
+        Updates and saves the artifacts with the new batch, see the class docstring.
+
+        Args:
+            X (pd.DataFrame): Raw features of the new batch.
+            y (array-like): Genres of the new batch.
+            output_dir (str): Directory the updated artifacts are saved in, under
+                their usual file names. Defaults to overwriting the ones in `config`.
+
+        Returns:
+            Dict[str, str]: Paths of the saved artifacts, keyed like the ArtifactStore manifest.
+            The label encoder isn't changed and keeps its `config` path.
+        """
+        def output_path(path: str) -> str:
+            return path if output_dir is None else os.path.join(output_dir, os.path.basename(path))
+
+        try:
+            y_encoded = self.label_encoder.transform(y)
+            merged = self.state.merge(self._batch_statistics(X, y_encoded))
+            scale, eigenvalues, eigenvectors = self._updated_basis(merged)
+
+            previous_scaler = copy.deepcopy(self.scaler)
+            previous_pca = self.pca_model
+
+            # StandardScaler of all rows seen so far
+            self.preprocessor = copy.deepcopy(self.preprocessor)
+            _, self.scaler = _extract_scaler(self.preprocessor)
+            self.scaler.mean_ = merged.mean.astype(self.scaler.mean_.dtype)
+            self.scaler.var_ = merged.variance.astype(self.scaler.var_.dtype)
+            self.scaler.scale_ = scale.astype(self.scaler.scale_.dtype)
+            self.scaler.n_samples_seen_ = merged.n_samples
+
+            # PCA of the rescaled data, keeping the trained number of components
+            k = previous_pca.components_.shape[0]
+            components = eigenvectors[:k]
+            # Keep each axis pointing the way it did, so the basis map stays near the identity.
+            previous_axes = previous_pca.components_ / previous_scaler.scale_ * scale
+            components *= np.where(np.sum(components * previous_axes, axis=1) < 0, -1.0, 1.0)[:, None]
+
+            dtype = previous_pca.components_.dtype
+            self.pca_model = copy.deepcopy(previous_pca)
+            self.pca_model.mean_ = np.zeros(len(scale), dtype=dtype)
+            self.pca_model.components_ = components.astype(dtype)
+            self.pca_model.explained_variance_ = eigenvalues[:k].astype(dtype)
+            self.pca_model.explained_variance_ratio_ = (eigenvalues[:k] / eigenvalues.sum()).astype(dtype)
+            self.pca_model.singular_values_ = np.sqrt(eigenvalues[:k] * (merged.n_samples - 1)).astype(dtype)
+            self.pca_model.noise_variance_ = float(eigenvalues[k:].mean()) if k < len(eigenvalues) else 0.0
+            self.pca_model.n_samples_ = merged.n_samples
+
+            matrix, offset = self._basis_map(previous_scaler, previous_pca)
+            X_pca = self.pca_model.transform((X[self.feature_names].to_numpy(dtype=np.float64) - self.scaler.mean_) / self.scaler.scale_)
+
+            before = float(np.mean(self.model.predict(
+                previous_pca.transform((X[self.feature_names].to_numpy(dtype=np.float64) - previous_scaler.mean_) / previous_scaler.scale_)
+            ) == y_encoded))
+            self.model = self._sgd_update(self._remap_linear(self.model, matrix, offset), X_pca, y_encoded, merged.n_samples)
+            after = float(np.mean(self.model.predict(X_pca) == y_encoded))
+            logging.info(
+                f"Model updated on {len(X)} rows ({merged.n_samples} seen). "
+                f"Batch accuracy {before:.4f} -> {after:.4f}; explained variance ratio {sum(self.pca_model.explained_variance_ratio_):.2f}."
+            )
+
+            self.state = merged
+            artifact_paths = {
+                "preprocessor": output_path(self.config.preprocessor_path),
+                "target_label_encoder": self.config.label_encoder_path,
+                "pca_model": output_path(self.config.pca_model_path),
+                "model": output_path(self.config.model_path),
+                "update_state": output_path(self.config.update_state_path)
+            }
+            save_object(file_path=artifact_paths["preprocessor"], obj=self.preprocessor)
+            save_object(file_path=artifact_paths["pca_model"], obj=self.pca_model)
+            save_object(file_path=artifact_paths["model"], obj=self.model)
+            save_object(file_path=artifact_paths["update_state"], obj=self.state)
+
+            if os.path.exists(self.config.cascade_model_path):
+                cascade = copy.deepcopy(load_object(self.config.cascade_model_path))
+                first_stage = self._remap_linear(cascade.first_stage_, matrix, offset)
+                cascade.first_stage_ = self._sgd_update(first_stage, X_pca, y_encoded, merged.n_samples)
+                cascade.heavy_ = self._map_heavy(cascade.heavy_, matrix, offset)
+                artifact_paths["cascade_model"] = output_path(self.config.cascade_model_path)
+                save_object(file_path=artifact_paths["cascade_model"], obj=cascade)
+                logging.info(f"Cascade first stage updated; {cascade.heavy_.__class__.__name__} heavy stage kept in its training basis.")
+
+            return artifact_paths
+
+        except Exception as e:
+            raise CustomException(e, sys)
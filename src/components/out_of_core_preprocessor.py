@@ -0,0 +1,89 @@
+import sys
+from typing import Iterator, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.components.data_cleaner import DataCleaner, StreamingDataCleaner
+from src.components.data_ingestion import DataIngestion
+from src.components.data_transformation import DataTransformation
+from src.components.pca_handler import PCAHandler
+from src.exception import CustomException
+from src.logger import logging
+
+
+class OutOfCorePreprocessor:
+    """
+    Cleans the raw CSV, fits the scaler and fits PCA chunk by chunk.
+
+    Each pass re-reads the file with DataIngestion.iter_chunks, so it holds
+    one chunk of raw rows at a time, plus the row hashes StreamingDataCleaner
+    deduplicates with:
+
+    1. StreamingDataCleaner computes its imputation statistics.
+    2. DataTransformation.fit_chunks fits the scaler on the cleaned chunks.
+    3. PCAHandler.fit_incremental fits PCA on the scaled chunks.
+    4. The cleaned rows are collected with their scaled features and PCA
+       projection, which the stages after PCA train on.
+
+    The saved preprocessor and PCA model are used exactly like the ones of
+    the in-memory stages.
+    """
+
+    def __init__(self, ingestion: DataIngestion, expected_columns: List[str], chunk_size: int = 100_000,
+                 strategy: str = 'drop', target_column: str = 'genre'):
+        """
+        Args:
+            ingestion (DataIngestion): Reads the raw CSV.
+            expected_columns (List[str]): Raw schema column names.
+            chunk_size (int): Rows per chunk.
+            strategy (str): Missing value strategy of StreamingDataCleaner.
+            target_column (str): Standardized name of the label column.
+        """
+        self.ingestion = ingestion
+        self.expected_columns = expected_columns
+        self.chunk_size = chunk_size
+        self.target_column = target_column
+        self.cleaner = StreamingDataCleaner(strategy=strategy)
+
+    def _raw_chunks(self) -> Iterator[pd.DataFrame]:
+        cleaner = DataCleaner()
+        for chunk in self.ingestion.iter_chunks(self.expected_columns, chunk_size=self.chunk_size):
+            yield cleaner.standardize_column_names(chunk)
+
+    def _clean_chunks(self) -> Iterator[pd.DataFrame]:
+        return self.cleaner.transform(self._raw_chunks())
+
+    def _feature_chunks(self, dtype=None) -> Iterator[pd.DataFrame]:
+        for chunk in self._clean_chunks():
+            X = chunk.drop(columns=[self.target_column])
+            yield X if dtype is None else X.astype(dtype)
+
+    def run(self, transformer: DataTransformation, pca_handler: PCAHandler,
+            dtype=None) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+        """
+        Args:
+            transformer (DataTransformation): Fits and saves the preprocessor.
+            pca_handler (PCAHandler): Fits and saves the PCA model.
+            dtype: Optional float dtype to scale and project in, as in the in-memory stages.
+
+        Returns:
+            Tuple: Cleaned DataFrame, scaled features and PCA projection.
+        """
+        try:
+            logging.info(f"Out-of-core preprocessing of {self.ingestion.raw_data_path} in chunks of {self.chunk_size} rows.")
+            self.cleaner.fit(self._raw_chunks())
+            transformer.fit_chunks(self._feature_chunks(dtype))
+            pca_model = pca_handler.fit_incremental(transformer.transform_chunks(self._feature_chunks(dtype)))
+
+            df = pd.concat(list(self._clean_chunks()), ignore_index=True)
+            X_scaled = transformer.transform(df.drop(columns=[self.target_column]), as_frame=False, dtype=dtype)
+            X_pca = pca_model.transform(X_scaled)
+            if dtype is not None:
+                X_pca = X_pca.astype(dtype, copy=False)
+            logging.info(f"Out-of-core preprocessing completed. Shape: {df.shape}, PCA components: {X_pca.shape[1]}")
+
+            return df, X_scaled, X_pca
+
+        except Exception as e:
+            raise CustomException(e, sys)
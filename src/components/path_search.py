@@ -0,0 +1,179 @@
+import sys
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+from joblib import Parallel, delayed
+
+from sklearn.base import clone
+from sklearn.metrics import check_scoring
+from sklearn.model_selection import check_cv
+from sklearn.utils import _safe_indexing
+
+from src.components.fold_manager import FoldManager
+from src.components.tpe_search import _is_distribution
+from src.exception import CustomException
+from src.logger import logging
+
+
+def _fit_path(estimator, params: Dict, path_param: str, warm_start_param: str, path_values: List,
+              X_train, X_test, y_train, y_test, scorer) -> List[float]:
+    """
+    Fits one regularization path on one fold, each fit starting from the previous solution.
+    """
+    model = clone(estimator).set_params(**params, **{warm_start_param: True})
+    scores = []
+    for value in path_values:
+        model.set_params(**{path_param: value})
+        try:
+            model.fit(X_train, y_train)
+        except ValueError as e:
+            # Invalid parameter combinations fail the candidate, the path restarts cold.
+            logging.info(f"Fit with {params} and {path_param}={value} failed: {e}")
+            model = clone(estimator).set_params(**params, **{warm_start_param: True})
+            scores.append(np.nan)
+            continue
+        scores.append(scorer(model, X_test, y_test))
+    return scores
+
+
+class PathSearchCV:
+    """
+    Regularization-path search for warm-startable estimators such as LogisticRegression.
+
+    Candidates come in paths. Each path draws the other parameters once, as
+    random search would, and takes `path_length` values of the path parameter
+    (C by default) spread over the quantiles of its distribution, shifted by a
+    random offset per path. Within each fold a path is fitted from the
+    strongest to the weakest regularization with warm_start=True, so every
+    fit starts from the previous, nearby solution instead of from zero and
+    needs a fraction of the solver iterations. The problem is convex, so the
+    warm-started solutions match cold fits up to the solver tolerance.
+
+    Paths x folds run in parallel with `n_jobs`; with a FoldManager as `cv`,
+    its cached fold arrays are reused. The best candidate is refitted cold on
+    all data.
+
+    Exposes `best_estimator_`, `best_params_`, `best_score_` and
+    `cv_results_` like the sklearn search classes.
+    """
+
+    def __init__(self, estimator, param_distributions: Union[Dict, List[Dict]], n_iter: int = 50,
+                 path_length: int = 10, path_param: Optional[str] = None, scoring='f1_macro', cv=5,
+                 n_jobs=None, random_state: int = 42):
+        """
+        Args:
+            n_iter (int): Candidate budget; split into n_iter // path_length paths.
+            path_length (int): Path parameter values per path. List-valued path
+                parameters use all their values instead.
+            path_param (str): Parameter the paths run along. Defaults to `C`, or
+                `<step>__C` for a Pipeline.
+        """
+        self.estimator = estimator
+        self.param_distributions = param_distributions
+        self.n_iter = n_iter
+        self.path_length = path_length
+        self.path_param = path_param
+        self.scoring = scoring
+        self.cv = cv
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+
+    def _subspaces(self) -> List[Dict]:
+        if isinstance(self.param_distributions, list):
+            return self.param_distributions
+        return [self.param_distributions]
+
+    def _resolve_path_param(self) -> str:
+        if self.path_param is not None:
+            return self.path_param
+        for name in self._subspaces()[0]:
+            if name == "C" or name.endswith("__C"):
+                return name
+        raise ValueError("No C parameter in the search space to run paths along; pass path_param.")
+
+    def _sample_paths(self, rng: np.random.RandomState, path_param: str) -> List[Dict]:
+        n_paths = max(1, self.n_iter // self.path_length)
+        paths = []
+        for _ in range(n_paths):
+            subspace = self._subspaces()[rng.choice(len(self._subspaces()))]
+            params = {}
+            for name, values in subspace.items():
+                if name == path_param:
+                    continue
+                if _is_distribution(values):
+                    params[name] = values.rvs(random_state=rng)
+                else:
+                    params[name] = values[rng.choice(len(values))]
+
+            values = subspace[path_param]
+            if _is_distribution(values):
+                quantiles = (np.arange(self.path_length) + rng.uniform()) / self.path_length
+                path_values = sorted(float(value) for value in values.ppf(quantiles))
+            else:
+                path_values = sorted(values)
+            paths.append({"params": params, "path_values": path_values})
+        return paths
+
+    def fit(self, X, y):
+        try:
+            rng = np.random.RandomState(self.random_state)
+            path_param = self._resolve_path_param()
+            warm_start_param = path_param[:-len("C")] + "warm_start" if path_param.endswith("C") else "warm_start"
+            if warm_start_param not in self.estimator.get_params():
+                raise ValueError(f"{self.estimator.__class__.__name__} has no {warm_start_param} parameter to warm-start paths with.")
+
+            if isinstance(self.cv, FoldManager) and self.cv.holds(X, y):
+                fold_data = [self.cv.fold_data(fold) for fold in range(len(self.cv.folds))]
+            else:
+                # A FoldManager built for other data of the same size still provides the splits.
+                splits = self.cv.folds if isinstance(self.cv, FoldManager) and self.cv.n_samples == len(y) \
+                    else check_cv(self.cv, y, classifier=True).split(X, y)
+                fold_data = [
+                    (_safe_indexing(X, train_idx), _safe_indexing(X, test_idx),
+                     _safe_indexing(y, train_idx), _safe_indexing(y, test_idx))
+                    for train_idx, test_idx in splits
+                ]
+            scorer = check_scoring(self.estimator, scoring=self.scoring)
+
+            paths = self._sample_paths(rng, path_param)
+            logging.info(f"Path search over {len(paths)} paths of {path_param} x {len(fold_data)} folds.")
+
+            path_scores = Parallel(n_jobs=self.n_jobs)(
+                delayed(_fit_path)(self.estimator, path["params"], path_param, warm_start_param,
+                                   path["path_values"], *data, scorer)
+                for path in paths
+                for data in fold_data
+            )
+
+            candidates, fold_scores = [], []
+            for i, path in enumerate(paths):
+                # (n_folds, path_length) -> one row per candidate
+                scores = np.array(path_scores[i * len(fold_data):(i + 1) * len(fold_data)], dtype=float).T
+                for value, candidate_scores in zip(path["path_values"], scores):
+                    candidates.append({**path["params"], path_param: value})
+                    fold_scores.append(candidate_scores)
+
+            fold_scores = np.array(fold_scores)
+            failed = np.isnan(fold_scores).any(axis=1)
+            mean_scores = np.full(len(candidates), -np.inf)
+            mean_scores[~failed] = fold_scores[~failed].mean(axis=1)
+            if failed.all():
+                raise ValueError("Every path search candidate failed.")
+            best = int(np.argmax(mean_scores))
+
+            self.best_params_ = candidates[best]
+            self.best_score_ = float(mean_scores[best])
+            self.best_estimator_ = clone(self.estimator).set_params(**self.best_params_).fit(X, y)
+            self.n_splits_ = len(fold_data)
+            self.n_fits_ = len(candidates) * len(fold_data) + 1
+            self.cv_results_ = {
+                "params": candidates,
+                "mean_test_score": mean_scores,
+                "std_test_score": np.where(failed, np.nan, fold_scores.std(axis=1)),
+                "path": np.repeat(np.arange(len(paths)), [len(path["path_values"]) for path in paths])
+            }
+
+            return self
+
+        except Exception as e:
+            raise CustomException(e, sys)
@@ -1,11 +1,15 @@
 import os
 import sys
+from typing import Iterable, Optional
 
 import pandas as pd
 import numpy as np
 import joblib
 
-from sklearn.decomposition import PCA
+import sklearn
+from sklearn.decomposition import PCA, IncrementalPCA
+from sklearn.utils import gen_batches
+from sklearn.utils.fixes import parse_version
 from src.exception import CustomException
 from src.logger import logging
 from src.utils import save_object, load_object
@@ -15,22 +19,81 @@ from dataclasses import dataclass
 class PCAHandlerConfig:
     pca_model_path: str = os.path.join("artifacts", "pca_model.pkl")
 
+
+SVD_SOLVERS = ("auto", "full", "randomized", "covariance_eigh")
+
+# PCA(svd_solver="covariance_eigh") exists from scikit-learn 1.5 on.
+_HAS_COVARIANCE_EIGH = parse_version(sklearn.__version__) >= parse_version("1.5")
+
+
+def select_svd_solver(n_samples: int, n_features: int, n_components) -> str:
+    """
+    Picks the cheapest exact-enough PCA solver for a data shape.
+
+    - covariance_eigh: tall-and-narrow data. Forms the d x d covariance in one
+      pass (O(n*d^2)) and eigendecomposes it (O(d^3)), never holding more
+      than the data plus a d x d matrix.
+    - randomized: a fixed, small number of components out of many features.
+      It can't honour a variance target, which needs the full spectrum.
+    - full: LAPACK SVD of the centered data matrix, for everything else.
+
+    Args:
+        n_samples (int): Rows of the data.
+        n_features (int): Columns of the data.
+        n_components (float or int): Requested components or variance target.
+
+    Returns:
+        str: Value for PCA(svd_solver=...).
+    """
+    if _HAS_COVARIANCE_EIGH and n_features <= 1000 and n_samples >= 10 * n_features:
+        return "covariance_eigh"
+    is_count = isinstance(n_components, (int, np.integer)) and not isinstance(n_components, bool)
+    if is_count and max(n_samples, n_features) > 500 and n_components < 0.8 * min(n_samples, n_features):
+        return "randomized"
+    return "full"
+
 class PCAHandler:
-    def __init__(self, n_components: float = 0.85):
+    def __init__(self, n_components: float = 0.85, batch_size: Optional[int] = None,
+                 svd_solver: str = "auto", random_state: Optional[int] = 42):
         """
         Args:
             n_components (float or int):
                 - float (0-1): explained variance ratio to retain
                 - int: number of components
+            batch_size (int): Rows per IncrementalPCA update in `fit_incremental`;
+                defaults to the size of each incoming chunk.
+            svd_solver (str): One of SVD_SOLVERS. "auto" picks a solver from the
+                data shape in `fit_transform` (see `select_svd_solver`).
+            random_state (int): Seed for the randomized solver.
         """
+        if svd_solver not in SVD_SOLVERS:
+            raise ValueError(f"svd_solver must be one of {SVD_SOLVERS}, got {svd_solver!r}")
 
         self.pca_handler_config = PCAHandlerConfig()
         self.n_components = n_components
-        self.pca = PCA(n_components=self.n_components)
+        self.batch_size = batch_size
+        self.svd_solver = svd_solver
+        self.pca = PCA(n_components=self.n_components, random_state=random_state)
 
-    def fit_transform(self, X: pd.DataFrame):
+    def fit_transform(self, X: pd.DataFrame, as_frame: bool = True, dtype=None):
+        """
+        Args:
+            X (pd.DataFrame or np.ndarray): Scaled features.
+            as_frame (bool): Wrap the projection in a DataFrame with PC1..PCk columns.
+                With False the ndarray from PCA is returned as is.
+            dtype: Optional float dtype, e.g. np.float32, to fit in. PCA keeps its
+                components in the dtype it was fitted on.
+        """
         try:
-            logging.info("Fitting and transforming data using PCA.")
+            if dtype is not None:
+                X = np.asarray(X, dtype=dtype)
+
+            svd_solver = self.svd_solver
+            if svd_solver == "auto":
+                svd_solver = select_svd_solver(X.shape[0], X.shape[1], self.n_components)
+            self.pca.set_params(svd_solver=svd_solver)
+
+            logging.info(f"Fitting and transforming data using PCA (svd_solver={svd_solver}).")
             X_pca = self.pca.fit_transform(X)
             logging.info(f"PCA fitting and transformation completed. Explained variance ratio: {sum(self.pca.explained_variance_ratio_):.2f}")
 
@@ -41,6 +104,8 @@ class PCAHandler:
             )
             logging.info(f"PCA model saved at {self.pca_handler_config.pca_model_path}")
 
+            if not as_frame:
+                return X_pca
             return pd.DataFrame(
                 X_pca,
                 columns=[f"PC{i+1}" for i in range(X_pca.shape[1])]
@@ -50,13 +115,176 @@ class PCAHandler:
             raise CustomException(e, sys)
         
 
-    def transform(self, X: pd.DataFrame):
+    def _n_components_for(self, explained_variance_ratio: np.ndarray) -> int:
+        if isinstance(self.n_components, float) and 0 < self.n_components < 1:
+            # Same rule PCA uses for a variance target.
+            ratio_cumsum = np.cumsum(explained_variance_ratio)
+            return int(np.searchsorted(ratio_cumsum, self.n_components, side="right") + 1)
+        if self.n_components is None:
+            return len(explained_variance_ratio)
+        return int(self.n_components)
+
+    def _partial_fit(self, ipca: IncrementalPCA, rows) -> None:
+        # partial_fit takes its input as a single batch, so chunks are split into
+        # batch_size rows here; a short tail is merged into the batch before it.
+        batch_size = self.batch_size or rows.shape[0]
+        for batch in gen_batches(rows.shape[0], batch_size, min_batch_size=ipca.n_components):
+            ipca.partial_fit(rows.iloc[batch] if isinstance(rows, pd.DataFrame) else rows[batch])
+
+    def fit_incremental(self, chunks: Iterable):
+        """
+        Fits PCA out-of-core from an iterable of scaled feature chunks.
+
+        All components are tracked with IncrementalPCA while streaming, then
+        the model is truncated to the requested variance target or component
+        count. The saved pca_model.pkl exposes the same attributes and
+        `transform` as a fitted PCA, so `transform` and PredictPipeline use it
+        unchanged.
+
+        Args:
+            chunks (Iterable): DataFrames or arrays of scaled features, e.g.
+                DataTransformation.transform applied to a chunked CSV reader.
+
+        Returns:
+            IncrementalPCA: The fitted, truncated model.
+        """
+        try:
+            logging.info("Fitting PCA incrementally from chunks.")
+            ipca = None
+            buffered = None
+            n_rows = 0
+
+            for chunk in chunks:
+                if ipca is None:
+                    ipca = IncrementalPCA(n_components=chunk.shape[1], batch_size=self.batch_size)
+                if buffered is None:
+                    buffered = chunk
+                    continue
+
+                # Each update needs at least n_components rows, so one chunk is held
+                # back and small chunks are merged into it.
+                if chunk.shape[0] < ipca.n_components or buffered.shape[0] < ipca.n_components:
+                    if isinstance(buffered, pd.DataFrame):
+                        buffered = pd.concat([buffered, chunk], ignore_index=True)
+                    else:
+                        buffered = np.vstack([buffered, chunk])
+                    continue
+
+                self._partial_fit(ipca, buffered)
+                n_rows += buffered.shape[0]
+                buffered = chunk
+
+            if buffered is None:
+                raise ValueError("No chunks to fit PCA on.")
+            if buffered.shape[0] < ipca.n_components:
+                raise ValueError(f"PCA needs at least {ipca.n_components} rows, got {buffered.shape[0]}.")
+            self._partial_fit(ipca, buffered)
+            n_rows += buffered.shape[0]
+
+            k = self._n_components_for(ipca.explained_variance_ratio_)
+            self.pca = self._truncate(ipca, k)
+
+            logging.info(
+                f"Incremental PCA fitted on {n_rows} rows. Components: {k}, "
+                f"explained variance ratio: {sum(ipca.explained_variance_ratio_):.2f}"
+            )
+
+            save_object(
+                file_path=self.pca_handler_config.pca_model_path,
+                obj=self.pca
+            )
+            logging.info(f"PCA model saved at {self.pca_handler_config.pca_model_path}")
+
+            return self.pca
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    @staticmethod
+    def _truncate(pca_model, k: int):
+        # Keeping the leading k components of a fitted model gives exactly the
+        # model a k-component fit would have produced.
+        n_total = len(pca_model.explained_variance_)
+        pca_model.noise_variance_ = float(pca_model.explained_variance_[k:].mean()) if k < n_total else 0.0
+        pca_model.components_ = pca_model.components_[:k]
+        pca_model.explained_variance_ = pca_model.explained_variance_[:k]
+        pca_model.explained_variance_ratio_ = pca_model.explained_variance_ratio_[:k]
+        pca_model.singular_values_ = pca_model.singular_values_[:k]
+        pca_model.n_components_ = k
+        pca_model.n_components = k
+        return pca_model
+
+    def fit_full(self, X) -> np.ndarray:
+        """
+        Fits PCA with every component kept, without saving it.
+
+        Column j of the returned projection is the j-th principal component,
+        so X_full[:, :k] is the k-component projection for any k. Used for
+        tuning the component count without refitting; call `truncate` with
+        the chosen k afterwards.
+
+        Returns:
+            np.ndarray: Projection onto all components.
+        """
+        try:
+            svd_solver = self.svd_solver
+            if svd_solver == "auto":
+                svd_solver = select_svd_solver(X.shape[0], X.shape[1], None)
+            self.pca.set_params(n_components=None, svd_solver=svd_solver)
+
+            logging.info(f"Fitting PCA with all components (svd_solver={svd_solver}).")
+            X_full = self.pca.fit_transform(X)
+            logging.info(f"Full PCA fitted with {self.pca.n_components_} components.")
+
+            return X_full
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def truncate(self, n_components: int):
+        """
+        Keeps the leading `n_components` of the model fitted by `fit_full` and saves it.
+
+        Returns:
+            PCA: The truncated model.
+        """
+        try:
+            self.n_components = int(n_components)
+            self.pca = self._truncate(self.pca, self.n_components)
+            logging.info(
+                f"PCA truncated to {self.n_components} components. "
+                f"Explained variance ratio: {sum(self.pca.explained_variance_ratio_):.2f}"
+            )
+
+            save_object(
+                file_path=self.pca_handler_config.pca_model_path,
+                obj=self.pca
+            )
+            logging.info(f"PCA model saved at {self.pca_handler_config.pca_model_path}")
+
+            return self.pca
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def transform(self, X: pd.DataFrame, as_frame: bool = True, dtype=None):
+        """
+        Args:
+            X (pd.DataFrame or np.ndarray): Scaled features.
+            as_frame (bool): Wrap the projection in a DataFrame, see `fit_transform`.
+            dtype: Optional float dtype to project in.
+        """
         try:
             logging.info("Transforming data using existing PCA model.")
+            if dtype is not None:
+                X = np.asarray(X, dtype=dtype)
             pca_model = load_object(self.pca_handler_config.pca_model_path)
             X_pca = pca_model.transform(X)
             logging.info("Data transformation using PCA completed.")
 
+            if not as_frame:
+                return X_pca
+
             return pd.DataFrame(
                 X_pca,
                 columns=[f"PC{i+1}"for i in range(pca_model.n_components_)]
@@ -0,0 +1,180 @@
+import functools
+import itertools
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Union
+
+from scipy.stats import loguniform, randint, uniform
+from sklearn.linear_model import LogisticRegression
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.svm import SVC
+
+from src.components.kernel_classifier import NystroemClassifier
+from src.logger import logging
+
+ParamSpace = Union[Dict, List[Dict]]
+
+# Splitting a space on its list-valued parameters stops here, beyond that it is left as is.
+MAX_SUBSPACES = 256
+
+
+@dataclass
+class SearchSpace:
+    """
+    Hyperparameter space and tuning budget for one estimator class.
+
+    `subspaces` are parameter dicts that are valid on their own, in the list
+    form accepted by RandomizedSearchCV. `is_valid` rejects parameter
+    combinations the estimator would refuse to fit; parameters that are still
+    distributions are passed to it as the distribution object.
+    """
+    subspaces: List[Dict]
+    n_iter: int
+    is_valid: Optional[Callable[[Dict], bool]] = None
+
+
+def _logistic_regression_is_valid(params: Dict) -> bool:
+    # Only saga supports L1 / elastic-net; the other solvers need l1_ratio == 0.
+    # A distribution (rather than a fixed value) for l1_ratio counts as non-zero.
+    l1_ratio = params.get("l1_ratio", 0.0)
+    if isinstance(l1_ratio, (int, float)) and l1_ratio == 0.0:
+        return True
+    return params.get("solver", "lbfgs") == "saga"
+
+
+SEARCH_SPACES: Dict[type, SearchSpace] = {
+    LogisticRegression: SearchSpace(
+        subspaces=[
+            {
+                'C': loguniform(1e-4, 1e4),
+                'solver': ['lbfgs'],
+                'class_weight': [None, 'balanced']
+            },
+            {
+                'C': loguniform(1e-4, 1e4),
+                'solver': ['saga'],
+                'l1_ratio': uniform(0.0, 1.0),
+                'class_weight': [None, 'balanced']
+            }
+        ],
+        n_iter=50,
+        is_valid=_logistic_regression_is_valid
+    ),
+    KNeighborsClassifier: SearchSpace(
+        subspaces=[
+            {
+                'n_neighbors': randint(1, 51),
+                'weights': ['uniform', 'distance'],
+                'p': [1, 2]
+            }
+        ],
+        n_iter=30
+    ),
+    NystroemClassifier: SearchSpace(
+        subspaces=[
+            {
+                'C': loguniform(1e-2, 1e3),
+                'gamma': loguniform(1e-4, 1e1),
+                'n_components': [100, 300, 1000],
+                'class_weight': [None, 'balanced']
+            }
+        ],
+        n_iter=30
+    ),
+    SVC: SearchSpace(
+        subspaces=[
+            {
+                'C': loguniform(1e-2, 1e3),
+                'gamma': loguniform(1e-4, 1e1),
+                'class_weight': [None, 'balanced']
+            }
+        ],
+        n_iter=30
+    )
+}
+
+
+def _unprefixed_is_valid(is_valid: Callable[[Dict], bool], prefix: str, params: Dict) -> bool:
+    return is_valid({name[len(prefix):]: value for name, value in params.items() if name.startswith(prefix)})
+
+
+def prefix_search_space(search_space: SearchSpace, step_name: str) -> SearchSpace:
+    """
+    Returns the search space with its parameters addressed to a Pipeline step.
+    """
+    prefix = f"{step_name}__"
+    is_valid = None
+    if search_space.is_valid is not None:
+        is_valid = functools.partial(_unprefixed_is_valid, search_space.is_valid, prefix)
+    return SearchSpace(
+        subspaces=[{prefix + name: values for name, values in subspace.items()} for subspace in search_space.subspaces],
+        n_iter=search_space.n_iter,
+        is_valid=is_valid
+    )
+
+
+def get_search_space(model) -> Optional[SearchSpace]:
+    """
+    Returns the registered search space for the model's class (or a parent class).
+
+    For a Pipeline, the space of its final step is returned, prefixed with the step name.
+    """
+    if isinstance(model, Pipeline):
+        step_name, final_step = model.steps[-1]
+        search_space = get_search_space(final_step)
+        return prefix_search_space(search_space, step_name) if search_space is not None else None
+
+    for cls in type(model).__mro__:
+        if cls in SEARCH_SPACES:
+            return SEARCH_SPACES[cls]
+    return None
+
+
+def sanitize_param_space(model, param_space: ParamSpace,
+                         is_valid: Optional[Callable[[Dict], bool]] = None) -> List[Dict]:
+    """
+    Removes parameters the model doesn't have and combinations it can't fit.
+
+    Each dict is split on its list-valued parameters, and splits whose fixed
+    values fail `is_valid` are dropped, so no fit is dispatched for them.
+
+    Args:
+        model: Estimator to be tuned.
+        param_space (dict or list of dicts): Parameter distributions.
+        is_valid (Callable): Predicate over a parameter combination.
+
+    Returns:
+        List[Dict]: Valid subspaces, possibly empty.
+    """
+    valid_params = set(model.get_params())
+    subspaces = param_space if isinstance(param_space, list) else [param_space]
+
+    sanitized = []
+    for subspace in subspaces:
+        unknown = [name for name in subspace if name not in valid_params]
+        if unknown:
+            logging.info(f"Dropping parameters unknown to {model.__class__.__name__}: {unknown}")
+        subspace = {name: values for name, values in subspace.items() if name in valid_params}
+        if not subspace:
+            continue
+
+        if is_valid is None:
+            sanitized.append(subspace)
+            continue
+
+        categorical = [name for name, values in subspace.items() if isinstance(values, list)]
+        n_combinations = 1
+        for name in categorical:
+            n_combinations *= len(subspace[name])
+        if n_combinations > MAX_SUBSPACES:
+            sanitized.append(subspace)
+            continue
+
+        for combination in itertools.product(*(subspace[name] for name in categorical)):
+            fixed = dict(zip(categorical, combination))
+            if is_valid({**subspace, **fixed}):
+                sanitized.append({**subspace, **{name: [value] for name, value in fixed.items()}})
+            else:
+                logging.info(f"Skipping invalid combination for {model.__class__.__name__}: {fixed}")
+
+    return sanitized
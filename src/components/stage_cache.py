@@ -0,0 +1,163 @@
+import hashlib
+import inspect
+import os
+import shutil
+import sys
+import tempfile
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import joblib
+import sklearn
+
+from src.exception import CustomException
+from src.logger import logging
+
+
+@dataclass
+class StageCacheConfig:
+    cache_dir: str = os.path.join("artifacts", "stage_cache")
+    enabled: bool = True
+
+
+def _normalize(obj):
+    """
+    Converts stage parameters into a form with a stable hash.
+
+    Frozen scipy distributions carry a random state whose pickle changes every
+    time they are sampled, so they are reduced to their name and arguments.
+    """
+    if isinstance(obj, dict):
+        return {str(key): _normalize(value) for key, value in sorted(obj.items(), key=lambda item: str(item[0]))}
+    if isinstance(obj, (list, tuple)):
+        return [_normalize(value) for value in obj]
+    if hasattr(obj, "dist") and hasattr(obj, "rvs") and hasattr(obj, "kwds"):
+        return ("scipy.stats", obj.dist.name, _normalize(list(obj.args)), _normalize(obj.kwds))
+    if hasattr(obj, "get_params") and not inspect.isclass(obj):
+        return (obj.__class__.__name__, _normalize(obj.get_params(deep=False)))
+    if inspect.isclass(obj) or inspect.isfunction(obj):
+        return f"{obj.__module__}.{obj.__qualname__}"
+    return obj
+
+
+class StageCache:
+    """
+    Content-addressed cache for training pipeline stages.
+
+    A stage's key is the hash of its name, parameters, the keys of the stages
+    it consumes, and the source code of the components it runs. Feeding each
+    key into the next stage chains them, so changing the raw data, a
+    component or a parameter invalidates that stage and everything after it,
+    while earlier stages are loaded from disk.
+
+    Stages that write artifacts (e.g. preprocessor.pkl) list them, and on a
+    cache hit the cached copies are restored to those paths.
+    """
+
+    def __init__(self, config: Optional[StageCacheConfig] = None):
+        self.config = config or StageCacheConfig()
+        self._code_hashes: Dict[str, str] = {}
+
+    @staticmethod
+    def hash_file(file_path: str) -> str:
+        """
+        Returns the SHA-256 of a file's contents, read in blocks.
+        """
+        try:
+            digest = hashlib.sha256()
+            with open(file_path, 'rb') as file_obj:
+                for block in iter(lambda: file_obj.read(1 << 20), b""):
+                    digest.update(block)
+            return digest.hexdigest()
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def _code_version(self, components: Iterable) -> str:
+        digest = hashlib.sha256(sklearn.__version__.encode())
+        for component in components:
+            source_file = inspect.getsourcefile(component)
+            if source_file not in self._code_hashes:
+                self._code_hashes[source_file] = self.hash_file(source_file)
+            digest.update(self._code_hashes[source_file].encode())
+        return digest.hexdigest()
+
+    def stage_key(self, stage: str, params: Optional[dict] = None,
+                  upstream: Iterable[str] = (), code: Iterable = ()) -> str:
+        """
+        Args:
+            stage (str): Stage name.
+            params (dict): Parameters that change the stage output.
+            upstream (Iterable[str]): Keys of the stages or data this stage consumes.
+            code (Iterable): Classes or functions whose source the stage depends on.
+
+        Returns:
+            str: Cache key of the stage.
+        """
+        payload = (stage, _normalize(params or {}), list(upstream), self._code_version(code))
+        return joblib.hash(payload)
+
+    def _entry_dir(self, stage: str, key: str) -> str:
+        return os.path.join(self.config.cache_dir, f"{stage}-{key}")
+
+    def run(self, stage: str, fn: Callable[[], object], params: Optional[dict] = None,
+            upstream: Iterable[str] = (), code: Iterable = (), artifacts: Iterable[str] = ()) -> Tuple[object, str]:
+        """
+        Returns the cached output of a stage, or runs it and caches the output.
+
+        Args:
+            stage (str): Stage name.
+            fn (Callable): Runs the stage and returns its output.
+            params (dict): Parameters that change the stage output.
+            upstream (Iterable[str]): Keys of the stages or data this stage consumes.
+            code (Iterable): Classes or functions whose source the stage depends on.
+            artifacts (Iterable[str]): Files the stage writes, restored on a cache hit.
+
+        Returns:
+            Tuple[object, str]: Stage output and the stage key to pass downstream.
+        """
+        try:
+            key = self.stage_key(stage, params, upstream, code)
+            if not self.config.enabled:
+                return fn(), key
+
+            artifacts = list(artifacts)
+            entry_dir = self._entry_dir(stage, key)
+            result_path = os.path.join(entry_dir, "result.pkl")
+
+            if os.path.exists(result_path):
+                logging.info(f"Stage cache hit for '{stage}' ({key[:12]}).")
+                for i, artifact_path in enumerate(artifacts):
+                    os.makedirs(os.path.dirname(artifact_path) or ".", exist_ok=True)
+                    tmp_path = f"{artifact_path}.tmp"
+                    shutil.copyfile(os.path.join(entry_dir, f"artifact_{i}"), tmp_path)
+                    os.replace(tmp_path, artifact_path)
+                return joblib.load(result_path), key
+
+            logging.info(f"Stage cache miss for '{stage}' ({key[:12]}), running stage.")
+            result = fn()
+
+            # Build the entry in a temp dir and rename it into place, so an
+            # interrupted run never leaves a half-written entry behind.
+            os.makedirs(self.config.cache_dir, exist_ok=True)
+            tmp_dir = tempfile.mkdtemp(dir=self.config.cache_dir, prefix=".tmp-")
+            try:
+                joblib.dump(result, os.path.join(tmp_dir, "result.pkl"))
+                for i, artifact_path in enumerate(artifacts):
+                    shutil.copyfile(artifact_path, os.path.join(tmp_dir, f"artifact_{i}"))
+                os.replace(tmp_dir, entry_dir)
+            except OSError:
+                # Another run stored the same entry first.
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+            return result, key
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def clear(self) -> None:
+        """
+        Deletes every cached stage output.
+        """
+        shutil.rmtree(self.config.cache_dir, ignore_errors=True)
+        logging.info(f"Stage cache cleared at {self.config.cache_dir}.")
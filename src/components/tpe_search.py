@@ -0,0 +1,282 @@
+import math
+import sys
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from joblib import Parallel, delayed
+
+from sklearn.base import clone
+from sklearn.metrics import check_scoring
+from sklearn.model_selection import check_cv
+from sklearn.svm import SVC
+from sklearn.utils import _safe_indexing
+
+from src.components.fold_manager import FoldManager
+from src.exception import CustomException
+from src.logger import logging
+
+
+def _is_distribution(values) -> bool:
+    return hasattr(values, "rvs") and hasattr(values, "cdf") and hasattr(values, "ppf")
+
+
+class _ParameterDensity:
+    """
+    Parzen estimate of where good (or bad) values of one parameter lie.
+
+    Lists are treated as categorical with add-one smoothing. scipy
+    distributions are modelled in their CDF space, where the prior is
+    uniform on (0, 1) (so loguniform is handled in log space for free), with
+    a Gaussian kernel around each observation plus one uniform prior
+    component.
+    """
+
+    def __init__(self, values, observations: List):
+        self.values = values
+        if _is_distribution(values):
+            self.centers = np.clip(values.cdf(np.asarray(observations, dtype=float)), 0.0, 1.0)
+            n = max(len(self.centers), 1)
+            spread = self.centers.std() if len(self.centers) > 1 else 0.5
+            self.bandwidth = float(np.clip(spread * n ** (-1 / 5), 0.05, 0.5))
+        else:
+            counts = np.ones(len(values))
+            for observation in observations:
+                counts[self._index(observation)] += 1
+            self.probabilities = counts / counts.sum()
+
+    def _index(self, value) -> int:
+        for i, candidate in enumerate(self.values):
+            if candidate is value or candidate == value:
+                return i
+        raise ValueError(f"Value {value!r} is not in {self.values!r}")
+
+    def sample(self, rng: np.random.RandomState):
+        if not _is_distribution(self.values):
+            return self.values[rng.choice(len(self.values), p=self.probabilities)]
+
+        component = rng.randint(len(self.centers) + 1)
+        if component == len(self.centers):
+            u = rng.uniform()
+        else:
+            u = rng.normal(self.centers[component], self.bandwidth)
+        return self.values.ppf(float(np.clip(u, 1e-9, 1 - 1e-9)))
+
+    def log_pdf(self, value) -> float:
+        if not _is_distribution(self.values):
+            return math.log(self.probabilities[self._index(value)])
+
+        u = float(np.clip(self.values.cdf(value), 0.0, 1.0))
+        kernel = np.exp(-0.5 * ((u - self.centers) / self.bandwidth) ** 2) / (self.bandwidth * math.sqrt(2 * math.pi))
+        return math.log((kernel.sum() + 1.0) / (len(self.centers) + 1))
+
+
+def _fit_and_score(estimator, params: Dict, X_train, X_test, y_train, y_test, scorer) -> float:
+    model = clone(estimator).set_params(**params)
+    try:
+        model.fit(X_train, y_train)
+    except ValueError as e:
+        # Invalid parameter combinations fail the trial instead of the whole search.
+        logging.info(f"Fit with {params} failed: {e}")
+        return np.nan
+    return scorer(model, X_test, y_test)
+
+
+def _uses_rbf_kernel(estimator, params: Dict) -> bool:
+    return isinstance(estimator, SVC) and params.get("kernel", estimator.kernel) == "rbf"
+
+
+class TPESearchCV:
+    """
+    Adaptive hyperparameter search with a Tree-structured Parzen Estimator.
+
+    The first `n_startup_trials` configurations are sampled at random. After
+    that, finished trials are split into the best `gamma` fraction and the
+    rest, a density is fitted to each group per parameter, and the next
+    configuration is the candidate with the highest good/bad density ratio.
+
+    Each trial first runs `n_warmup_folds` folds. If its mean there is no
+    better than the median of earlier trials on the same folds, the trial is
+    pruned and the remaining folds are skipped. Folds within a phase run in
+    parallel with `n_jobs`.
+
+    `param_distributions` may also be a list of dicts, as in
+    RandomizedSearchCV. The subspace is then one more categorical choice, and
+    per-parameter densities are fitted only on trials from that subspace.
+
+    With a FoldManager as `cv`, cached fold arrays are reused across trials,
+    and RBF SVC candidates are fitted on kernels derived from the cached
+    per-fold distance matrices instead of recomputing them for every gamma.
+
+    Exposes `best_estimator_`, `best_params_`, `best_score_` and
+    `cv_results_` like the sklearn search classes.
+    """
+
+    def __init__(self, estimator, param_distributions: Union[Dict, List[Dict]], n_iter: int = 50, scoring='f1_macro', cv=5,
+                 n_startup_trials: int = 10, gamma: float = 0.25, n_ei_candidates: int = 24,
+                 prune: bool = True, n_warmup_folds: int = 2, n_jobs=None, random_state: int = 42):
+        self.estimator = estimator
+        self.param_distributions = param_distributions
+        self.n_iter = n_iter
+        self.scoring = scoring
+        self.cv = cv
+        self.n_startup_trials = n_startup_trials
+        self.gamma = gamma
+        self.n_ei_candidates = n_ei_candidates
+        self.prune = prune
+        self.n_warmup_folds = n_warmup_folds
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+
+    def _subspaces(self) -> List[Dict]:
+        if isinstance(self.param_distributions, list):
+            return self.param_distributions
+        return [self.param_distributions]
+
+    def _sample_random(self, rng: np.random.RandomState) -> Tuple[int, Dict]:
+        subspace_index = rng.choice(len(self._subspaces()))
+        params = {}
+        for name, values in self._subspaces()[subspace_index].items():
+            if _is_distribution(values):
+                params[name] = values.rvs(random_state=rng)
+            else:
+                params[name] = values[rng.choice(len(values))]
+        return subspace_index, params
+
+    def _sample_tpe(self, rng: np.random.RandomState, trials: List[Dict]) -> Tuple[int, Dict]:
+        finished = sorted(
+            (trial for trial in trials if not trial["pruned"]),
+            key=lambda trial: trial["score"],
+            reverse=True
+        )
+        n_good = max(1, int(math.ceil(self.gamma * len(finished))))
+        good = finished[:n_good]
+        bad = finished[n_good:] + [trial for trial in trials if trial["pruned"]]
+
+        subspaces = self._subspaces()
+        subspace_indices = list(range(len(subspaces)))
+        subspace_good = _ParameterDensity(subspace_indices, [trial["subspace"] for trial in good])
+        subspace_bad = _ParameterDensity(subspace_indices, [trial["subspace"] for trial in bad])
+        densities = {}
+
+        best, best_ratio = None, -np.inf
+        for _ in range(self.n_ei_candidates):
+            subspace_index = subspace_good.sample(rng)
+            if subspace_index not in densities:
+                densities[subspace_index] = {
+                    name: (
+                        _ParameterDensity(values, [t["params"][name] for t in good if t["subspace"] == subspace_index]),
+                        _ParameterDensity(values, [t["params"][name] for t in bad if t["subspace"] == subspace_index])
+                    )
+                    for name, values in subspaces[subspace_index].items()
+                }
+
+            params = {name: good_density.sample(rng) for name, (good_density, _) in densities[subspace_index].items()}
+            ratio = subspace_good.log_pdf(subspace_index) - subspace_bad.log_pdf(subspace_index) + sum(
+                good_density.log_pdf(params[name]) - bad_density.log_pdf(params[name])
+                for name, (good_density, bad_density) in densities[subspace_index].items()
+            )
+            if ratio > best_ratio:
+                best, best_ratio = (subspace_index, params), ratio
+
+        return best
+
+    def _fold_inputs(self, fold: int, split, params: Dict, X, y, fold_manager: Optional[FoldManager]):
+        if fold_manager is None:
+            train_idx, test_idx = split
+            return (
+                params,
+                _safe_indexing(X, train_idx), _safe_indexing(X, test_idx),
+                _safe_indexing(y, train_idx), _safe_indexing(y, test_idx)
+            )
+
+        X_train, X_test, y_train, y_test = fold_manager.fold_data(fold)
+        if not (_uses_rbf_kernel(self.estimator, params) and fold_manager.supports_kernel_cache()):
+            return params, X_train, X_test, y_train, y_test
+
+        gamma = params.get("gamma", self.estimator.gamma)
+        if gamma == "scale":
+            gamma = 1.0 / (np.shape(X_train)[1] * np.asarray(X_train).var())
+        elif gamma == "auto":
+            gamma = 1.0 / np.shape(X_train)[1]
+
+        train_distances, test_distances = fold_manager.squared_distances(fold)
+        return (
+            {**params, "kernel": "precomputed"},
+            np.exp(-gamma * train_distances), np.exp(-gamma * test_distances),
+            y_train, y_test
+        )
+
+    def _evaluate(self, params: Dict, X, y, splits, scorer, trials: List[Dict],
+                  fold_manager: Optional[FoldManager] = None) -> Dict:
+        n_warmup = min(self.n_warmup_folds, len(splits))
+        folds = list(enumerate(splits))
+        phases = [folds[:n_warmup], folds[n_warmup:]] if self.prune else [folds]
+
+        fold_scores = []
+        for phase in phases:
+            if not phase:
+                continue
+            fold_scores += Parallel(n_jobs=self.n_jobs)(
+                delayed(_fit_and_score)(self.estimator, *self._fold_inputs(fold, split, params, X, y, fold_manager), scorer)
+                for fold, split in phase
+            )
+            if np.isnan(fold_scores).any():
+                return {"params": params, "fold_scores": [], "score": -np.inf, "pruned": True}
+
+            n_done = len(fold_scores)
+            if self.prune and n_done < len(splits):
+                reference = [
+                    np.mean(trial["fold_scores"][:n_done])
+                    for trial in trials
+                    if len(trial["fold_scores"]) >= n_done
+                ]
+                # Ties count as pruned: they re-evaluate a configuration already seen.
+                if len(reference) >= self.n_startup_trials and np.mean(fold_scores) <= np.median(reference):
+                    return {"params": params, "fold_scores": fold_scores, "score": float(np.mean(fold_scores)), "pruned": True}
+
+        return {"params": params, "fold_scores": fold_scores, "score": float(np.mean(fold_scores)), "pruned": False}
+
+    def fit(self, X, y):
+        try:
+            rng = np.random.RandomState(self.random_state)
+            fold_manager = None
+            if isinstance(self.cv, FoldManager) and self.cv.n_samples == len(y):
+                splits = self.cv.folds
+                # Cached fold arrays only when they were built from this X; other data of
+                # the same size is indexed with the same folds.
+                if self.cv.holds(X, y):
+                    fold_manager = self.cv
+            else:
+                splits = list(check_cv(self.cv, y, classifier=True).split(X, y))
+            scorer = check_scoring(self.estimator, scoring=self.scoring)
+
+            trials: List[Dict] = []
+            for i in range(self.n_iter):
+                if i < self.n_startup_trials or all(trial["pruned"] for trial in trials):
+                    subspace_index, params = self._sample_random(rng)
+                else:
+                    subspace_index, params = self._sample_tpe(rng, trials)
+                trial = self._evaluate(params, X, y, splits, scorer, trials, fold_manager)
+                trial["subspace"] = subspace_index
+                trials.append(trial)
+
+            finished = [trial for trial in trials if not trial["pruned"]]
+            if not finished:
+                raise ValueError("Every TPE trial failed or was pruned.")
+            best = max(finished, key=lambda trial: trial["score"])
+
+            self.best_params_ = best["params"]
+            self.best_score_ = best["score"]
+            self.best_estimator_ = clone(self.estimator).set_params(**self.best_params_).fit(X, y)
+            self.n_fits_ = sum(len(trial["fold_scores"]) for trial in trials) + 1
+            self.cv_results_ = {
+                "params": [trial["params"] for trial in trials],
+                "mean_test_score": np.array([trial["score"] for trial in trials]),
+                "n_folds_evaluated": np.array([len(trial["fold_scores"]) for trial in trials]),
+                "pruned": np.array([trial["pruned"] for trial in trials])
+            }
+
+            return self
+
+        except Exception as e:
+            raise CustomException(e, sys)
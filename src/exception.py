@@ -15,4 +15,16 @@ class CustomException(Exception):
 
 
     def __str__(self):
-        return self.error_message
\ No newline at end of file
+        return self.error_message
+
+    def __reduce__(self):
+        # The traceback passed in as error_detail can't be pickled, so rebuild
+        # from the formatted message when the exception crosses a process boundary.
+        return (_rebuild_custom_exception, (self.__class__, self.error_message))
+
+
+def _rebuild_custom_exception(cls, error_message):
+    exc = cls.__new__(cls)
+    Exception.__init__(exc, error_message)
+    exc.error_message = error_message
+    return exc
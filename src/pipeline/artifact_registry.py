@@ -0,0 +1,257 @@
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.artifact_store import ArtifactStore, ArtifactStoreConfig
+from src.exception import CustomException
+from src.logger import logging
+
+
+@dataclass
+class ArtifactRegistryConfig:
+    # Minimum number of seconds between two on-disk change checks.
+    check_interval: float = 2.0
+    # Memory-map the arrays inside the artifacts, so workers share their pages. Off by
+    # default: mapped arrays are read-only, and some models can't predict from them
+    # (libsvm's predict_proba, for one). See `check_serving_load`.
+    mmap_mode: Optional[str] = None
+    manifest_path: str = ArtifactStoreConfig.manifest_path
+
+
+@dataclass
+class ArtifactBundle:
+    """
+    Snapshot of the inference artifacts loaded together.
+    """
+    objects: Dict[str, object]
+    signature: Tuple
+    loaded_at: float
+    manifest: Optional[Dict] = None
+    derived: Dict[str, object] = field(default_factory=dict)
+
+    def __getitem__(self, name: str):
+        return self.objects[name]
+
+    def get_derived(self, key: str, factory: Callable[["ArtifactBundle"], object]):
+        """
+        Returns an object computed once from this bundle, e.g. a compiled predictor.
+
+        The cache lives on the bundle, so it is dropped together with it on reload.
+        """
+        if key not in self.derived:
+            self.derived[key] = factory(self)
+        return self.derived[key]
+
+
+class ArtifactRegistry:
+    """
+    Keeps one in-memory copy of the inference artifacts per process.
+
+    The bundle is loaded lazily on first use (or eagerly via `warm_up`) and
+    reused by every request. When the files on disk change, a new bundle is
+    loaded in a background thread and swapped in with a single reference
+    assignment, so in-flight requests keep using the bundle they already hold.
+
+    When training publishes a manifest (see ArtifactStore), changes are
+    detected by its version and files are checked against its checksums
+    before a bundle is used; otherwise file modification times are compared.
+
+    When the current training output no longer provides one of the
+    registry's artifacts (e.g. the NumPy export of a model that isn't linear
+    any more), `withdrawn` is set and the bundle isn't reloaded. Callers must
+    then stop serving it; `get` keeps returning the last bundle.
+    """
+
+    def __init__(self, artifact_paths: Dict[str, str], config: Optional[ArtifactRegistryConfig] = None,
+                 loader: Optional[Callable[[str], object]] = None):
+        """
+        Args:
+            artifact_paths (Dict[str, str]): Mapping of artifact name to file path.
+            config (ArtifactRegistryConfig): Reload settings.
+            loader (Callable): Loads one artifact file; defaults to joblib via `load_object`.
+        """
+        self.artifact_paths = dict(artifact_paths)
+        self.loader = loader
+        self.config = config or ArtifactRegistryConfig()
+        self.store = ArtifactStore(ArtifactStoreConfig(manifest_path=self.config.manifest_path))
+        self._bundle: Optional[ArtifactBundle] = None
+        self._pending_signature: Optional[Tuple] = None
+        self._last_check = 0.0
+        self._load_lock = threading.Lock()
+        self._reloading = False
+        self.withdrawn = False
+
+    def _signature(self) -> Tuple:
+        manifest = self.store.read_manifest()
+        if manifest is not None:
+            return ("manifest", manifest["version"], manifest["created_at"])
+
+        signature = []
+        for name in sorted(self.artifact_paths):
+            stat = os.stat(self.artifact_paths[name])
+            signature.append((name, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def _withdrawn_artifacts(self) -> List[str]:
+        """
+        Returns the registry's artifacts the current manifest doesn't list, or
+        without a manifest, the ones whose file is gone.
+        """
+        try:
+            manifest = self.store.read_manifest()
+        except Exception:
+            return []
+        if manifest is not None:
+            return [name for name in sorted(self.artifact_paths) if name not in manifest["artifacts"]]
+        # Saves replace files atomically, so a missing file was deleted, not rewritten.
+        return [name for name, path in sorted(self.artifact_paths.items()) if not os.path.exists(path)]
+
+    def _load_bundle(self) -> ArtifactBundle:
+        logging.info("Loading inference artifacts into the registry.")
+        objects, manifest = self.store.load(self.artifact_paths, mmap_mode=self.config.mmap_mode, loader=self.loader)
+        # The signature is taken from the manifest the files were checked against.
+        signature = ("manifest", manifest["version"], manifest["created_at"]) if manifest else self._signature()
+        version = f" (version {manifest['version']})" if manifest else ""
+        logging.info(f"Inference artifacts loaded{version}: {sorted(objects)}")
+
+        return ArtifactBundle(objects=objects, signature=signature, loaded_at=time.time(), manifest=manifest)
+
+    def _reload_in_background(self) -> None:
+        try:
+            bundle = self._load_bundle()
+            self._bundle = bundle
+            logging.info("Inference artifacts reloaded after on-disk change.")
+
+        except Exception as e:
+            # Keep serving the previous bundle; the next check will retry.
+            logging.error(f"Reloading inference artifacts failed: {e}")
+
+        finally:
+            self._pending_signature = None
+            self._reloading = False
+
+    def _check_for_changes(self, bundle: ArtifactBundle) -> None:
+        withdrawn = self._withdrawn_artifacts()
+        if withdrawn:
+            if not self.withdrawn:
+                logging.warning(f"Artifacts {withdrawn} are no longer published; they must not be served any more.")
+            self.withdrawn = True
+            return
+        if self.withdrawn:
+            logging.info(f"Artifacts {sorted(self.artifact_paths)} are published again.")
+            self.withdrawn = False
+
+        try:
+            signature = self._signature()
+        except Exception:
+            # A file is being replaced right now; look again on the next check.
+            return
+
+        if signature == bundle.signature:
+            self._pending_signature = None
+            return
+
+        # Only reload once the files have stopped changing between two checks,
+        # so a bundle is never assembled from a half-finished training run.
+        if signature != self._pending_signature:
+            self._pending_signature = signature
+            return
+
+        with self._load_lock:
+            if self._reloading:
+                return
+            self._reloading = True
+
+        threading.Thread(target=self._reload_in_background, daemon=True).start()
+
+    def get(self) -> ArtifactBundle:
+        """
+        Returns the current artifact bundle, loading it on first use.
+
+        Returns:
+            ArtifactBundle: Loaded artifacts.
+        """
+        try:
+            bundle = self._bundle
+            if bundle is None:
+                with self._load_lock:
+                    if self._bundle is None:
+                        self._bundle = self._load_bundle()
+                        self._last_check = time.monotonic()
+                    return self._bundle
+
+            now = time.monotonic()
+            if now - self._last_check >= self.config.check_interval:
+                self._last_check = now
+                self._check_for_changes(bundle)
+
+            return bundle
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def warm_up(self) -> None:
+        """
+        Loads the artifacts eagerly, e.g. at worker startup.
+        """
+        self.get()
+
+
+_registries: Dict[Tuple, ArtifactRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_artifact_registry(artifact_paths: Dict[str, str],
+                          loader: Optional[Callable[[str], object]] = None,
+                          config: Optional[ArtifactRegistryConfig] = None) -> ArtifactRegistry:
+    """
+    Returns the process-wide registry for the given set of artifact paths.
+
+    Args:
+        artifact_paths (Dict[str, str]): Mapping of artifact name to file path.
+        loader (Callable): Loads one artifact file, used when the registry is first created.
+        config (ArtifactRegistryConfig): Reload settings, used when the registry is first created.
+
+    Returns:
+        ArtifactRegistry: Shared registry instance.
+    """
+    key = tuple(sorted(artifact_paths.items()))
+    with _registries_lock:
+        if key not in _registries:
+            _registries[key] = ArtifactRegistry(artifact_paths, config=config, loader=loader)
+        return _registries[key]
+
+
+def check_serving_load(model, X, mmap_mode: Optional[str] = ArtifactRegistryConfig.mmap_mode) -> None:
+    """
+    Saves a fitted model, loads it back the way the registry does and predicts with it.
+
+    Catches models that train fine but fail once served, e.g. on read-only
+    memory-mapped arrays.
+
+    Args:
+        model: Fitted estimator.
+        X (np.ndarray): A few rows in the model's input space.
+        mmap_mode (str): Load mode to check; defaults to the registry's.
+
+    Raises:
+        CustomException: If `predict` or `predict_proba` fails on the loaded model.
+    """
+    import tempfile
+
+    from src.utils import save_object, load_object
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "model.pkl")
+            save_object(file_path=file_path, obj=model)
+            loaded = load_object(file_path, mmap_mode=mmap_mode)
+            loaded.predict(X)
+            if hasattr(loaded, "predict_proba"):
+                loaded.predict_proba(X)
+
+    except Exception as e:
+        raise CustomException(e, sys)
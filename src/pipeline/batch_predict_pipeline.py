@@ -0,0 +1,191 @@
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.exception import CustomException
+from src.logger import logging
+from src.pipeline.numpy_predictor import check_finite
+from src.pipeline.predict_pipeline import PredictPipeline, FEATURE_COLUMNS
+
+PREDICTION_COLUMN = "predicted_genre"
+
+
+@dataclass
+class BatchPredictConfig:
+    chunk_size: int = 100_000
+    # 1 scores chunks in this process; more fans chunks out to a process pool.
+    n_workers: int = 1
+    # Extra input columns copied next to the prediction, e.g. a track id.
+    keep_columns: List[str] = field(default_factory=list)
+    fused: bool = True
+
+
+def _file_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".parquet", ".pq"):
+        return "parquet"
+    raise ValueError(f"Unsupported file type '{extension}', expected .csv or .parquet")
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+        return pyarrow
+
+    except ImportError as e:
+        raise ImportError("Parquet input/output needs pyarrow: pip install pyarrow") from e
+
+
+def _standardize_column_names(df: pd.DataFrame) -> pd.DataFrame:
+    # Same rule as DataCleaner.standardize_column_names, so raw dataset headers are accepted too.
+    df.columns = [col.strip().lower().replace(' ', '_') for col in df.columns]
+    return df
+
+
+_worker_pipeline: Optional[PredictPipeline] = None
+
+
+def _init_worker(fused: bool) -> None:
+    global _worker_pipeline
+    _worker_pipeline = PredictPipeline(fused=fused)
+    _worker_pipeline.warm_up()
+
+
+def _feature_matrix(chunk: pd.DataFrame, first_row: int) -> np.ndarray:
+    # Same value rules as the JSON API's parse_batch. The fused predictor would
+    # otherwise label NaN rows, so a bad row fails the run with its row number.
+    try:
+        features = chunk[FEATURE_COLUMNS]
+        for col in FEATURE_COLUMNS:
+            if pd.api.types.is_bool_dtype(features[col]):
+                raise ValueError(f"Column '{col}' must be numeric, got booleans.")
+
+        X = features.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64)
+        check_finite(X, FEATURE_COLUMNS, first_row=first_row)
+        return X
+
+    except ValueError as e:
+        raise ValueError(f"Invalid values in rows {first_row}-{first_row + len(chunk) - 1}: {e}") from e
+
+
+def _score_chunk(chunk: pd.DataFrame, keep_columns: List[str], first_row: int = 0) -> pd.DataFrame:
+    chunk = _standardize_column_names(chunk)
+
+    missing_columns = [col for col in FEATURE_COLUMNS + keep_columns if col not in chunk.columns]
+    if missing_columns:
+        raise ValueError(f"Schema mismatch! Missing columns: {missing_columns}")
+
+    X = _feature_matrix(chunk, first_row)
+    output = chunk[keep_columns].reset_index(drop=True)
+    output[PREDICTION_COLUMN] = _worker_pipeline.predict(pd.DataFrame(X, columns=FEATURE_COLUMNS))
+    return output
+
+
+class BatchPredictPipeline:
+    """
+    Scores a CSV or Parquet file in fixed-size chunks and streams predictions to disk.
+
+    Only a bounded number of chunks is in memory at any time: one being read,
+    at most two per worker in flight, and one being written. Output order
+    matches input order.
+    """
+
+    def __init__(self, config: BatchPredictConfig = None):
+        self.config = config or BatchPredictConfig()
+
+    def _read_chunks(self, input_path: str) -> Iterator[pd.DataFrame]:
+        if _file_format(input_path) == "csv":
+            yield from pd.read_csv(input_path, chunksize=self.config.chunk_size)
+        else:
+            pyarrow = _import_pyarrow()
+            parquet_file = pyarrow.parquet.ParquetFile(input_path)
+            for batch in parquet_file.iter_batches(batch_size=self.config.chunk_size):
+                yield batch.to_pandas()
+
+    def _score_chunks(self, chunks: Iterator[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        keep_columns = [col.strip().lower().replace(' ', '_') for col in self.config.keep_columns]
+        first_row = 0
+
+        if self.config.n_workers <= 1:
+            _init_worker(self.config.fused)
+            for chunk in chunks:
+                yield _score_chunk(chunk, keep_columns, first_row)
+                first_row += len(chunk)
+            return
+
+        max_in_flight = 2 * self.config.n_workers
+        with ProcessPoolExecutor(
+            max_workers=self.config.n_workers,
+            initializer=_init_worker,
+            initargs=(self.config.fused,)
+        ) as executor:
+            in_flight = deque()
+            for chunk in chunks:
+                in_flight.append(executor.submit(_score_chunk, chunk, keep_columns, first_row))
+                first_row += len(chunk)
+                if len(in_flight) >= max_in_flight:
+                    yield in_flight.popleft().result()
+
+            while in_flight:
+                yield in_flight.popleft().result()
+
+    def run(self, input_path: str, output_path: str) -> int:
+        """
+        Scores every row of `input_path` and writes the predictions to `output_path`.
+
+        Args:
+            input_path (str): CSV or Parquet file with the 12 feature columns.
+            output_path (str): CSV or Parquet file to write.
+
+        Returns:
+            int: Number of rows scored.
+        """
+        try:
+            logging.info(f"Starting batch scoring of {input_path} with config: {self.config}")
+            if not os.path.exists(input_path):
+                raise FileNotFoundError(f"Input file not found at {input_path}")
+
+            output_format = _file_format(output_path)
+            output_dir = os.path.dirname(output_path)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+
+            start = time.perf_counter()
+            n_rows = 0
+            writer = None
+
+            try:
+                for i, scored in enumerate(self._score_chunks(self._read_chunks(input_path))):
+                    if output_format == "csv":
+                        scored.to_csv(output_path, mode="w" if i == 0 else "a", header=(i == 0), index=False)
+                    else:
+                        pyarrow = _import_pyarrow()
+                        table = pyarrow.Table.from_pandas(scored, preserve_index=False)
+                        if writer is None:
+                            writer = pyarrow.parquet.ParquetWriter(output_path, table.schema)
+                        writer.write_table(table)
+
+                    n_rows += len(scored)
+                    logging.info(f"Scored chunk {i + 1}, {n_rows} rows so far.")
+
+            finally:
+                if writer is not None:
+                    writer.close()
+
+            elapsed = time.perf_counter() - start
+            logging.info(f"Batch scoring finished: {n_rows} rows in {elapsed:.2f}s written to {output_path}")
+
+            return n_rows
+
+        except Exception as e:
+            raise CustomException(e, sys)
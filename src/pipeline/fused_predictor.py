@@ -0,0 +1,211 @@
+import os
+import sys
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model._base import LinearClassifierMixin
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from src.exception import CustomException
+from src.logger import logging
+from src.pipeline.numpy_predictor import NumpyLinearPredictor
+from src.utils import load_object
+
+
+def _extract_scaler(preprocessor):
+    """
+    Returns (feature_names, scaler) from the fitted ColumnTransformer built by DataTransformation.
+
+    Raises:
+        ValueError: If the preprocessor is not a single StandardScaler over the numeric columns.
+    """
+    if getattr(preprocessor, "remainder", "drop") != "drop":
+        raise ValueError("Preprocessor passes through extra columns and can't be fused.")
+
+    transformers = [
+        (name, transformer, columns)
+        for name, transformer, columns in preprocessor.transformers_
+        if name != "remainder" and transformer != "drop"
+    ]
+    if len(transformers) != 1:
+        raise ValueError(f"Expected one fitted transformer, found {len(transformers)}.")
+
+    _, transformer, columns = transformers[0]
+    if isinstance(transformer, Pipeline):
+        if len(transformer.steps) != 1:
+            raise ValueError("Only single-step scaling pipelines can be fused.")
+        transformer = transformer.steps[0][1]
+
+    if not isinstance(transformer, StandardScaler):
+        raise ValueError(f"Can't fuse transformer of type {transformer.__class__.__name__}.")
+
+    return list(columns), transformer
+
+
+class FusedLinearPredictor(NumpyLinearPredictor):
+    """
+    Folds StandardScaler -> PCA -> linear classifier into one affine map.
+
+    All three stages are affine, so
+        logits = ((x - mu) / s - m) @ P.T @ W.T + b
+    collapses to x @ A + c with A and c precomputed once. Prediction is then a
+    single matmul + argmax per batch. Also accepts DataFrames, and can be
+    exported for numpy-only serving (see `export_numpy_model`).
+    """
+
+    @classmethod
+    def from_artifacts(cls, preprocessor, pca_model, model, target_label_encoder, dtype=np.float64):
+        """
+        Builds the fused predictor from the fitted training artifacts.
+
+        The weights are always folded in float64 and only then cast to `dtype`,
+        so a float32 predictor carries no more error than its final rounding.
+
+        Raises:
+            ValueError: If any stage is not affine (e.g. a KNN or RBF SVC model).
+        """
+        if not isinstance(model, LinearClassifierMixin):
+            raise ValueError(f"Model {model.__class__.__name__} is not linear and can't be fused.")
+
+        feature_names, scaler = _extract_scaler(preprocessor)
+        n_features = len(feature_names)
+
+        # StandardScaler: z = (x - mu) / s
+        mu = scaler.mean_ if scaler.mean_ is not None else np.zeros(n_features)
+        s = scaler.scale_ if scaler.scale_ is not None else np.ones(n_features)
+
+        # PCA: p = (z - m) @ P.T, optionally whitened
+        projection = pca_model.components_.T
+        if getattr(pca_model, "whiten", False):
+            projection = projection / np.sqrt(pca_model.explained_variance_)
+
+        # Linear model: logits = p @ W.T + b
+        coef = model.coef_.T
+        intercept = np.asarray(model.intercept_, dtype=np.float64)
+
+        weights = (projection / s[:, None]) @ coef
+        offset = -(mu / s + pca_model.mean_) @ projection
+        bias = offset @ coef + intercept
+
+        proba_kind = None
+        if isinstance(model, LogisticRegression):
+            multinomial = (
+                len(model.classes_) > 2
+                and getattr(model, "multi_class", "auto") != "ovr"
+                and model.solver != "liblinear"
+            )
+            proba_kind = "softmax" if multinomial else "ovr"
+
+        return cls(
+            feature_names=feature_names,
+            weights=weights.astype(dtype),
+            bias=bias.astype(dtype),
+            model_classes=model.classes_,
+            labels=target_label_encoder.classes_,
+            proba_kind=proba_kind
+        )
+
+    def _to_matrix(self, X) -> np.ndarray:
+        if isinstance(X, pd.DataFrame):
+            # Column selection is the slowest part of a one-row call, skip it when already ordered.
+            if X.columns.tolist() != self.feature_names:
+                X = X[self.feature_names]
+            X = X.to_numpy()
+        return np.asarray(X, dtype=self.weights.dtype)
+
+    def check_parity(self, input_df: pd.DataFrame, reference_predictions: np.ndarray) -> float:
+        """
+        Compares fused predictions with the unfused pipeline output.
+
+        Args:
+            input_df (pd.DataFrame): Feature rows.
+            reference_predictions (np.ndarray): Output of the unfused `PredictPipeline.predict`.
+
+        Returns:
+            float: Fraction of rows where both paths agree.
+        """
+        try:
+            fused_predictions = self.predict(input_df)
+            agreement = float(np.mean(fused_predictions == np.asarray(reference_predictions)))
+            logging.info(f"Fused predictor parity on {len(input_df)} rows: {agreement:.4f}")
+
+            return agreement
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def save_npz(self, file_path: str, **components: np.ndarray) -> None:
+        """
+        Writes the predictor as a numpy-only .npz that NumpyLinearPredictor.load reads.
+
+        Args:
+            file_path (str): Output path.
+            **components (np.ndarray): Extra arrays stored alongside, e.g. the unfused stage parameters.
+        """
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        # np.savez appends .npz to names without it, so the temp name keeps the suffix.
+        tmp_path = f"{file_path}.{os.getpid()}.tmp.npz"
+        np.savez(
+            tmp_path,
+            feature_names=np.array(self.feature_names, dtype=str),
+            weights=self.weights,
+            bias=self.bias,
+            model_classes=self.model_classes,
+            labels=self.labels.astype(str),
+            proba_kind=np.array(self.proba_kind or ""),
+            **components
+        )
+        os.replace(tmp_path, file_path)
+
+
+def export_numpy_model(preprocessor_path: str, pca_path: str, model_path: str,
+                       label_encoder_path: str, output_path: str, dtype=np.float64) -> Optional[str]:
+    """
+    Exports the trained artifacts as a numpy-only serving model.
+
+    Besides the fused weights, the file keeps the scaler means and scales,
+    PCA mean and components, model coefficients and class names, so the
+    export is self-describing. When the model can't be fused (e.g. KNN or an
+    RBF SVC), any previous export is removed, so serving falls back to the
+    full pipeline instead of using a stale model. The fused weights are
+    stored in `dtype`, which serving then scores in.
+
+    Returns:
+        str: `output_path`, or None when the model can't be exported.
+    """
+    try:
+        preprocessor = load_object(preprocessor_path)
+        pca_model = load_object(pca_path)
+        model = load_object(model_path)
+        target_label_encoder = load_object(label_encoder_path)
+
+        try:
+            fused = FusedLinearPredictor.from_artifacts(
+                preprocessor, pca_model, model, target_label_encoder, dtype=dtype
+            )
+        except ValueError as e:
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            logging.info(f"Numpy serving export skipped, serving will use the full pipeline: {e}")
+            return None
+
+        _, scaler = _extract_scaler(preprocessor)
+        fused.save_npz(
+            output_path,
+            scaler_mean=scaler.mean_,
+            scaler_scale=scaler.scale_,
+            pca_mean=pca_model.mean_,
+            pca_components=pca_model.components_,
+            coef=model.coef_,
+            intercept=np.asarray(model.intercept_)
+        )
+        logging.info(f"Numpy serving model exported to {output_path}")
+
+        return output_path
+
+    except Exception as e:
+        raise CustomException(e, sys)
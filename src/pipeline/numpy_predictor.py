@@ -0,0 +1,224 @@
+import math
+import sys
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.exception import CustomException
+
+# Only numpy is imported here, so a worker serving an exported model starts
+# without pandas or scikit-learn.
+
+# Input columns in the order CustomData.get_data_as_data_frame produces them.
+FEATURE_COLUMNS = [
+    "tempo",
+    "dynamics_range",
+    "vocal_presence",
+    "percussion_strength",
+    "string_instrument_detection",
+    "electronic_element_presence",
+    "rhythm_complexity",
+    "drums_influence",
+    "distorted_guitar",
+    "metal_frequencies",
+    "ambient_sound_influence",
+    "instrumental_overlaps"
+]
+
+
+def _to_float(value) -> float:
+    if value is None:
+        return math.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def check_finite(X: np.ndarray, feature_columns: List[str] = FEATURE_COLUMNS, first_row: int = 0) -> None:
+    """
+    Raises ValueError naming the first column of X with missing, non-numeric or infinite values.
+
+    Args:
+        X (np.ndarray): Float matrix, non-numeric values already turned into NaN.
+        feature_columns (List[str]): Column names of X.
+        first_row (int): Row number of X's first row, for errors in a larger file.
+    """
+    invalid = ~np.isfinite(X)
+    if not invalid.any():
+        return
+    j = int(np.flatnonzero(invalid.any(axis=0))[0])
+    invalid_rows = first_row + np.flatnonzero(invalid[:, j])
+    raise ValueError(
+        f"Column '{feature_columns[j]}' has missing or non-numeric values at rows: {invalid_rows[:10].tolist()}"
+    )
+
+
+def parse_batch(payload, max_rows: int = 10000, feature_columns: List[str] = FEATURE_COLUMNS) -> np.ndarray:
+    """
+    Validates a JSON batch of feature rows and returns it as a float64 matrix.
+
+    Accepts either row form, a list of objects keyed by feature name, or
+    columnar form, an object mapping each feature name to a list of values.
+    Numeric strings are accepted, like pd.to_numeric would.
+
+    Args:
+        payload: Decoded JSON body.
+        max_rows (int): Largest accepted batch.
+        feature_columns (List[str]): Expected columns, in output order.
+
+    Returns:
+        np.ndarray: Matrix of shape (n_rows, len(feature_columns)).
+
+    Raises:
+        ValueError: If the payload shape, columns or values are invalid.
+    """
+    if isinstance(payload, list):
+        if not all(isinstance(row, dict) for row in payload):
+            raise ValueError("Row form payload must be a list of objects.")
+        n_rows = len(payload)
+        present = list(dict.fromkeys(name for row in payload for name in row))
+        columns: Dict[str, list] = {
+            col: [row.get(col) for row in payload]
+            for col in feature_columns
+        }
+    elif isinstance(payload, dict):
+        if not all(isinstance(values, list) for values in payload.values()):
+            raise ValueError("Columnar payload must map every feature to a list of values.")
+        lengths = {len(values) for values in payload.values()}
+        if len(lengths) > 1:
+            raise ValueError("All columns in a columnar payload must have the same length.")
+        n_rows = lengths.pop() if lengths else 0
+        present = list(payload)
+        columns = payload
+    else:
+        raise ValueError("Payload must be a list of rows or an object of columns.")
+
+    if n_rows == 0:
+        raise ValueError("Payload contains no rows.")
+    if n_rows > max_rows:
+        raise ValueError(f"Batch of {n_rows} rows exceeds the limit of {max_rows}.")
+
+    missing_columns = [col for col in feature_columns if col not in present]
+    if missing_columns:
+        raise ValueError(f"Schema mismatch! Missing columns: {missing_columns}")
+
+    unexpected_columns = [col for col in present if col not in feature_columns]
+    if unexpected_columns:
+        raise ValueError(f"Schema mismatch! Unexpected columns: {unexpected_columns}")
+
+    X = np.empty((n_rows, len(feature_columns)), dtype=np.float64)
+    for j, col in enumerate(feature_columns):
+        values = columns[col]
+        if any(isinstance(value, bool) for value in values):
+            raise ValueError(f"Column '{col}' must be numeric, got booleans.")
+
+        X[:, j] = [_to_float(value) for value in values]
+
+    check_finite(X, feature_columns)
+    return X
+
+
+class NumpyLinearPredictor:
+    """
+    Scores feature rows with a fused affine map, x @ A + c, in plain numpy.
+
+    This is the serving half of FusedLinearPredictor: it is loaded from the
+    .npz file written by `fused_predictor.export_numpy_model` and needs no
+    pandas or scikit-learn.
+    """
+
+    def __init__(self, feature_names: List[str], weights: np.ndarray, bias: np.ndarray,
+                 model_classes: np.ndarray, labels: np.ndarray, proba_kind: Optional[str] = None):
+        """
+        Args:
+            feature_names (List[str]): Input columns, in the order the weights expect.
+            weights (np.ndarray): Fused weight matrix of shape (n_features, n_outputs).
+            bias (np.ndarray): Fused bias of shape (n_outputs,).
+            model_classes (np.ndarray): Encoded classes known to the model.
+            labels (np.ndarray): Original labels, indexed by encoded class.
+            proba_kind (str): 'softmax', 'ovr' or None when probabilities aren't supported.
+        """
+        self.feature_names = list(feature_names)
+        self.weights = np.ascontiguousarray(weights)
+        self.bias = np.ascontiguousarray(bias)
+        self.model_classes = np.asarray(model_classes)
+        self.labels = np.asarray(labels)
+        self.proba_kind = proba_kind
+
+    @classmethod
+    def load(cls, file_path: str) -> "NumpyLinearPredictor":
+        """
+        Loads a predictor exported by `fused_predictor.export_numpy_model`.
+        """
+        try:
+            with np.load(file_path, allow_pickle=False) as data:
+                proba_kind = str(data["proba_kind"])
+                return cls(
+                    feature_names=data["feature_names"].tolist(),
+                    weights=data["weights"],
+                    bias=data["bias"],
+                    model_classes=data["model_classes"],
+                    labels=data["labels"],
+                    proba_kind=proba_kind or None
+                )
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    @property
+    def genres(self) -> np.ndarray:
+        """
+        Genre names in the column order of `predict_proba`.
+        """
+        return self.labels[self.model_classes]
+
+    def _to_matrix(self, X) -> np.ndarray:
+        return np.asarray(X, dtype=self.weights.dtype)
+
+    def decision_function(self, X) -> np.ndarray:
+        X = self._to_matrix(X)
+        # A NaN row would otherwise still get a class from argmax, where the
+        # scikit-learn pipeline raises.
+        check_finite(X, self.feature_names)
+        return X @ self.weights + self.bias
+
+    def predict_encoded(self, X) -> np.ndarray:
+        scores = self.decision_function(X)
+        if scores.shape[1] == 1:
+            indices = (scores[:, 0] > 0).astype(int)
+        else:
+            indices = scores.argmax(axis=1)
+        return self.model_classes[indices]
+
+    def predict(self, X) -> np.ndarray:
+        """
+        Predicts genre labels for rows in `feature_names` order.
+        """
+        try:
+            return self.labels[self.predict_encoded(X)]
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def predict_proba(self, X) -> np.ndarray:
+        """
+        Class probabilities in `model_classes` order, matching LogisticRegression.predict_proba.
+        """
+        try:
+            if self.proba_kind is None:
+                raise ValueError("Fused model does not provide probabilities.")
+
+            scores = self.decision_function(X)
+            if self.proba_kind == "softmax":
+                scores = scores - scores.max(axis=1, keepdims=True)
+                exp = np.exp(scores)
+                return exp / exp.sum(axis=1, keepdims=True)
+
+            proba = 1.0 / (1.0 + np.exp(-scores))
+            if proba.shape[1] == 1:
+                return np.hstack([1 - proba, proba])
+            return proba / proba.sum(axis=1, keepdims=True)
+
+        except Exception as e:
+            raise CustomException(e, sys)
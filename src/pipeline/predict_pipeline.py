@@ -1,11 +1,17 @@
 import os
 import sys
+from functools import partial
+from typing import Tuple
 
+import numpy as np
 import pandas as pd
 
-from src.utils import load_object
 from src.exception import CustomException
 from src.logger import logging
+from src.pipeline.artifact_registry import get_artifact_registry
+from src.pipeline.fused_predictor import FusedLinearPredictor
+from src.pipeline.numpy_predictor import FEATURE_COLUMNS
+from src.utils import precision_dtype
 
 from dataclasses import dataclass
 
@@ -15,35 +21,264 @@ class PredictPipelineConfig:
     target_label_encoder_obj_path = os.path.join("artifacts", "label_encoder.pkl")
     pca_obj_path = os.path.join("artifacts", "pca_model.pkl")
     model_obj_path = os.path.join("artifacts", "tuned_model.pkl")
+    cascade_obj_path = os.path.join("artifacts", "cascade_model.pkl")
+
+def _build_fused_predictor(bundle, dtype=np.float64):
+    try:
+        fused = FusedLinearPredictor.from_artifacts(
+            preprocessor=bundle["preprocessor"],
+            pca_model=bundle["pca_model"],
+            model=bundle["model"],
+            target_label_encoder=bundle["target_label_encoder"],
+            dtype=dtype
+        )
+        logging.info("Fused linear predictor compiled from artifacts.")
+        return fused
+
+    except ValueError as e:
+        logging.info(f"Fused inference unavailable, using full pipeline: {e}")
+        return None
+
+
+def _build_cascade_first_stage(bundle, dtype=np.float64):
+    # The cascade's first stage is linear, so it always runs fused.
+    return FusedLinearPredictor.from_artifacts(
+        preprocessor=bundle["preprocessor"],
+        pca_model=bundle["pca_model"],
+        model=bundle["cascade_model"].first_stage_,
+        target_label_encoder=bundle["target_label_encoder"],
+        dtype=dtype
+    )
+
 
 class PredictPipeline:
-    def __init__(self):
+    def __init__(self, fused: bool = False, precision: str = "float64", cascade: bool = False):
+        """
+        Args:
+            fused (bool): Use the single-matmul fused predictor when the model is linear.
+            cascade (bool): Serve the CascadeClassifier saved by training instead of the
+                tuned model. Rows its fused linear first stage is confident about are
+                answered directly; the rest go through the scaler, PCA and the heavy model.
+            precision (str): 'float64' or 'float32'. Input rows are cast to it before
+                scaling; artifacts trained in float32 then stay in float32 through PCA
+                and the model. See `check_precision_agreement`.
+        """
         self.predict_pipeline_config = PredictPipelineConfig()
+        self.fused = fused
+        self.precision = precision
+        self.dtype = precision_dtype(precision)
+        self.cascade = cascade
+        artifact_paths = {
+            "preprocessor": self.predict_pipeline_config.preprocessor_obj_path,
+            "target_label_encoder": self.predict_pipeline_config.target_label_encoder_obj_path,
+            "pca_model": self.predict_pipeline_config.pca_obj_path,
+            "model": self.predict_pipeline_config.model_obj_path
+        }
+        if cascade:
+            artifact_paths["cascade_model"] = self.predict_pipeline_config.cascade_obj_path
+        self.registry = get_artifact_registry(artifact_paths)
+
+    def warm_up(self):
+        """
+        Loads the inference artifacts once so the first request doesn't pay for it.
+        """
+        self.registry.warm_up()
+
+    def get_fused_predictor(self, bundle=None):
+        """
+        Returns the fused predictor for the given (default: current) artifacts,
+        or None if the model can't be fused.
+        """
+        bundle = bundle or self.registry.get()
+        return bundle.get_derived(f"fused_{self.precision}", partial(_build_fused_predictor, dtype=self.dtype))
 
     def predict(self, input_df: pd.DataFrame):
         try:
-            logging.info("Started loading objects to predict genre.")
-            preprocessor = load_object(self.predict_pipeline_config.preprocessor_obj_path)
-            target_label_encoder = load_object(self.predict_pipeline_config.target_label_encoder_obj_path)
-            pca_model = load_object(self.predict_pipeline_config.pca_obj_path)
-            model = load_object(self.predict_pipeline_config.model_obj_path)
-            logging.info("All objects loaded successfully.")
+            bundle = self.registry.get()
+            if self.cascade:
+                return self._predict_cascade(bundle, input_df)
+
+            if self.fused:
+                fused_predictor = self.get_fused_predictor(bundle)
+                if fused_predictor is not None:
+                    genre = fused_predictor.predict(input_df)
+                    logging.info(f"Predict Music Genre is: {genre}")
+                    return genre
+
+            return self._predict_unfused(bundle, input_df)
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def predict_proba(self, input_df: pd.DataFrame):
+        """
+        Predicts class probabilities for every row.
+
+        Args:
+            input_df (pd.DataFrame): Feature rows.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Genre names and a (n_rows, n_genres) probability matrix.
+        """
+        try:
+            bundle = self.registry.get()
+            target_label_encoder = bundle["target_label_encoder"]
+
+            if self.cascade:
+                proba, _ = self._run_cascade(bundle, input_df, proba=True)
+                return target_label_encoder.inverse_transform(bundle["cascade_model"].classes_), proba
 
-            logging.info("Applying same processing as training.")
-            X_scaled = preprocessor.transform(input_df)
-            X_pca = pca_model.transform(X_scaled)
-            logging.info("Processing is done.")
+            if self.fused:
+                fused_predictor = self.get_fused_predictor(bundle)
+                if fused_predictor is not None and fused_predictor.proba_kind is not None:
+                    genres = fused_predictor.labels[fused_predictor.model_classes]
+                    return genres, fused_predictor.predict_proba(input_df)
 
-            logging.info("Predicting Music Genre.")
-            pred = model.predict(X_pca)
-            genre = target_label_encoder.inverse_transform(pred)
-            logging.info(f"Predict Music Genre is: {genre}")
+            model = bundle["model"]
+            if not hasattr(model, "predict_proba"):
+                raise ValueError(f"Model {model.__class__.__name__} does not provide probabilities.")
 
-            return genre
+            X_scaled = bundle["preprocessor"].transform(self._cast(input_df))
+            X_pca = bundle["pca_model"].transform(X_scaled)
+            genres = target_label_encoder.inverse_transform(model.classes_)
+
+            return genres, model.predict_proba(X_pca)
 
         except Exception as e:
             raise CustomException(e, sys)
-        
+
+    def check_fused_parity(self, input_df: pd.DataFrame) -> float:
+        """
+        Runs both the fused and the unfused path and returns their agreement rate.
+
+        Args:
+            input_df (pd.DataFrame): Feature rows to compare on.
+
+        Returns:
+            float: Fraction of rows with identical predictions.
+        """
+        try:
+            bundle = self.registry.get()
+            fused_predictor = self.get_fused_predictor(bundle)
+            if fused_predictor is None:
+                raise ValueError("Current model can't be fused.")
+
+            return fused_predictor.check_parity(input_df, self._predict_unfused(bundle, input_df))
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def check_precision_agreement(self, input_df: pd.DataFrame) -> float:
+        """
+        Compares predictions in this pipeline's precision with a float64 run of the unfused pipeline.
+
+        Args:
+            input_df (pd.DataFrame): Feature rows to compare on.
+
+        Returns:
+            float: Fraction of rows with identical predictions.
+        """
+        try:
+            bundle = self.registry.get()
+            reference = self._predict_unfused(bundle, input_df, dtype=np.float64)
+            agreement = float(np.mean(self.predict(input_df) == reference))
+            logging.info(f"{self.precision} predictions agree with float64 on {len(input_df)} rows: {agreement:.4f}")
+
+            return agreement
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def check_cascade_parity(self, input_df: pd.DataFrame) -> Tuple[float, float]:
+        """
+        Compares cascade serving with the saved CascadeClassifier run on the scaler and PCA output.
+
+        Args:
+            input_df (pd.DataFrame): Feature rows to compare on.
+
+        Returns:
+            Tuple[float, float]: Fraction of rows with identical predictions, and
+            with all probabilities within 1e-6.
+        """
+        try:
+            if not self.cascade:
+                raise ValueError("This pipeline doesn't serve the cascade.")
+            bundle = self.registry.get()
+            cascade = bundle["cascade_model"]
+            X_pca = bundle["pca_model"].transform(bundle["preprocessor"].transform(self._cast(input_df)))
+
+            encoded, _ = self._run_cascade(bundle, input_df)
+            proba, _ = self._run_cascade(bundle, input_df, proba=True)
+            prediction_parity = float(np.mean(encoded == cascade.predict(X_pca)))
+            proba_parity = float(np.mean(np.all(np.abs(proba - cascade.predict_proba(X_pca)) <= 1e-6, axis=1)))
+            logging.info(
+                f"Cascade serving parity on {len(input_df)} rows: predictions {prediction_parity:.4f}, "
+                f"probabilities {proba_parity:.4f}"
+            )
+
+            return prediction_parity, proba_parity
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def _run_cascade(self, bundle, input_df: pd.DataFrame, proba: bool = False):
+        """
+        Runs the fused first stage on every row, and the scaler, PCA and heavy
+        stage only on the escalated ones.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Encoded predictions, or with `proba`
+            a (n_rows, n_classes) probability matrix, and the escalation mask.
+        """
+        cascade = bundle["cascade_model"]
+        first_stage = bundle.get_derived(
+            f"cascade_first_stage_{self.precision}", partial(_build_cascade_first_stage, dtype=self.dtype)
+        )
+
+        first_proba = first_stage.predict_proba(input_df)
+        escalated = first_proba.max(axis=1) < cascade.threshold
+        result = first_proba if proba else first_stage.model_classes[first_proba.argmax(axis=1)]
+
+        if escalated.any():
+            X_scaled = bundle["preprocessor"].transform(self._cast(input_df[escalated]))
+            X_pca = bundle["pca_model"].transform(X_scaled)
+            result[escalated] = cascade.heavy_.predict_proba(X_pca) if proba else cascade.heavy_.predict(X_pca)
+
+        return result, escalated
+
+    def _predict_cascade(self, bundle, input_df: pd.DataFrame):
+        encoded, escalated = self._run_cascade(bundle, input_df)
+        genre = bundle["target_label_encoder"].inverse_transform(encoded)
+        logging.info(f"Cascade escalated {int(escalated.sum())} of {len(input_df)} rows to {bundle['cascade_model'].heavy_.__class__.__name__}.")
+
+        return genre
+
+    def _cast(self, input_df: pd.DataFrame, dtype=None) -> pd.DataFrame:
+        dtype = self.dtype if dtype is None else np.dtype(dtype)
+        if (input_df.dtypes == dtype).all():
+            return input_df
+        return input_df.astype(dtype)
+
+    def _predict_unfused(self, bundle, input_df: pd.DataFrame, dtype=None):
+        logging.info("Fetching loaded objects to predict genre.")
+        preprocessor = bundle["preprocessor"]
+        target_label_encoder = bundle["target_label_encoder"]
+        pca_model = bundle["pca_model"]
+        model = bundle["model"]
+
+        logging.info("Applying same processing as training.")
+        X_scaled = preprocessor.transform(self._cast(input_df, dtype))
+        X_pca = pca_model.transform(X_scaled)
+        logging.info("Processing is done.")
+
+        logging.info("Predicting Music Genre.")
+        pred = model.predict(X_pca)
+        genre = target_label_encoder.inverse_transform(pred)
+        logging.info(f"Predict Music Genre is: {genre}")
+
+        return genre
+
+
 class CustomData:
     def __init__(self,
                  tempo: float,
@@ -73,22 +308,11 @@ class CustomData:
 
     def get_data_as_data_frame(self):
         try:
-            custom_data_input_dict = {
-                "tempo": [self.tempo],
-                "dynamics_range": [self.dynamics_range],
-                "vocal_presence": [self.vocal_presence],
-                "percussion_strength": [self.percussion_strength],
-                "string_instrument_detection": [self.string_instrument_detection],
-                "electronic_element_presence": [self.electronic_element_presence],
-                "rhythm_complexity": [self.rhythm_complexity],
-                "drums_influence": [self.drums_influence],
-                "distorted_guitar": [self.distorted_guitar],
-                "metal_frequencies": [self.metal_frequencies],
-                "ambient_sound_influence": [self.ambient_sound_influence],
-                "instrumental_overlaps": [self.instrumental_overlaps]
-            }
+            # Attributes are named after the features, so the frame follows FEATURE_COLUMNS
+            custom_data_input_dict = {col: [getattr(self, col)] for col in FEATURE_COLUMNS}
 
             return pd.DataFrame(custom_data_input_dict)
         
         except Exception as e:
             raise CustomException(e, sys)
+
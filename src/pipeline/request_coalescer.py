@@ -0,0 +1,155 @@
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+from src.exception import CustomException
+from src.logger import logging
+
+# A DataFrame or a feature matrix; pandas isn't imported so numpy-only serving stays light.
+Rows = object
+
+
+@dataclass
+class RequestCoalescerConfig:
+    # How long the first request of a batch may wait for others to join it.
+    max_wait_ms: float = 5.0
+    # Upper bound on rows run through the model in one call.
+    max_batch_size: int = 64
+    # How long a caller waits for its result before giving up.
+    result_timeout_s: float = 30.0
+
+
+class RequestCoalescer:
+    """
+    Collects concurrent small prediction requests into one batch.
+
+    Callers submit their rows and block on a future. A single background
+    thread takes the first waiting request, keeps collecting for at most
+    `max_wait_ms` or until `max_batch_size` rows are queued, runs one
+    vectorized prediction and hands each caller its own slice of the result.
+    A request that would take a batch past `max_batch_size` starts the next
+    one instead; a single request larger than that runs alone.
+    """
+
+    def __init__(self, predict_fn: Callable[[Rows], np.ndarray], config: RequestCoalescerConfig = None):
+        """
+        Args:
+            predict_fn (Callable): Batch prediction function, e.g. PredictPipeline.predict.
+            config (RequestCoalescerConfig): Batching limits.
+        """
+        self.predict_fn = predict_fn
+        self.config = config or RequestCoalescerConfig()
+        self._queue: "queue.Queue[Tuple[Rows, Future]]" = queue.Queue()
+        # Request held back from a full batch; only the worker thread touches it.
+        self._carry_over = None
+        self._worker = None
+        self._worker_pid = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_worker(self) -> None:
+        # Threads don't survive a fork, so start one lazily in every worker process.
+        if self._worker is not None and self._worker_pid == os.getpid() and self._worker.is_alive():
+            return
+
+        with self._start_lock:
+            if self._worker is not None and self._worker_pid == os.getpid() and self._worker.is_alive():
+                return
+            if self._worker_pid != os.getpid():
+                # Requests queued in the parent process belong to the parent.
+                self._queue = queue.Queue()
+                self._carry_over = None
+            self._worker = threading.Thread(target=self._run, name="request-coalescer", daemon=True)
+            self._worker_pid = os.getpid()
+            self._worker.start()
+
+    def _collect_batch(self) -> List[Tuple[Rows, Future]]:
+        if self._carry_over is not None:
+            batch, self._carry_over = [self._carry_over], None
+        else:
+            batch = [self._queue.get()]
+        n_rows = len(batch[0][0])
+        deadline = time.monotonic() + self.config.max_wait_ms / 1000.0
+
+        while n_rows < self.config.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if n_rows + len(item[0]) > self.config.max_batch_size:
+                self._carry_over = item
+                break
+            batch.append(item)
+            n_rows += len(item[0])
+
+        return batch
+
+    def _run_batch(self, batch: List[Tuple[Rows, Future]]) -> None:
+        try:
+            first = batch[0][0]
+            if hasattr(first, "columns"):
+                columns = first.columns
+                # Stacking the raw arrays is much cheaper than pd.concat on many one-row frames.
+                X = np.vstack([frame[columns].to_numpy() for frame, _ in batch])
+                predictions = self.predict_fn(type(first)(X, columns=columns))
+            else:
+                # Plain feature matrices, e.g. from numpy-only serving.
+                X = np.vstack([rows for rows, _ in batch])
+                predictions = self.predict_fn(X)
+
+            start = 0
+            for frame, future in batch:
+                end = start + len(frame)
+                future.set_result(predictions[start:end])
+                start = end
+
+            logging.info(f"Coalesced {len(batch)} requests into one batch of {len(X)} rows.")
+
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+    def _run(self) -> None:
+        while True:
+            self._run_batch(self._collect_batch())
+
+    def submit(self, input_df: Rows) -> Future:
+        """
+        Queues rows for the next batch.
+
+        Args:
+            input_df (pd.DataFrame or np.ndarray): Feature rows of one request.
+
+        Returns:
+            Future: Resolves to the predictions for these rows.
+        """
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((input_df, future))
+        return future
+
+    def predict(self, input_df: Rows) -> np.ndarray:
+        """
+        Predicts through the shared batch and waits for the result.
+
+        Args:
+            input_df (pd.DataFrame or np.ndarray): Feature rows of one request.
+
+        Returns:
+            np.ndarray: Predictions for `input_df`, in order.
+        """
+        try:
+            return self.submit(input_df).result(timeout=self.config.result_timeout_s)
+
+        except Exception as e:
+            raise CustomException(e, sys)
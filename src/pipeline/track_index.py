@@ -0,0 +1,258 @@
+import os
+import sys
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+from sklearn.neighbors import KDTree
+
+from src.exception import CustomException
+from src.logger import logging
+from src.pipeline.fused_predictor import _extract_scaler
+from src.utils import save_object, load_object
+
+INDEX_METHODS = ("auto", "kd_tree", "ivf")
+
+
+@dataclass
+class TrackIndexConfig:
+    track_index_path: str = os.path.join("artifacts", "track_index.pkl")
+
+
+def _kmeans(X: np.ndarray, n_clusters: int, n_iter: int, rng: np.random.RandomState) -> np.ndarray:
+    """
+    Lloyd's k-means on X, returning the centroids.
+    """
+    centroids = X[rng.choice(len(X), n_clusters, replace=False)].copy()
+    for _ in range(n_iter):
+        assignments = _nearest_centroid(X, centroids)
+        counts = np.bincount(assignments, minlength=n_clusters)
+        sums = np.column_stack([
+            np.bincount(assignments, weights=X[:, j], minlength=n_clusters) for j in range(X.shape[1])
+        ])
+        filled = counts > 0
+        centroids[filled] = sums[filled] / counts[filled, None]
+    return centroids
+
+
+def _nearest_centroid(X: np.ndarray, centroids: np.ndarray, chunk_size: int = 1024) -> np.ndarray:
+    # ||x - c||^2 = ||x||^2 - 2 x.c + ||c||^2, and ||x||^2 doesn't change the argmin.
+    # float32 halves the cost; it can only flip the cell of points on a boundary.
+    # Small chunks keep the (chunk, n_centroids) distance block in cache.
+    centroid_norms = (centroids ** 2).sum(axis=1).astype(np.float32)
+    scaled_centroids = np.ascontiguousarray((-2 * centroids).T, dtype=np.float32)
+    assignments = np.empty(len(X), dtype=np.intp)
+    for start in range(0, len(X), chunk_size):
+        distances = X[start:start + chunk_size].astype(np.float32) @ scaled_centroids
+        distances += centroid_norms
+        assignments[start:start + chunk_size] = distances.argmin(axis=1)
+    return assignments
+
+
+class TrackIndex:
+    """
+    Nearest-neighbor index of the catalog tracks in PCA space.
+
+    Queries are raw feature rows; they are scaled and projected with the
+    training StandardScaler and PCA folded into one affine map, as in
+    FusedLinearPredictor, so a lookup needs no pandas or sklearn transforms.
+
+    Two indexes over the same projected catalog:
+
+    - kd_tree: exact search with a KD-tree. Fast for small and mid-sized
+      catalogs, but per-query cost grows with the catalog in 10+ dimensions.
+    - ivf: approximate inverted-file index. The catalog is clustered with
+      k-means into `n_lists` cells stored contiguously; a query scans only the
+      `n_probe` cells with the closest centroids, so its cost stays near
+      n_probe / n_lists of the catalog.
+    """
+
+    def __init__(self, feature_names, feature_mean: np.ndarray, feature_scale: np.ndarray,
+                 pca_mean: np.ndarray, pca_components: np.ndarray, vectors: np.ndarray,
+                 track_ids: np.ndarray, labels: np.ndarray, leaf_size: int = 40,
+                 n_lists: Optional[int] = None, n_probe: int = 8, random_state: int = 42):
+        """
+        Args:
+            feature_names (List[str]): Input columns, in the order queries are given.
+            feature_mean (np.ndarray): StandardScaler means.
+            feature_scale (np.ndarray): StandardScaler scales.
+            pca_mean (np.ndarray): PCA mean in scaled space.
+            pca_components (np.ndarray): PCA components, shape (n_components, n_features).
+            vectors (np.ndarray): Catalog tracks in PCA space.
+            track_ids (np.ndarray): Catalog identifier of each track.
+            labels (np.ndarray): Genre of each track.
+            leaf_size (int): KD-tree leaf size.
+            n_lists (int): IVF cells; None builds no IVF index.
+            n_probe (int): IVF cells scanned per query.
+            random_state (int): Seed for the k-means sample and initialisation.
+        """
+        self.feature_names = list(feature_names)
+        # Folded scaler + PCA: p = x @ projection + offset
+        self.projection = np.ascontiguousarray((pca_components / feature_scale).T)
+        self.offset = -(feature_mean / feature_scale + pca_mean) @ pca_components.T
+        self.track_ids = np.asarray(track_ids)
+        self.labels = np.asarray(labels)
+        self.tree = KDTree(vectors, leaf_size=leaf_size)
+
+        self.n_probe = n_probe
+        self.centroids = None
+        if n_lists is not None:
+            self._build_ivf(np.asarray(vectors, dtype=np.float64), n_lists, random_state)
+
+    @classmethod
+    def from_artifacts(cls, preprocessor, pca_model, X, labels, track_ids=None, **kwargs) -> "TrackIndex":
+        """
+        Builds the index of the catalog X from the fitted training artifacts.
+
+        Args:
+            preprocessor: Fitted ColumnTransformer from DataTransformation.
+            pca_model: Fitted PCA.
+            X (pd.DataFrame or np.ndarray): Raw catalog features; DataFrames are
+                reordered to the preprocessor's columns.
+            labels (array-like): Genre of each row.
+            track_ids (array-like): Identifier of each row; defaults to its position.
+            **kwargs: Index options, see `__init__`.
+        """
+        feature_names, scaler = _extract_scaler(preprocessor)
+        n_features = len(feature_names)
+        feature_mean = scaler.mean_ if scaler.mean_ is not None else np.zeros(n_features)
+        feature_scale = scaler.scale_ if scaler.scale_ is not None else np.ones(n_features)
+
+        if hasattr(X, "columns"):
+            X = X[feature_names].to_numpy()
+        X = np.asarray(X, dtype=np.float64)
+        pca_mean = np.asarray(pca_model.mean_, dtype=np.float64)
+        pca_components = np.asarray(pca_model.components_, dtype=np.float64)
+        vectors = ((X - feature_mean) / feature_scale - pca_mean) @ pca_components.T
+
+        return cls(
+            feature_names=feature_names,
+            feature_mean=feature_mean,
+            feature_scale=feature_scale,
+            pca_mean=pca_mean,
+            pca_components=pca_components,
+            vectors=vectors,
+            track_ids=np.arange(len(X)) if track_ids is None else track_ids,
+            labels=labels,
+            **kwargs
+        )
+
+    def _build_ivf(self, vectors: np.ndarray, n_lists: int, random_state: int):
+        rng = np.random.RandomState(random_state)
+        n_lists = min(n_lists, len(vectors))
+        # The centroids only need to split the space evenly, a sample of ~64 tracks per cell does.
+        sample_size = 64 * n_lists
+        sample = vectors if len(vectors) <= sample_size else vectors[rng.choice(len(vectors), sample_size, replace=False)]
+        self.centroids = _kmeans(sample, n_lists, n_iter=10, rng=rng)
+
+        # Cells are stored contiguously: rows of cell j are ivf_vectors[list_offsets[j]:list_offsets[j + 1]].
+        assignments = _nearest_centroid(vectors, self.centroids)
+        self.ivf_order = np.argsort(assignments, kind="stable")
+        self.ivf_vectors = np.ascontiguousarray(vectors[self.ivf_order])
+        self.ivf_norms = (self.ivf_vectors ** 2).sum(axis=1)
+        self.list_offsets = np.concatenate([[0], np.cumsum(np.bincount(assignments, minlength=n_lists))])
+
+    def __len__(self) -> int:
+        return len(self.track_ids)
+
+    def project(self, X) -> np.ndarray:
+        """
+        Maps raw feature rows, in `feature_names` order, to PCA space.
+        """
+        return np.asarray(X, dtype=np.float64) @ self.projection + self.offset
+
+    def _query_ivf(self, P: np.ndarray, k: int, n_probe: int) -> Tuple[np.ndarray, np.ndarray]:
+        distances = np.full((len(P), k), np.inf)
+        indices = np.full((len(P), k), -1, dtype=np.intp)
+        n_probe = min(n_probe, len(self.centroids))
+
+        for i, p in enumerate(P):
+            cells = np.argpartition(((self.centroids - p) ** 2).sum(axis=1), n_probe - 1)[:n_probe]
+            positions = np.concatenate([
+                np.arange(self.list_offsets[cell], self.list_offsets[cell + 1]) for cell in cells
+            ])
+            squared = self.ivf_norms[positions] - 2 * self.ivf_vectors[positions] @ p + p @ p
+            n_found = min(k, len(positions))
+            nearest = np.argpartition(squared, n_found - 1)[:n_found] if n_found < len(positions) else np.arange(n_found)
+            nearest = nearest[np.argsort(squared[nearest])]
+
+            distances[i, :n_found] = np.sqrt(np.maximum(squared[nearest], 0.0))
+            indices[i, :n_found] = self.ivf_order[positions[nearest]]
+
+        return distances, indices
+
+    def query(self, X, k: int = 10, method: str = "auto", n_probe: Optional[int] = None):
+        """
+        Finds the k catalog tracks closest to each raw feature row.
+
+        Args:
+            X (np.ndarray): Raw feature rows in `feature_names` order.
+            k (int): Neighbors per row.
+            method (str): One of INDEX_METHODS; "auto" uses the IVF index when one was built.
+            n_probe (int): IVF cells to scan; defaults to the value given at build time.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Euclidean distances in PCA space and
+            catalog row positions, both of shape (n_rows, k), nearest first.
+            With the IVF index, rows whose probed cells hold fewer than k
+            tracks are padded with inf / -1.
+        """
+        try:
+            if method not in INDEX_METHODS:
+                raise ValueError(f"method must be one of {INDEX_METHODS}, got {method!r}")
+            if method == "auto":
+                method = "ivf" if self.centroids is not None else "kd_tree"
+            if method == "ivf" and self.centroids is None:
+                raise ValueError("This index was built without an IVF index.")
+
+            k = min(int(k), len(self))
+            P = self.project(X)
+            if method == "kd_tree":
+                return self.tree.query(P, k=k)
+            return self._query_ivf(P, k, n_probe or self.n_probe)
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def neighbors(self, X, k: int = 10, method: str = "auto"):
+        """
+        Like `query`, but returns per row a list of {"track", "genre", "distance"} dicts.
+        """
+        distances, indices = self.query(X, k=k, method=method)
+        return [
+            [
+                {"track": self.track_ids[j].item(), "genre": str(self.labels[j]), "distance": float(d)}
+                for d, j in zip(row_distances, row_indices) if j >= 0
+            ]
+            for row_distances, row_indices in zip(distances, indices)
+        ]
+
+
+def build_track_index(preprocessor_path: str, pca_path: str, X, labels, output_path: str,
+                      track_ids=None, ivf_min_tracks: int = 100_000) -> str:
+    """
+    Builds and saves the similarity index of the training catalog.
+
+    Catalogs of `ivf_min_tracks` or more tracks also get an IVF index with
+    about sqrt(n) cells, where exact KD-tree queries stop being sub-millisecond.
+
+    Returns:
+        str: `output_path`.
+    """
+    try:
+        n_lists = int(np.sqrt(len(X))) if len(X) >= ivf_min_tracks else None
+        index = TrackIndex.from_artifacts(
+            load_object(preprocessor_path), load_object(pca_path),
+            X, labels, track_ids=track_ids, n_lists=n_lists
+        )
+        save_object(file_path=output_path, obj=index)
+        logging.info(
+            f"Track index of {len(index)} tracks saved to {output_path}"
+            + (f" with {n_lists} IVF cells." if n_lists else ".")
+        )
+
+        return output_path
+
+    except Exception as e:
+        raise CustomException(e, sys)
@@ -1,5 +1,7 @@
 import os
 import sys
+import uuid
+from typing import Optional
 
 import pandas as pd
 import numpy as np
@@ -11,34 +13,72 @@ def save_object(file_path: str, obj: object):
     """
     Saves a Python object to a file using joblib.
 
+    The object is written to a temporary file in the same directory and
+    renamed over `file_path`, so readers see either the old or the new file,
+    never a partially written one.
+
     Args:
         file_path (str): Path to the file where the object will be saved.
         obj (object): The Python object to save.
     """
     try:
         dir_path = os.path.dirname(file_path)
-        os.makedirs(dir_path, exist_ok=True)
+        os.makedirs(dir_path or ".", exist_ok=True)
 
-        with open(file_path, 'wb') as file_obj:
-            joblib.dump(obj, file_obj)
+        tmp_path = os.path.join(dir_path, f".{os.path.basename(file_path)}.{os.getpid()}.{uuid.uuid4().hex}.tmp")
+        try:
+            with open(tmp_path, 'wb') as file_obj:
+                joblib.dump(obj, file_obj)
+                file_obj.flush()
+                os.fsync(file_obj.fileno())
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
 
     except Exception as e:
         raise CustomException(e, sys)
     
 
-def load_object(file_path:str):
+def load_object(file_path: str, mmap_mode: Optional[str] = None):
     """
     Loads a Python object from a file using joblib.
 
     Args:
         file_path (str): Path to the file from which the object will be loaded.
+        mmap_mode (str): e.g. 'r' to memory-map the numpy arrays inside the object
+            instead of reading them into memory. Processes mapping the same file
+            share its pages.
 
     Returns:
         object: The loaded Python object.
     """
     try:
+        if mmap_mode is not None:
+            # joblib can only memory-map when given the file name.
+            return joblib.load(file_path, mmap_mode=mmap_mode)
+
         with open(file_path, 'rb') as file_obj:
             return joblib.load(file_obj)
         
     except Exception as e:
-        raise CustomException(e, sys)
\ No newline at end of file
+        raise CustomException(e, sys)
+
+
+PRECISIONS = {"float64": np.float64, "float32": np.float32}
+
+
+def precision_dtype(precision: str) -> np.dtype:
+    """
+    Returns the numpy dtype of a precision mode.
+
+    Args:
+        precision (str): One of PRECISIONS.
+
+    Raises:
+        ValueError: If the precision is unknown.
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(f"precision must be one of {tuple(PRECISIONS)}, got {precision!r}")
+    return np.dtype(PRECISIONS[precision])
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.exception import CustomException
+from src.pipeline.batch_predict_pipeline import BatchPredictConfig, BatchPredictPipeline, PREDICTION_COLUMN
+from src.pipeline.numpy_predictor import FEATURE_COLUMNS
+
+
+def _tracks(n_rows: int) -> pd.DataFrame:
+    rng = np.random.RandomState(0)
+    return pd.DataFrame(rng.uniform(0, 100, size=(n_rows, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS)
+
+
+@pytest.mark.parametrize("fused", [True, False])
+def test_nan_row_fails_with_its_row_number(tmp_path, fused):
+    tracks = _tracks(6)
+    tracks.loc[3, "tempo"] = np.nan
+    input_path = tmp_path / "tracks.csv"
+    tracks.to_csv(input_path, index=False)
+
+    pipeline = BatchPredictPipeline(BatchPredictConfig(chunk_size=2, fused=fused))
+    with pytest.raises(CustomException, match=r"rows 2-3: Column 'tempo' has missing or non-numeric values at rows: \[3\]"):
+        pipeline.run(str(input_path), str(tmp_path / "predictions.csv"))
+
+
+@pytest.mark.parametrize("fused", [True, False])
+def test_valid_rows_are_scored_in_order(tmp_path, fused):
+    tracks = _tracks(5).assign(track_id=range(5))
+    input_path = tmp_path / "tracks.csv"
+    tracks.to_csv(input_path, index=False)
+    output_path = tmp_path / "predictions.csv"
+
+    config = BatchPredictConfig(chunk_size=2, fused=fused, keep_columns=["track_id"])
+    assert BatchPredictPipeline(config).run(str(input_path), str(output_path)) == 5
+
+    predictions = pd.read_csv(output_path)
+    assert predictions["track_id"].tolist() == list(range(5))
+    assert predictions[PREDICTION_COLUMN].notna().all()
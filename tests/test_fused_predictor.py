@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.exception import CustomException
+from src.pipeline.numpy_predictor import FEATURE_COLUMNS
+from src.pipeline.predict_pipeline import PredictPipeline
+
+
+def _tracks() -> pd.DataFrame:
+    rng = np.random.RandomState(0)
+    return pd.DataFrame(rng.uniform(0, 100, size=(50, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS)
+
+
+def test_fused_predictions_match_the_pipeline():
+    assert PredictPipeline(fused=True).check_fused_parity(_tracks()) == 1.0
+
+
+@pytest.mark.parametrize("value", [np.nan, np.inf])
+def test_fused_predictor_rejects_non_finite_rows(value):
+    fused_predictor = PredictPipeline(fused=True).get_fused_predictor()
+    tracks = _tracks()
+    tracks.loc[7, "tempo"] = value
+
+    with pytest.raises(CustomException, match=r"Column 'tempo' has missing or non-numeric values at rows: \[7\]"):
+        fused_predictor.predict(tracks)
+    with pytest.raises(CustomException, match="Column 'tempo'"):
+        fused_predictor.predict_proba(tracks)
@@ -0,0 +1,62 @@
+import os
+
+import numpy as np
+import pytest
+
+from main import EXPECTED_COLUMNS
+from src.components.data_cleaner import DataCleaner
+from src.components.data_ingestion import DataIngestion
+from src.components.data_transformation import DataTransformation
+from src.components.out_of_core_preprocessor import OutOfCorePreprocessor
+from src.components.pca_handler import PCAHandler
+
+RAW_DATA_PATH = os.path.join("data", "raw", "music_dataset_mod.csv")
+
+
+def _handlers(tmp_path, name):
+    # Artifacts go to tmp_path, so the committed ones are left alone.
+    transformer = DataTransformation()
+    transformer.data_transformation_config.preprocessor_obj_file_path = str(tmp_path / f"{name}_preprocessor.pkl")
+    pca_handler = PCAHandler(n_components=0.85)
+    pca_handler.pca_handler_config.pca_model_path = str(tmp_path / f"{name}_pca_model.pkl")
+    return transformer, pca_handler
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_out_of_core_chain_matches_in_memory_pipeline(tmp_path, dtype):
+    ingestion = DataIngestion(
+        raw_data_path=RAW_DATA_PATH,
+        processed_data_path=str(tmp_path / "processed.csv"),
+        binary_format="npy",
+        chunk_size=100_000,
+        expected_columns=EXPECTED_COLUMNS
+    )
+
+    # In-memory stages, as main.py runs them by default
+    cleaner = DataCleaner()
+    df = ingestion.load_data()
+    df = cleaner.handle_missing_values(cleaner.remove_duplicates(cleaner.standardize_column_names(df)), strategy='drop')
+    transformer, pca_handler = _handlers(tmp_path, "in_memory")
+    X_scaled = transformer.fit_transform(df.drop(columns=['genre']), as_frame=False, dtype=dtype)[0]
+    X_pca = pca_handler.fit_transform(X_scaled, as_frame=False, dtype=dtype)
+
+    # Streamed chain, in chunks that don't divide the row count
+    transformer_ooc, pca_handler_ooc = _handlers(tmp_path, "out_of_core")
+    df_ooc, X_scaled_ooc, X_pca_ooc = OutOfCorePreprocessor(ingestion, EXPECTED_COLUMNS, chunk_size=128).run(
+        transformer_ooc, pca_handler_ooc, dtype=dtype
+    )
+
+    assert df_ooc.shape == df.shape
+    np.testing.assert_array_equal(df_ooc.drop(columns=['genre']).to_numpy(), df.drop(columns=['genre']).to_numpy())
+    np.testing.assert_array_equal(df_ooc['genre'].astype(str).to_numpy(), df['genre'].astype(str).to_numpy())
+
+    rtol = 1e-6 if dtype == np.float64 else 1e-3
+    np.testing.assert_allclose(X_scaled_ooc, X_scaled, rtol=rtol, atol=rtol)
+    assert X_pca_ooc.shape == X_pca.shape
+    assert X_pca_ooc.dtype == X_pca.dtype
+    # Components are defined up to sign
+    signs = np.sign(np.sum(X_pca_ooc * X_pca, axis=0))
+    np.testing.assert_allclose(X_pca_ooc * signs, X_pca, rtol=rtol, atol=rtol)
+    np.testing.assert_allclose(
+        pca_handler_ooc.pca.explained_variance_ratio_, pca_handler.pca.explained_variance_ratio_, rtol=rtol
+    )
@@ -0,0 +1,191 @@
+from src.components.data_ingestion import DataIngestion
+from src.components.data_cleaner import DataCleaner
+from src.components.model_updater import ModelUpdater
+from src.components.stage_cache import StageCache
+from src.artifact_store import ArtifactStore
+from src.pipeline.fused_predictor import export_numpy_model
+from src.pipeline.track_index import TrackIndexConfig, build_track_index
+from src.logger import logging
+
+from main import EXPECTED_COLUMNS, main as full_retrain
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+ARTIFACTS_DIR = "artifacts"
+RAW_DATA_PATH = os.path.join("data", "raw", "music_dataset_mod.csv")
+PROCESSED_DATA_PATH = os.path.join("data", "processed", "processed_music_dataset.csv")
+
+
+def clean(df: pd.DataFrame) -> pd.DataFrame:
+    # Same cleaning as the training "clean" stage
+    cleaner = DataCleaner()
+    df = cleaner.standardize_column_names(df)
+    df = cleaner.remove_duplicates(df)
+    return cleaner.handle_missing_values(df, strategy='drop')
+
+
+def drop_catalog_rows(raw_batch: pd.DataFrame, X_catalog: pd.DataFrame, y_catalog) -> pd.DataFrame:
+    # Tracks already in the catalog would be counted twice by the running statistics.
+    # Rows are compared at the catalog's float32 precision, genre included.
+    batch = DataCleaner().standardize_column_names(raw_batch.copy())
+
+    def row_hashes(X, y):
+        rows = X[X_catalog.columns].astype(np.float32).assign(genre=np.asarray(y, dtype=str))
+        return pd.util.hash_pandas_object(rows, index=False).to_numpy()
+
+    known = np.isin(row_hashes(batch, batch['genre']), row_hashes(X_catalog, y_catalog))
+    if known.any():
+        logging.info(f"Dropped {int(known.sum())} batch rows already in the catalog.")
+    return raw_batch[~known]
+
+
+@contextmanager
+def appended_to_raw_data(raw_batch: pd.DataFrame):
+    # The raw dataset keeps every labelled track, so the next full retrain sees the batch too.
+    # The rows are removed again if the retrain or publish inside the block fails.
+    size = os.path.getsize(RAW_DATA_PATH)
+    raw_batch.to_csv(RAW_DATA_PATH, mode='a', header=False, index=False)
+    try:
+        yield
+    except BaseException:
+        os.truncate(RAW_DATA_PATH, size)
+        logging.error(f"Removed the {len(raw_batch)} appended rows from {RAW_DATA_PATH} again.")
+        raise
+    logging.info(f"Appended {len(raw_batch)} rows to {RAW_DATA_PATH}.")
+
+
+@contextmanager
+def swapped_in(staged_paths: Dict[str, str], staging_dir: str):
+    # Staged artifacts replace the live ones one rename each; the previous files are
+    # kept as hard links, so they are put back if the publish inside the block fails.
+    # Until then the manifest still lists the previous files and readers keep their bundle.
+    live_paths, backups, created = {}, {}, []
+    try:
+        for name, path in staged_paths.items():
+            if os.path.dirname(os.path.abspath(path)) != os.path.abspath(staging_dir):
+                live_paths[name] = path
+                continue
+            live_path = os.path.join(ARTIFACTS_DIR, os.path.basename(path))
+            if os.path.exists(live_path):
+                backup_path = os.path.join(staging_dir, f"{os.path.basename(path)}.previous")
+                try:
+                    os.link(live_path, backup_path)
+                except OSError:
+                    shutil.copy2(live_path, backup_path)
+                backups[live_path] = backup_path
+            else:
+                created.append(live_path)
+            os.replace(path, live_path)
+            live_paths[name] = live_path
+        yield live_paths
+    except BaseException:
+        for live_path, backup_path in backups.items():
+            os.replace(backup_path, live_path)
+        for live_path in created:
+            if os.path.exists(live_path):
+                os.remove(live_path)
+        logging.error(f"Restored the previous artifacts: {sorted(backups)}")
+        raise
+
+
+def load_catalog():
+    ingestion = DataIngestion(
+        raw_data_path=RAW_DATA_PATH,
+        processed_data_path=PROCESSED_DATA_PATH,
+        binary_format="npy",
+        chunk_size=100_000,
+        expected_columns=EXPECTED_COLUMNS
+    )
+    df = ingestion.load_data()
+    ingestion.validate_data(df, EXPECTED_COLUMNS)
+    if not ingestion.binary_cache_is_fresh():
+        ingestion.save_processed_data(df)
+
+    df = clean(df)
+    return df.drop(columns=['genre']), df['genre']
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Fold a CSV of newly labelled tracks into the trained artifacts, "
+                    "or retrain from scratch when the batch has drifted."
+    )
+    parser.add_argument("batch_path", help="CSV with the raw dataset columns, Genre included.")
+    parser.add_argument("--learning-rate", type=float, default=0.1, help="SGD step size of the classifier update.")
+    parser.add_argument("--epochs", type=int, default=5, help="SGD passes over the batch.")
+    parser.add_argument("--full-retrain", action="store_true", help="Skip the drift check and retrain from scratch.")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    raw_batch = pd.read_csv(args.batch_path)
+    DataIngestion.validate_data(raw_batch, EXPECTED_COLUMNS)
+    X_catalog, y_catalog = load_catalog()
+    raw_batch = drop_catalog_rows(raw_batch[EXPECTED_COLUMNS], X_catalog, y_catalog)
+    batch = clean(raw_batch.copy())
+    if batch.empty:
+        print("No new tracks in the batch, nothing to update.")
+        return
+    X_new, y_new = batch.drop(columns=['genre']), batch['genre']
+
+    updater = ModelUpdater(learning_rate=args.learning_rate, n_epochs=args.epochs)
+    if updater.state is None:
+        # Artifacts trained before the running statistics were saved
+        updater.bootstrap_state(X_catalog, y_catalog)
+
+    reasons = ["requested"] if args.full_retrain else updater.check_drift(X_new, y_new)
+
+    if reasons:
+        logging.warning(f"Full retrain instead of an incremental update: {'; '.join(reasons)}.")
+        print(f"Retraining from scratch: {'; '.join(reasons)}")
+        # Training reads the raw dataset, so the batch goes in first
+        with appended_to_raw_data(raw_batch):
+            full_retrain()
+        return
+
+    # Everything is written to a staging directory first, so a failure before the
+    # publish leaves the served artifacts and the manifest as they were
+    staging_dir = tempfile.mkdtemp(prefix=".update-", dir=ARTIFACTS_DIR)
+    try:
+        artifact_paths = updater.update(X_new, y_new, output_dir=staging_dir)
+
+        # Same serving exports as training, from the updated artifacts
+        numpy_model_path = export_numpy_model(
+            artifact_paths["preprocessor"], artifact_paths["pca_model"],
+            artifact_paths["model"], artifact_paths["target_label_encoder"],
+            output_path=os.path.join(staging_dir, "numpy_model.npz"),
+            dtype=updater.pca_model.components_.dtype
+        )
+        if numpy_model_path is not None:
+            artifact_paths["numpy_model"] = numpy_model_path
+
+        # The catalog as the next load will see it: the batch rows follow the existing ones
+        X = pd.concat([X_catalog, X_new.astype(X_catalog.dtypes.to_dict())], ignore_index=True)
+        y = pd.concat([y_catalog.astype(str), y_new.astype(str)], ignore_index=True)
+        artifact_paths["track_index"] = build_track_index(
+            artifact_paths["preprocessor"], artifact_paths["pca_model"],
+            X, labels=y.to_numpy(), track_ids=X.index.to_numpy(),
+            output_path=os.path.join(staging_dir, os.path.basename(TrackIndexConfig().track_index_path))
+        )
+
+        with swapped_in(artifact_paths, staging_dir) as live_paths, appended_to_raw_data(raw_batch):
+            manifest = ArtifactStore().publish(live_paths, data_hash=StageCache.hash_file(RAW_DATA_PATH))
+
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+    print(
+        f"Updated with {len(X_new)} rows in {time.perf_counter() - start:.1f}s, "
+        f"published artifact version {manifest['version']}."
+    )
+
+
+if __name__ == "__main__":
+    main()